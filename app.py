@@ -6,6 +6,9 @@ from models.empresa import Empresa
 from services.analizador_financiero import AnalizadorFinanciero
 from services.nlp_service import NLPService
 from services.conversational_analyzer import ConversationalAnalyzer
+from services.cache_analisis import CacheAnalisis
+from services.indice_percentiles import IndicePercentiles
+from services.indice_pares import IndicePares
 from utils.formatters import Formatters
 from utils.validators import Validators
 from ui.styles import StylesUI
@@ -13,6 +16,33 @@ from ui.chat_ui import ChatUI
 from ui.form_ui import FormUI
 from ui.results_ui import ResultsUI
 
+def obtener_cache_analisis():
+    """
+    Caché de análisis de la sesión actual, conservada entre re-ejecuciones de
+    Streamlit. No se comparte entre sesiones: los aciertos retornan la misma
+    instancia de resultado guardada.
+    """
+    if 'cache_analisis' not in st.session_state:
+        st.session_state.cache_analisis = CacheAnalisis(max_entradas=256)
+    return st.session_state.cache_analisis
+
+@st.cache_resource
+def obtener_indice_percentiles():
+    """
+    Índice de percentiles sectoriales compartido entre sesiones.
+    """
+    return IndicePercentiles()
+
+def obtener_indice_pares():
+    """
+    Índice de empresas pares de la sesión actual. No se comparte entre
+    sesiones: los pares muestran nombres de empresas y solo deben ser las
+    analizadas por el mismo usuario.
+    """
+    if 'indice_pares' not in st.session_state:
+        st.session_state.indice_pares = IndicePares()
+    return st.session_state.indice_pares
+
 # Clase principal de la aplicación
 class FinanzGPTApp:
     """
@@ -32,12 +62,18 @@ class FinanzGPTApp:
         
         # Inicializar servicios
         self.nlp_service = NLPService()
-        self.analizador_financiero = AnalizadorFinanciero()
+        self.nlp_service.indice_percentiles = obtener_indice_percentiles()
+        self.analizador_financiero = AnalizadorFinanciero(
+            cache=obtener_cache_analisis(),
+            indice_percentiles=obtener_indice_percentiles(),
+            indice_pares=obtener_indice_pares()
+        )
         
         # Inicializar analizador conversacional
         self.conversational_analyzer = ConversationalAnalyzer(
             self.analizador_financiero, 
-            self.nlp_service
+            self.nlp_service,
+            indice_pares=obtener_indice_pares()
         )
         
         # Inicializar utilidades
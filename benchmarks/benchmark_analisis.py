@@ -0,0 +1,307 @@
+"""
+Benchmarks del núcleo de análisis de FinanzGPT.
+
+Mide throughput (operaciones/seg), latencia p50/p99 y RSS pico de las rutas
+individuales (AnalizadorFinanciero.analizar_empresa, ResultadoAnalisis.generar_mensaje,
+Empresa.from_dict) y por lotes (AnalizadorFinanciero.analizar_lote) con datos
+sintéticos reproducibles.
+
+Cada caso se ejecuta en un proceso nuevo (spawn): el RSS pico reportado es
+el de ese caso (datos de entrada incluidos) y no el máximo acumulado por
+los casos anteriores. También se reporta el RSS del proceso antes de
+generar los datos, para separar el costo de los imports.
+
+Por defecto se miden hasta 100.000 filas; los tamaños grandes se piden
+explícitamente:
+    python -m benchmarks.benchmark_analisis --salida actual.json
+    python -m benchmarks.benchmark_analisis --tamanos 1 1000 1000000 10000000 --salida grande.json
+    python -m benchmarks.benchmark_analisis --salida nuevo.json --comparar actual.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from models.empresa import Empresa, EmpresaBatch
+from models.columnas import ColumnaDiccionario
+from services.analizador_financiero import AnalizadorFinanciero
+
+SECTORES = ('Tecnología', 'Comercio', 'Manufactura', 'Servicios', 'Otro')
+TAMANOS_DEFECTO = (1, 1000, 100000)
+CASOS = ('empresa_from_dict', 'analizar_empresa', 'generar_mensaje', 'analizar_lote')
+VERSION_FORMATO = 2
+
+
+def generar_columnas(n, semilla=42):
+    """
+    Genera columnas sintéticas reproducibles de empresas.
+
+    Incluye una pequeña fracción de valores en cero para ejercitar los casos
+    de división por cero de los indicadores.
+
+    Args:
+        n (int): Número de empresas
+        semilla (int): Semilla del generador
+
+    Returns:
+        dict: Columnas compatibles con EmpresaBatch.from_dict
+    """
+    generador = np.random.default_rng(semilla)
+    ganancias = generador.lognormal(np.log(5e8), 1.0, n)
+    activos = generador.lognormal(np.log(3e9), 1.0, n)
+    ganancias[generador.random(n) < 0.01] = 0.0
+    activos[generador.random(n) < 0.01] = 0.0
+    # Nombres y sectores codificados por diccionario: 10M cadenas de Python
+    # dominarían la memoria medida
+    return {
+        'nombre': ColumnaDiccionario(
+            generador.integers(0, 1000, n, dtype=np.int32), [f"Empresa {i}" for i in range(1000)]
+        ),
+        'sector': ColumnaDiccionario(generador.integers(0, len(SECTORES), n, dtype=np.int32), list(SECTORES)),
+        'ganancias': ganancias,
+        'empleados': generador.integers(1, 500, n),
+        'activos': activos,
+        'cartera': generador.lognormal(np.log(1e8), 1.0, n),
+        'deudas': activos * generador.uniform(0.0, 1.0, n)
+    }
+
+
+def rss_pico_mb():
+    """
+    RSS máximo alcanzado por el proceso hasta el momento (el de un caso,
+    porque cada caso corre en su propio proceso).
+
+    Returns:
+        float | None: Megabytes, o None si la plataforma no lo reporta
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB y macOS bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def _resumen(caso, filas, operaciones, segundos_total, latencias):
+    latencias_ms = np.asarray(latencias, dtype=np.float64) * 1e3
+    return {
+        'caso': caso,
+        'filas': filas,
+        'operaciones': operaciones,
+        'ops_por_segundo': operaciones / segundos_total if segundos_total > 0 else float('inf'),
+        'p50_ms': float(np.percentile(latencias_ms, 50)),
+        'p99_ms': float(np.percentile(latencias_ms, 99)),
+        'rss_pico_mb': rss_pico_mb()
+    }
+
+
+def medir_individual(caso, funcion, argumentos):
+    """
+    Mide una función llamada una vez por elemento (latencia por llamada).
+
+    Args:
+        caso (str): Nombre del caso
+        funcion (callable): Función a medir
+        argumentos (list): Argumento de cada llamada
+
+    Returns:
+        dict: Resultado del caso
+    """
+    reloj = time.perf_counter
+    latencias = np.empty(len(argumentos), dtype=np.float64)
+    inicio_total = reloj()
+    for posicion, argumento in enumerate(argumentos):
+        inicio = reloj()
+        funcion(argumento)
+        latencias[posicion] = reloj() - inicio
+    return _resumen(caso, len(argumentos), len(argumentos), reloj() - inicio_total, latencias)
+
+
+def medir_lote(caso, funcion, datos, filas, repeticiones):
+    """
+    Mide una función que procesa un lote completo (latencia por lote).
+
+    Args:
+        caso (str): Nombre del caso
+        funcion (callable): Función a medir
+        datos: Lote que recibe la función
+        filas (int): Filas del lote
+        repeticiones (int): Veces que se procesa el lote
+
+    Returns:
+        dict: Resultado del caso; ops_por_segundo cuenta filas procesadas
+    """
+    funcion(datos)  # Calentamiento, no se mide
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(datos)
+        latencias.append(time.perf_counter() - inicio)
+    return _resumen(caso, filas, filas * repeticiones, sum(latencias), latencias)
+
+
+def ejecutar_caso(caso, filas, semilla=42, max_individual=100000, repeticiones=5):
+    """
+    Genera los datos y mide un caso. Se ejecuta en un proceso propio.
+
+    Args:
+        caso (str): Uno de CASOS
+        filas (int): Filas del lote sintético
+        semilla (int): Semilla de los datos sintéticos
+        max_individual (int): Llamadas máximas en las rutas individuales
+        repeticiones (int): Repeticiones de las rutas por lotes
+
+    Returns:
+        dict: Resultado del caso, con 'rss_base_mb' (antes de generar los datos)
+    """
+    rss_base = rss_pico_mb()
+    analizador = AnalizadorFinanciero()
+    lote = EmpresaBatch.from_dict(generar_columnas(filas, semilla))
+
+    if caso == 'analizar_lote':
+        resultado = medir_lote(caso, analizador.analizar_lote, lote, filas, repeticiones)
+    else:
+        # Rutas individuales sobre un prefijo acotado del mismo lote
+        registros = [lote[posicion].data_dict for posicion in range(min(filas, max_individual))]
+        del lote
+        if caso == 'empresa_from_dict':
+            resultado = medir_individual(caso, Empresa.from_dict, registros)
+        else:
+            empresas = [Empresa.from_dict(registro) for registro in registros]
+            del registros
+            if caso == 'analizar_empresa':
+                resultado = medir_individual(
+                    caso, lambda empresa: analizador.analizar_empresa(empresa, incluir_nlp=False), empresas
+                )
+            else:
+                analisis = [analizador.analizar_empresa(empresa, incluir_nlp=False) for empresa in empresas]
+                del empresas
+                resultado = medir_individual(caso, lambda resultado: resultado.generar_mensaje(), analisis)
+    resultado['rss_base_mb'] = rss_base
+    return resultado
+
+
+def ejecutar(tamanos, semilla=42, max_individual=100000, repeticiones=5):
+    """
+    Ejecuta todos los casos para cada tamaño, de menor a mayor, cada uno
+    en un proceso nuevo.
+
+    Args:
+        tamanos (iterable): Números de filas a medir
+        semilla (int): Semilla de los datos sintéticos
+        max_individual (int): Llamadas máximas en las rutas individuales
+        repeticiones (int): Repeticiones de las rutas por lotes
+
+    Returns:
+        dict: Metadatos del entorno y lista de resultados
+    """
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for filas in sorted(tamanos):
+        for caso in CASOS:
+            with contexto.Pool(1) as proceso:
+                resultado = proceso.apply(ejecutar_caso, (caso, filas, semilla, max_individual, repeticiones))
+            resultados.append(resultado)
+            print(formatear(resultado), file=sys.stderr)
+
+    return {
+        'version_formato': VERSION_FORMATO,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'entorno': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine()
+        },
+        'parametros': {
+            'semilla': semilla,
+            'max_individual': max_individual,
+            'repeticiones': repeticiones
+        },
+        'resultados': resultados
+    }
+
+
+def formatear(resultado):
+    rss, base = resultado['rss_pico_mb'], resultado.get('rss_base_mb')
+    return (f"{resultado['caso']:<24} {resultado['filas']:>10,} filas  "
+            f"{resultado['ops_por_segundo']:>14,.0f} ops/s  "
+            f"p50 {resultado['p50_ms']:>10.4f} ms  p99 {resultado['p99_ms']:>10.4f} ms  "
+            f"RSS pico del caso {rss if rss is None else f'{rss:,.0f} MB'}"
+            f"{'' if base is None else f' (base {base:,.0f} MB)'}")
+
+
+def comparar(anterior, actual, umbral=0.10):
+    """
+    Compara dos ejecuciones caso por caso.
+
+    Args:
+        anterior (dict): Resultados de referencia
+        actual (dict): Resultados nuevos
+        umbral (float): Aumento relativo de la latencia p50 considerado regresión
+            (la mediana es menos sensible que el promedio al ruido de la máquina)
+
+    Returns:
+        list: Un dict por caso común con las razones actual/anterior y si es regresión
+    """
+    referencia = {(r['caso'], r['filas']): r for r in anterior['resultados']}
+    comparacion = []
+    for resultado in actual['resultados']:
+        base = referencia.get((resultado['caso'], resultado['filas']))
+        if base is None:
+            continue
+        razon_p50 = resultado['p50_ms'] / base['p50_ms'] if base['p50_ms'] else float('inf')
+        comparacion.append({
+            'caso': resultado['caso'],
+            'filas': resultado['filas'],
+            'razon_ops': resultado['ops_por_segundo'] / base['ops_por_segundo'],
+            'razon_p50': razon_p50,
+            'razon_p99': resultado['p99_ms'] / base['p99_ms'] if base['p99_ms'] else float('inf'),
+            'regresion': razon_p50 > 1 + umbral
+        })
+    return comparacion
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del núcleo de análisis de FinanzGPT")
+    parser.add_argument("--tamanos", type=int, nargs='+', default=list(TAMANOS_DEFECTO),
+                        help="Números de filas a medir (por defecto hasta 100.000)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--max-individual", type=int, default=100000,
+                        help="Llamadas máximas en las rutas individuales por tamaño")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones de las rutas por lotes")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="Archivo JSON de una ejecución anterior")
+    parser.add_argument("--umbral", type=float, default=0.10,
+                        help="Aumento relativo de la latencia p50 que se reporta como regresión")
+    args = parser.parse_args(argumentos)
+
+    actual = ejecutar(args.tamanos, args.semilla, args.max_individual, args.repeticiones)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+        comparacion = comparar(anterior, actual, args.umbral)
+        for fila in comparacion:
+            marca = "❌ regresión" if fila['regresion'] else "✅"
+            print(f"{fila['caso']:<24} {fila['filas']:>10,} filas  ops x{fila['razon_ops']:.2f}  "
+                  f"p50 x{fila['razon_p50']:.2f}  p99 x{fila['razon_p99']:.2f}  {marca}")
+        if any(fila['regresion'] for fila in comparacion):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
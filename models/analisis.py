@@ -1,3 +1,112 @@
+from collections.abc import Mapping
+import numpy as np
+from models.columnas import columna_texto
+
+# Tabla declarativa de reglas de evaluación. Cada regla compara un indicador
+# con el límite del sector (columna de igual posición en la tabla de límites),
+# define las etiquetas de evaluación y la recomendación si resulta desfavorable.
+INDICADORES = ('ratio_endeudamiento', 'rentabilidad', 'productividad', 'rotacion_cartera')
+REGLAS_EVALUACION = (
+    {
+        'evaluacion': 'endeudamiento',
+        'indicador': 'ratio_endeudamiento',
+        'comparacion': '<=',
+        'favorable': 'bueno',
+        'desfavorable': 'alto',
+        'recomendacion': "Reducir el nivel de endeudamiento, considerar reestructuración de deuda."
+    },
+    {
+        'evaluacion': 'rentabilidad',
+        'indicador': 'rentabilidad',
+        'comparacion': '>=',
+        'favorable': 'buena',
+        'desfavorable': 'baja',
+        'recomendacion': "Mejorar la eficiencia operativa y revisar la estructura de costos."
+    },
+    {
+        'evaluacion': 'productividad',
+        'indicador': 'productividad',
+        'comparacion': '>=',
+        'favorable': 'buena',
+        'desfavorable': 'baja',
+        'recomendacion': "Optimizar procesos y/o implementar programas de capacitación para los empleados."
+    },
+    {
+        'evaluacion': 'rotacion',
+        'indicador': 'rotacion_cartera',
+        'comparacion': '<=',
+        'favorable': 'buena',
+        'desfavorable': 'alta',
+        'recomendacion': "Mejorar las políticas de cobro y gestión de cartera."
+    }
+)
+# Estados generales de peor a mejor con los puntos positivos mínimos de cada uno
+UMBRALES_ESTADO = {
+    "Crítico": 0,
+    "Regular": 1,
+    "Bueno": 2,
+    "Excelente": 3
+}
+
+# Códigos compactos para etiquetas de evaluación, estado general y recomendaciones
+EVALUACIONES = tuple(regla['evaluacion'] for regla in REGLAS_EVALUACION)
+ETIQUETAS_EVALUACION = tuple((regla['desfavorable'], regla['favorable']) for regla in REGLAS_EVALUACION)
+ESTADOS = tuple(UMBRALES_ESTADO)
+RECOMENDACIONES = tuple(regla['recomendacion'] for regla in REGLAS_EVALUACION)
+# Banderas de anomalía del análisis por lotes: bit i si INDICADORES[i] no es
+# finito, bit len(INDICADORES) + i si es atípico dentro de su sector
+ANOMALIAS = (
+    tuple(f"{indicador}_no_finito" for indicador in INDICADORES)
+    + tuple(f"{indicador}_atipico" for indicador in INDICADORES)
+)
+
+
+class NLPEjemploDiferido(Mapping):
+    """
+    Diccionario de ejemplos NLP que se calcula solo en el primer acceso.
+    """
+    def __init__(self, generador):
+        """
+        Inicializa el diccionario diferido.
+        
+        Args:
+            generador (callable): Función sin argumentos que retorna el dict de ejemplos
+        """
+        self._generador = generador
+        self._datos = None
+    
+    @property
+    def calculado(self):
+        """
+        Indica si los ejemplos ya fueron calculados.
+        """
+        return self._datos is not None
+    
+    def _resolver(self):
+        if self._datos is None:
+            self._datos = self._generador()
+            self._generador = None
+        return self._datos
+    
+    def __getitem__(self, clave):
+        return self._resolver()[clave]
+    
+    def __iter__(self):
+        return iter(self._resolver())
+    
+    def __len__(self):
+        return len(self._resolver())
+    
+    def __repr__(self):
+        if self._datos is None:
+            return f"{self.__class__.__name__}(<sin calcular>)"
+        return repr(self._datos)
+    
+    def __reduce__(self):
+        # Al serializar se materializa para no depender del generador
+        return dict, (self._resolver(),)
+
+
 class ResultadoAnalisis:
     """
     Clase que representa el resultado de un análisis financiero.
@@ -14,7 +123,7 @@ class ResultadoAnalisis:
             evaluacion (dict): Evaluación de cada indicador
             estado_general (str): Estado general de la empresa
             recomendaciones (list): Lista de recomendaciones
-            nlp_ejemplo (dict, optional): Ejemplos de procesamiento NLP
+            nlp_ejemplo (dict | NLPEjemploDiferido, optional): Ejemplos de procesamiento NLP
         """
         self.nombre = nombre
         self.sector = sector
@@ -22,7 +131,7 @@ class ResultadoAnalisis:
         self.evaluacion = evaluacion
         self.estado_general = estado_general
         self.recomendaciones = recomendaciones
-        self.nlp_ejemplo = nlp_ejemplo or {}
+        self.nlp_ejemplo = {} if nlp_ejemplo is None else nlp_ejemplo
     
     @property
     def data_dict(self):
@@ -84,4 +193,255 @@ class ResultadoAnalisis:
             for i, rec in enumerate(self.recomendaciones, 1):
                 mensaje += f"{i}. {rec}\n"
         
-        return mensaje
\ No newline at end of file
+        return mensaje
+
+
+class ResultadoVista:
+    """
+    Vista de solo lectura sobre una fila de un ResultadoBatch.
+    """
+    __slots__ = ('_lote', '_indice')
+    
+    def __init__(self, lote, indice):
+        """
+        Inicializa una vista sobre la fila indicada.
+        
+        Args:
+            lote (ResultadoBatch): Lote que contiene los resultados
+            indice (int): Posición de la fila dentro del lote
+        """
+        self._lote = lote
+        self._indice = indice
+    
+    @property
+    def nombre(self):
+        return self._lote.nombre[self._indice]
+    
+    @property
+    def sector(self):
+        return self._lote.sector[self._indice]
+    
+    @property
+    def indicadores(self):
+        return {nombre: float(getattr(self._lote, nombre)[self._indice]) for nombre in INDICADORES}
+    
+    @property
+    def evaluacion(self):
+        codigo = int(self._lote.evaluacion[self._indice])
+        return {
+            nombre: etiquetas[(codigo >> bit) & 1]
+            for bit, (nombre, etiquetas) in enumerate(zip(EVALUACIONES, ETIQUETAS_EVALUACION))
+        }
+    
+    @property
+    def estado_general(self):
+        return ESTADOS[self._lote.estado[self._indice]]
+    
+    @property
+    def recomendaciones(self):
+        codigo = int(self._lote.recomendaciones[self._indice])
+        return [texto for bit, texto in enumerate(RECOMENDACIONES) if (codigo >> bit) & 1]
+    
+    @property
+    def anomalias(self):
+        codigo = int(self._lote.anomalias[self._indice])
+        return [nombre for bit, nombre in enumerate(ANOMALIAS) if (codigo >> bit) & 1]
+    
+    @property
+    def nlp_ejemplo(self):
+        return {}
+    
+    data_dict = ResultadoAnalisis.data_dict
+    generar_mensaje = ResultadoAnalisis.generar_mensaje
+    
+    def to_resultado(self):
+        """
+        Materializa la fila como una instancia independiente de ResultadoAnalisis.
+        
+        Returns:
+            ResultadoAnalisis: Nueva instancia de ResultadoAnalisis
+        """
+        return ResultadoAnalisis.from_dict(self.data_dict)
+
+
+class ResultadoBatch:
+    """
+    Resultados de un análisis por lotes almacenados como columnas de NumPy.
+    
+    La evaluación y las recomendaciones se guardan como máscaras de bits
+    (bit i corresponde a EVALUACIONES[i] y RECOMENDACIONES[i]) y el estado
+    general como índice en ESTADOS. Las banderas de anomalía son otra
+    máscara de bits (bit i corresponde a ANOMALIAS[i]) que puede calcularse
+    en el primer acceso, como los ejemplos NLP diferidos.
+    """
+    CAMPOS = ('nombre', 'sector') + INDICADORES + ('evaluacion', 'estado', 'recomendaciones', 'anomalias')
+    
+    def __init__(self, nombre, sector, ratio_endeudamiento, rentabilidad, productividad,
+                 rotacion_cartera, evaluacion, estado, recomendaciones, anomalias=None):
+        """
+        Inicializa un lote de resultados a partir de columnas.
+        
+        Args:
+            nombre (array-like): Nombres de las empresas
+            sector (array-like): Sectores económicos
+            ratio_endeudamiento (array-like): Ratio de endeudamiento
+            rentabilidad (array-like): Rentabilidad sobre activos
+            productividad (array-like): Productividad por empleado
+            rotacion_cartera (array-like): Rotación de cartera (días)
+            evaluacion (array-like): Máscara de bits de indicadores favorables
+            estado (array-like): Código del estado general
+            recomendaciones (array-like): Máscara de bits de recomendaciones
+            anomalias (array-like | callable, optional): Máscara de bits de
+                anomalías, o función sin argumentos que la retorna y se llama
+                en el primer acceso; por defecto ninguna
+        """
+        self.nombre = columna_texto(nombre)
+        self.sector = columna_texto(sector)
+        self.ratio_endeudamiento = np.asarray(ratio_endeudamiento, dtype=np.float64)
+        self.rentabilidad = np.asarray(rentabilidad, dtype=np.float64)
+        self.productividad = np.asarray(productividad, dtype=np.float64)
+        self.rotacion_cartera = np.asarray(rotacion_cartera, dtype=np.float64)
+        self.evaluacion = np.asarray(evaluacion, dtype=np.uint8)
+        self.estado = np.asarray(estado, dtype=np.uint8)
+        self.recomendaciones = np.asarray(recomendaciones, dtype=np.uint8)
+        if anomalias is None:
+            anomalias = np.zeros(len(self.estado), dtype=np.uint8)
+        self._anomalias = anomalias if callable(anomalias) else np.asarray(anomalias, dtype=np.uint8)
+    
+    @property
+    def anomalias(self):
+        """
+        Máscara de bits de anomalías por fila (ver ANOMALIAS).
+        """
+        if callable(self._anomalias):
+            self._anomalias = np.asarray(self._anomalias(), dtype=np.uint8)
+        return self._anomalias
+    
+    @property
+    def anomalias_calculadas(self):
+        """
+        Indica si la máscara de anomalías ya fue calculada.
+        """
+        return not callable(self._anomalias)
+    
+    def __len__(self):
+        return len(self.estado)
+    
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield ResultadoVista(self, indice)
+    
+    def __getitem__(self, indice):
+        """
+        Un entero retorna una ResultadoVista; un slice retorna un ResultadoBatch
+        que comparte memoria con este lote. Índices booleanos o de enteros
+        retornan una copia. Si las anomalías aún no se calcularon, el nuevo
+        lote también las difiere: se calculan (una vez, en este lote) al
+        accederlas en cualquiera de los dos.
+        """
+        if isinstance(indice, (int, np.integer)):
+            if indice < 0:
+                indice += len(self)
+            if not 0 <= indice < len(self):
+                raise IndexError("Índice fuera del rango del lote")
+            return ResultadoVista(self, int(indice))
+        columnas = [getattr(self, campo)[indice] for campo in self.CAMPOS if campo != 'anomalias']
+        if self.anomalias_calculadas:
+            anomalias = self._anomalias[indice]
+        else:
+            anomalias = lambda: self.anomalias[indice]
+        return self.__class__(*columnas, anomalias=anomalias)
+    
+    def favorables(self):
+        """
+        Decodifica la máscara de evaluación.
+        
+        Returns:
+            np.ndarray: Matriz booleana (n, 4), True si el indicador es favorable
+        """
+        bits = np.unpackbits(self.evaluacion[:, np.newaxis], axis=1, bitorder='little')
+        return bits[:, :len(EVALUACIONES)].astype(bool)
+    
+    @property
+    def data_dict(self):
+        """
+        Retorna un diccionario columnar con la misma estructura que
+        ResultadoAnalisis.data_dict, con las etiquetas decodificadas.
+        
+        Returns:
+            dict: Diccionario con los resultados
+        """
+        favorables = self.favorables()
+        return {
+            'nombre': self.nombre,
+            'sector': self.sector,
+            'indicadores': {nombre: getattr(self, nombre) for nombre in INDICADORES},
+            'evaluacion': {
+                nombre: np.asarray(etiquetas)[favorables[:, bit].astype(np.intp)]
+                for bit, (nombre, etiquetas) in enumerate(zip(EVALUACIONES, ETIQUETAS_EVALUACION))
+            },
+            'estado_general': np.asarray(ESTADOS)[self.estado],
+            'recomendaciones': [vista.recomendaciones for vista in self],
+            'anomalias': [vista.anomalias for vista in self],
+            'nlp_ejemplo': {}
+        }
+    
+    @classmethod
+    def from_dict(cls, data_dict):
+        """
+        Crea un lote a partir de un diccionario columnar como el de data_dict.
+        
+        Args:
+            data_dict (dict): Diccionario con los resultados
+            
+        Returns:
+            ResultadoBatch: Nuevo lote
+        """
+        evaluacion = np.zeros(len(data_dict['estado_general']), dtype=np.uint8)
+        for bit, (nombre, etiquetas) in enumerate(zip(EVALUACIONES, ETIQUETAS_EVALUACION)):
+            evaluacion |= (np.asarray(data_dict['evaluacion'][nombre]) == etiquetas[1]).astype(np.uint8) << bit
+        codigos_estado = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+        codigos_recomendacion = {texto: 1 << bit for bit, texto in enumerate(RECOMENDACIONES)}
+        codigos_anomalia = {nombre: 1 << bit for bit, nombre in enumerate(ANOMALIAS)}
+        anomalias = data_dict.get('anomalias')
+        if anomalias is not None:
+            anomalias = [sum(codigos_anomalia[nombre] for nombre in nombres) for nombres in anomalias]
+        return cls(
+            nombre=data_dict['nombre'],
+            sector=data_dict['sector'],
+            evaluacion=evaluacion,
+            estado=[codigos_estado[estado] for estado in data_dict['estado_general']],
+            recomendaciones=[
+                sum(codigos_recomendacion[texto] for texto in textos)
+                for textos in data_dict.get('recomendaciones', [[]] * len(evaluacion))
+            ],
+            anomalias=anomalias,
+            **{nombre: data_dict['indicadores'][nombre] for nombre in INDICADORES}
+        )
+    
+    @classmethod
+    def from_resultados(cls, resultados):
+        """
+        Crea un lote a partir de instancias de ResultadoAnalisis.
+        
+        Args:
+            resultados (iterable): Instancias de ResultadoAnalisis
+            
+        Returns:
+            ResultadoBatch: Nuevo lote
+        """
+        resultados = list(resultados)
+        return cls.from_dict({
+            'nombre': [resultado.nombre for resultado in resultados],
+            'sector': [resultado.sector for resultado in resultados],
+            'indicadores': {
+                nombre: [resultado.indicadores[nombre] for resultado in resultados]
+                for nombre in INDICADORES
+            },
+            'evaluacion': {
+                nombre: [resultado.evaluacion[nombre] for resultado in resultados]
+                for nombre in EVALUACIONES
+            },
+            'estado_general': [resultado.estado_general for resultado in resultados],
+            'recomendaciones': [resultado.recomendaciones for resultado in resultados]
+        })
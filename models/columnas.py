@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class ValoresTexto:
+    """
+    Secuencia inmutable de textos almacenada como bytes UTF-8 concatenados
+    más un arreglo de desplazamientos. Cada texto se decodifica al accederlo.
+    """
+    def __init__(self, desplazamientos, datos):
+        """
+        Inicializa la secuencia.
+
+        Args:
+            desplazamientos (np.ndarray): Arreglo int64 de n + 1 posiciones
+            datos (np.ndarray): Arreglo uint8 con los textos codificados en UTF-8
+        """
+        self.desplazamientos = desplazamientos
+        self.datos = datos
+
+    def __len__(self):
+        return len(self.desplazamientos) - 1
+
+    def __getitem__(self, indice):
+        inicio, fin = self.desplazamientos[indice], self.desplazamientos[indice + 1]
+        return self.datos[inicio:fin].tobytes().decode('utf-8')
+
+    def tolist(self):
+        """
+        Decodifica todos los textos.
+
+        Returns:
+            list: Lista de textos
+        """
+        return [self[indice] for indice in range(len(self))]
+
+    @classmethod
+    def desde_lista(cls, textos):
+        """
+        Codifica una lista de textos.
+
+        Args:
+            textos (list): Textos a codificar
+
+        Returns:
+            ValoresTexto: Nueva secuencia
+        """
+        codificados = [str(texto).encode('utf-8') for texto in textos]
+        desplazamientos = np.zeros(len(codificados) + 1, dtype=np.int64)
+        np.cumsum([len(texto) for texto in codificados], out=desplazamientos[1:])
+        datos = np.frombuffer(b''.join(codificados), dtype=np.uint8)
+        return cls(desplazamientos, datos)
+
+
+class ColumnaDiccionario:
+    """
+    Columna de texto codificada por diccionario: un arreglo de códigos
+    enteros más la lista de valores distintos. Los slices comparten los
+    códigos con la columna original.
+    """
+    def __init__(self, codigos, valores):
+        """
+        Inicializa la columna.
+
+        Args:
+            codigos (np.ndarray): Índice de cada fila en valores
+            valores (list | ValoresTexto): Valores distintos de la columna
+        """
+        self.codigos = codigos
+        self.valores = valores
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __iter__(self):
+        valores = self.valores
+        for codigo in self.codigos.tolist():
+            yield valores[codigo]
+
+    def __getitem__(self, indice):
+        if isinstance(indice, (int, np.integer)):
+            return self.valores[int(self.codigos[indice])]
+        return self.__class__(self.codigos[indice], self.valores)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.tolist(), dtype=object if dtype is None else dtype)
+
+    def tolist(self):
+        """
+        Decodifica la columna completa.
+
+        Returns:
+            list: Valor de cada fila
+        """
+        return list(self)
+
+    @classmethod
+    def codificar(cls, valores):
+        """
+        Codifica una secuencia de textos asignando códigos en orden de aparición.
+
+        Args:
+            valores (iterable): Textos de la columna
+
+        Returns:
+            ColumnaDiccionario: Columna codificada
+        """
+        if isinstance(valores, cls):
+            return valores
+        diccionario = {}
+        codigos = np.fromiter(
+            (diccionario.setdefault(valor, len(diccionario)) for valor in valores), dtype=np.int64
+        )
+        tipo = np.int32 if len(diccionario) < 2 ** 31 else np.int64
+        return cls(codigos.astype(tipo, copy=False), list(diccionario))
+
+
+def columna_texto(valores):
+    """
+    Normaliza una columna de texto: las columnas codificadas por diccionario
+    se conservan tal cual y el resto se convierte en arreglo de objetos.
+
+    Args:
+        valores (array-like | ColumnaDiccionario): Columna de texto
+
+    Returns:
+        np.ndarray | ColumnaDiccionario: Columna lista para un lote
+    """
+    if isinstance(valores, ColumnaDiccionario):
+        return valores
+    return np.asarray(valores, dtype=object)
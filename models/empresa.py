@@ -1,3 +1,6 @@
+import numpy as np
+from models.columnas import columna_texto
+
 class Empresa:
     """
     Clase que representa una empresa con sus datos financieros.
@@ -61,4 +64,193 @@ class Empresa:
             activos=float(data_dict.get('activos', 0.0)),
             cartera=float(data_dict.get('cartera', 0.0)),
             deudas=float(data_dict.get('deudas', 0.0))
-        )
\ No newline at end of file
+        )
+
+
+class EmpresaVista:
+    """
+    Vista de solo lectura sobre una fila de un EmpresaBatch.
+    """
+    __slots__ = ('_lote', '_indice')
+    
+    def __init__(self, lote, indice):
+        """
+        Inicializa una vista sobre la fila indicada.
+        
+        Args:
+            lote (EmpresaBatch): Lote que contiene los datos
+            indice (int): Posición de la fila dentro del lote
+        """
+        self._lote = lote
+        self._indice = indice
+    
+    @property
+    def nombre(self):
+        return self._lote.nombre[self._indice]
+    
+    @property
+    def sector(self):
+        return self._lote.sector[self._indice]
+    
+    @property
+    def ganancias(self):
+        return float(self._lote.ganancias[self._indice])
+    
+    @property
+    def empleados(self):
+        return int(self._lote.empleados[self._indice])
+    
+    @property
+    def activos(self):
+        return float(self._lote.activos[self._indice])
+    
+    @property
+    def cartera(self):
+        return float(self._lote.cartera[self._indice])
+    
+    @property
+    def deudas(self):
+        return float(self._lote.deudas[self._indice])
+    
+    data_dict = Empresa.data_dict
+    
+    def to_empresa(self):
+        """
+        Materializa la fila como una instancia independiente de Empresa.
+        
+        Returns:
+            Empresa: Nueva instancia de Empresa
+        """
+        return Empresa.from_dict(self.data_dict)
+
+
+class EmpresaBatch:
+    """
+    Lote de empresas almacenado como columnas de NumPy (struct-of-arrays).
+    """
+    CAMPOS = ('nombre', 'sector', 'ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+    
+    def __init__(self, nombre, sector, ganancias, empleados, activos, cartera, deudas):
+        """
+        Inicializa un lote a partir de columnas. Los arreglos que ya tienen el
+        tipo correcto se usan sin copiarse.
+        
+        Args:
+            nombre (array-like): Nombres de las empresas
+            sector (array-like): Sectores económicos
+            ganancias (array-like): Ganancias anuales en COP
+            empleados (array-like): Número de empleados; valores float se
+                aceptan solo si son enteros finitos (ValueError si no)
+            activos (array-like): Valor total de activos en COP
+            cartera (array-like): Valor en cartera por cobrar en COP
+            deudas (array-like): Valor de deudas en COP
+        """
+        self.nombre = columna_texto(nombre)
+        self.sector = columna_texto(sector)
+        self.ganancias = np.asarray(ganancias, dtype=np.float64)
+        self.empleados = self._enteros(empleados, "número de empleados")
+        self.activos = np.asarray(activos, dtype=np.float64)
+        self.cartera = np.asarray(cartera, dtype=np.float64)
+        self.deudas = np.asarray(deudas, dtype=np.float64)
+    
+    @staticmethod
+    def _enteros(valores, nombre):
+        """
+        Convierte una columna a int64 sin truncar: los valores no enteros o
+        no finitos (NaN, inf, 3.5) son un error en lugar de basura.
+        """
+        arreglo = np.asarray(valores)
+        if arreglo.dtype.kind in 'iub':
+            return arreglo.astype(np.int64, copy=False)
+        try:
+            numeros = arreglo.astype(np.float64)
+        except (TypeError, ValueError):
+            raise ValueError(f"El {nombre} debe ser un número entero.") from None
+        with np.errstate(invalid='ignore'):
+            invalidos = ~np.isfinite(numeros) | (numeros != np.trunc(numeros)) | (np.abs(numeros) >= 2.0 ** 63)
+        if invalidos.any():
+            filas = np.flatnonzero(invalidos)
+            raise ValueError(
+                f"El {nombre} debe ser un número entero en {len(filas)} filas (primera: {int(filas[0])})."
+            )
+        return numeros.astype(np.int64)
+    
+    def __len__(self):
+        return len(self.ganancias)
+    
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield EmpresaVista(self, indice)
+    
+    def __getitem__(self, indice):
+        """
+        Un entero retorna una EmpresaVista; un slice retorna un EmpresaBatch
+        que comparte memoria con este lote. Índices booleanos o de enteros
+        retornan una copia.
+        """
+        if isinstance(indice, (int, np.integer)):
+            if indice < 0:
+                indice += len(self)
+            if not 0 <= indice < len(self):
+                raise IndexError("Índice fuera del rango del lote")
+            return EmpresaVista(self, int(indice))
+        return self.__class__(*(getattr(self, campo)[indice] for campo in self.CAMPOS))
+    
+    @property
+    def data_dict(self):
+        """
+        Retorna un diccionario con las columnas del lote.
+        
+        Returns:
+            dict: Diccionario campo -> arreglo
+        """
+        return {campo: getattr(self, campo) for campo in self.CAMPOS}
+    
+    @classmethod
+    def from_dict(cls, data_dict):
+        """
+        Crea un lote a partir de un diccionario de columnas o un DataFrame.
+        
+        Args:
+            data_dict (dict | pandas.DataFrame): Columnas del lote; 'nombre' es opcional
+            
+        Returns:
+            EmpresaBatch: Nuevo lote
+        """
+        n = len(data_dict['ganancias'])
+        return cls(
+            nombre=data_dict['nombre'] if 'nombre' in data_dict else np.full(n, "", dtype=object),
+            sector=data_dict['sector'] if 'sector' in data_dict else np.full(n, "Tecnología", dtype=object),
+            ganancias=data_dict['ganancias'],
+            empleados=data_dict['empleados'] if 'empleados' in data_dict else np.ones(n, dtype=np.int64),
+            activos=data_dict['activos'],
+            cartera=data_dict['cartera'],
+            deudas=data_dict['deudas']
+        )
+    
+    @classmethod
+    def from_dicts(cls, registros):
+        """
+        Crea un lote a partir de una lista de diccionarios de Empresa.data_dict.
+        
+        Args:
+            registros (list): Diccionarios con los datos de cada empresa
+            
+        Returns:
+            EmpresaBatch: Nuevo lote
+        """
+        return cls.from_empresas(Empresa.from_dict(registro) for registro in registros)
+    
+    @classmethod
+    def from_empresas(cls, empresas):
+        """
+        Crea un lote a partir de instancias de Empresa.
+        
+        Args:
+            empresas (iterable): Instancias de Empresa
+            
+        Returns:
+            EmpresaBatch: Nuevo lote
+        """
+        empresas = list(empresas)
+        return cls(*([getattr(empresa, campo) for empresa in empresas] for campo in cls.CAMPOS))
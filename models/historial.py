@@ -0,0 +1,220 @@
+import math
+import numpy as np
+from models.analisis import INDICADORES
+from models.empresa import Empresa
+from utils.indicadores import Indicadores
+
+CAMPOS_PERIODO = ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+# Campos de flujo: se reportan por periodo y los indicadores los usan anualizados
+CAMPOS_FLUJO = ('ganancias',)
+SERIES = CAMPOS_PERIODO + tuple(f"{campo}_anuales" for campo in CAMPOS_FLUJO) + INDICADORES
+
+
+class HistorialEmpresa:
+    """
+    Historial de periodos (por ejemplo trimestres) de una empresa. Los
+    periodos solo se agregan al final; al agregar uno se calculan sus
+    indicadores, la variación anual y el promedio móvil con costo constante,
+    sin recorrer el historial.
+
+    Las ganancias de cada periodo son las del periodo, pero los indicadores
+    usan ganancias anuales, como Empresa: la suma de los últimos
+    periodos_por_anio periodos o, mientras no haya un año completo, las del
+    periodo multiplicadas por periodos_por_anio. Los saldos (activos,
+    cartera, deudas) y los empleados se toman tal cual.
+    """
+    def __init__(self, nombre="", sector="Tecnología", periodos_por_anio=4, capacidad=16):
+        """
+        Inicializa un historial vacío.
+
+        Args:
+            nombre (str): Nombre de la empresa
+            sector (str): Sector económico de la empresa
+            periodos_por_anio (int): Periodos en un año; define el desfase de la
+                variación anual y la ventana del promedio móvil
+            capacidad (int): Periodos reservados inicialmente (se duplica al llenarse)
+        """
+        if periodos_por_anio < 1:
+            raise ValueError("periodos_por_anio debe ser mayor o igual a 1")
+        self.nombre = nombre
+        self.sector = sector
+        self.periodos_por_anio = periodos_por_anio
+        self.periodos = []
+        self._n = 0
+        capacidad = max(int(capacidad), periodos_por_anio)
+        self._valores = np.empty((capacidad, len(SERIES)), dtype=np.float64)
+        self._variacion = np.empty_like(self._valores)
+        self._promedio = np.empty_like(self._valores)
+        self._columna = {nombre: indice for indice, nombre in enumerate(SERIES)}
+
+    def __len__(self):
+        return self._n
+
+    def _crecer(self):
+        capacidad = 2 * len(self._valores)
+        for atributo in ('_valores', '_variacion', '_promedio'):
+            anterior = getattr(self, atributo)
+            nuevo = np.empty((capacidad, anterior.shape[1]), dtype=anterior.dtype)
+            nuevo[:self._n] = anterior[:self._n]
+            setattr(self, atributo, nuevo)
+
+    def agregar(self, periodo, ganancias=0.0, empleados=1, activos=0.0, cartera=0.0, deudas=0.0):
+        """
+        Agrega un periodo al final del historial.
+
+        Args:
+            periodo (str): Etiqueta del periodo (por ejemplo "2024-T1")
+            ganancias (float): Ganancias del periodo (no anuales) en COP
+            empleados (int): Número de empleados; se acepta un float entero
+                como 3.0 pero no uno con decimales
+            activos (float): Valor total de activos en COP
+            cartera (float): Valor en cartera por cobrar en COP
+            deudas (float): Valor de deudas en COP
+
+        Returns:
+            dict: Valores, variación anual y promedio móvil del periodo agregado
+        """
+        try:
+            empleados = float(empleados)
+        except (TypeError, ValueError):
+            raise ValueError("El número de empleados debe ser un número entero.") from None
+        if not (math.isfinite(empleados) and empleados.is_integer()):
+            raise ValueError("El número de empleados debe ser un número entero.")
+        if self._n == len(self._valores):
+            self._crecer()
+
+        datos = (float(ganancias), empleados, float(activos), float(cartera), float(deudas))
+        fila = self._valores[self._n]
+        fila[:len(CAMPOS_PERIODO)] = datos
+
+        # Flujos anuales: suma del último año, o el periodo por periodos_por_anio
+        desfase = self.periodos_por_anio
+        anuales = []
+        for campo in CAMPOS_FLUJO:
+            columna = self._columna[campo]
+            if self._n + 1 >= desfase:
+                anuales.append(self._valores[self._n + 1 - desfase:self._n + 1, columna].sum())
+            else:
+                anuales.append(fila[columna] * desfase)
+            fila[self._columna[f"{campo}_anuales"]] = anuales[-1]
+        anualizados = dict(zip(CAMPOS_PERIODO, datos))
+        anualizados.update(zip(CAMPOS_FLUJO, anuales))
+        fila[-len(INDICADORES):] = Indicadores.calcular_lote(*(anualizados[campo] for campo in CAMPOS_PERIODO))
+
+        # Variación anual frente al mismo periodo del año anterior
+        if self._n >= desfase:
+            anterior = self._valores[self._n - desfase]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._variacion[self._n] = np.where(anterior != 0, (fila - anterior) / np.abs(anterior), np.nan)
+        else:
+            self._variacion[self._n] = np.nan
+
+        # Promedio móvil sobre una ventana fija: costo constante e igual precisión
+        # que sumar desde cero (no acumula errores de restas sucesivas)
+        if self._n + 1 >= desfase:
+            self._promedio[self._n] = self._valores[self._n + 1 - desfase:self._n + 1].mean(axis=0)
+        else:
+            self._promedio[self._n] = np.nan
+
+        self.periodos.append(periodo)
+        self._n += 1
+        return self.periodo(-1)
+
+    def agregar_empresa(self, periodo, empresa):
+        """
+        Agrega un periodo a partir de los datos de una Empresa.
+
+        Args:
+            periodo (str): Etiqueta del periodo
+            empresa (Empresa): Datos financieros del periodo
+
+        Returns:
+            dict: Valores, variación anual y promedio móvil del periodo agregado
+        """
+        return self.agregar(periodo, **{campo: getattr(empresa, campo) for campo in CAMPOS_PERIODO})
+
+    def _indice(self, indice):
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError("Periodo fuera de rango")
+        return indice
+
+    def _vista(self, matriz, nombre):
+        if nombre not in self._columna:
+            raise KeyError(f"Serie desconocida: {nombre}")
+        vista = matriz[:self._n, self._columna[nombre]]
+        vista.flags.writeable = False
+        return vista
+
+    def serie(self, nombre):
+        """
+        Valores de una serie en todos los periodos.
+
+        Args:
+            nombre (str): Campo de la empresa o nombre de un indicador
+
+        Returns:
+            np.ndarray: Vista de solo lectura con un valor por periodo
+        """
+        return self._vista(self._valores, nombre)
+
+    def variacion_anual(self, nombre):
+        """
+        Variación relativa de una serie frente al mismo periodo del año anterior.
+
+        Args:
+            nombre (str): Campo de la empresa o nombre de un indicador
+
+        Returns:
+            np.ndarray: Vista de solo lectura (NaN sin año anterior o base cero)
+        """
+        return self._vista(self._variacion, nombre)
+
+    def promedio_movil(self, nombre):
+        """
+        Promedio móvil de una serie sobre los últimos periodos_por_anio periodos.
+
+        Args:
+            nombre (str): Campo de la empresa o nombre de un indicador
+
+        Returns:
+            np.ndarray: Vista de solo lectura (NaN hasta completar la ventana)
+        """
+        return self._vista(self._promedio, nombre)
+
+    def periodo(self, indice):
+        """
+        Retorna los datos calculados de un periodo.
+
+        Args:
+            indice (int): Posición del periodo (acepta índices negativos)
+
+        Returns:
+            dict: Periodo, valores, variación anual y promedio móvil por serie
+        """
+        indice = self._indice(indice)
+        return {
+            'periodo': self.periodos[indice],
+            'valores': dict(zip(SERIES, self._valores[indice].tolist())),
+            'variacion_anual': dict(zip(SERIES, self._variacion[indice].tolist())),
+            'promedio_movil': dict(zip(SERIES, self._promedio[indice].tolist()))
+        }
+
+    def to_empresa(self, indice=-1):
+        """
+        Crea una Empresa con los datos de un periodo, con las ganancias
+        anualizadas que usan sus indicadores.
+
+        Args:
+            indice (int): Posición del periodo (por defecto el último)
+
+        Returns:
+            Empresa: Empresa con los datos del periodo
+        """
+        valores = self._valores[self._indice(indice)]
+        datos = dict(zip(CAMPOS_PERIODO, valores[:len(CAMPOS_PERIODO)].tolist()))
+        for campo in CAMPOS_FLUJO:
+            datos[campo] = float(valores[self._columna[f"{campo}_anuales"]])
+        datos['empleados'] = int(datos['empleados'])
+        return Empresa(nombre=self.nombre, sector=self.sector, **datos)
@@ -1,5 +1,18 @@
 from .analizador_financiero import AnalizadorFinanciero
+from .analizador_paralelo import AnalizadorParalelo
+from .tabla_sectores import TablaSectores
+from .pipeline_analisis import PipelineAnalisis
+from .cache_analisis import CacheAnalisis
+from .instrumentacion import Instrumentacion
+from .indice_percentiles import IndicePercentiles
+from .indice_pares import IndicePares
+from .consulta_resultados import ConsultaResultados
+from .agregados_sector import AgregadosSector
+from .limites_poblacion import LimitesPoblacion
+from .motor_escenarios import MotorEscenarios
+from .buscador_metas import BuscadorMetas
+from .simulador_montecarlo import SimuladorMonteCarlo
 from .nlp_service import NLPService
 from .conversational_analyzer import ConversationalAnalyzer
 
-__all__ = ['AnalizadorFinanciero', 'NLPService', 'ConversationalAnalyzer']
\ No newline at end of file
+__all__ = ['AnalizadorFinanciero', 'AnalizadorParalelo', 'TablaSectores', 'PipelineAnalisis', 'CacheAnalisis', 'Instrumentacion', 'IndicePercentiles', 'IndicePares', 'ConsultaResultados', 'AgregadosSector', 'LimitesPoblacion', 'MotorEscenarios', 'BuscadorMetas', 'SimuladorMonteCarlo', 'NLPService', 'ConversationalAnalyzer']
\ No newline at end of file
@@ -0,0 +1,186 @@
+import threading
+import numpy as np
+from models.analisis import INDICADORES
+from services.tabla_sectores import clave_sector, grupos_sector
+from utils.estadisticas import BosquejoKLL, EstadisticaWelford
+
+
+class AgregadosSector:
+    """
+    Estadísticas en vivo por sector calculadas en una sola pasada sobre un
+    flujo de análisis: media y varianza (Welford) y un bosquejo KLL de
+    cuantiles por indicador. La memoria es constante por sector sin importar
+    cuántas empresas se procesen, y los agregados parciales de distintos
+    procesos se combinan con combinar().
+    """
+    CUANTILES_RESUMEN = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+    def __init__(self, tabla_sectores=None, k=200, semilla=None):
+        """
+        Inicializa agregados vacíos.
+
+        Args:
+            tabla_sectores (TablaSectores, optional): Tabla usada para agrupar
+                sinónimos de sector; sin ella se agrupa por nombre normalizado
+            k (int): Precisión de los bosquejos de cuantiles
+            semilla (int, optional): Semilla de las compactaciones de los bosquejos
+        """
+        self.tabla_sectores = tabla_sectores
+        self.k = k
+        self._semillas = np.random.SeedSequence(semilla)
+        self._sectores = {}
+        self.version = 0
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Se puede enviar entre procesos; el lock no es serializable
+        estado = self.__dict__.copy()
+        del estado['_lock']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.RLock()
+
+    def _sector(self, clave):
+        estadisticas = self._sectores.get(clave)
+        if estadisticas is None:
+            semillas = self._semillas.spawn(len(INDICADORES))
+            estadisticas = self._sectores[clave] = {
+                nombre: (EstadisticaWelford(), BosquejoKLL(self.k, semilla))
+                for nombre, semilla in zip(INDICADORES, semillas)
+            }
+        return estadisticas
+
+    @property
+    def sectores(self):
+        """
+        Claves de los sectores con datos.
+        """
+        return tuple(self._sectores)
+
+    def agregar(self, resultado, tabla_sectores=None):
+        """
+        Agrega un análisis.
+
+        Args:
+            resultado (ResultadoAnalisis | ResultadoVista): Análisis a incorporar
+            tabla_sectores (TablaSectores, optional): Tabla con la que agrupar el
+                sector (los desconocidos van a 'otro'); por defecto la de los agregados
+        """
+        with self._lock:
+            estadisticas = self._sector(clave_sector(resultado.sector, tabla_sectores or self.tabla_sectores))
+            for nombre in INDICADORES:
+                valor = float(resultado.indicadores[nombre])
+                welford, bosquejo = estadisticas[nombre]
+                welford.agregar(valor)
+                bosquejo.agregar(valor)
+            self.version += 1
+
+    def agregar_lote(self, resultados, tabla_sectores=None):
+        """
+        Agrega todos los análisis de un lote.
+
+        Args:
+            resultados (ResultadoBatch): Resultados a incorporar
+            tabla_sectores (TablaSectores, optional): Tabla con la que agrupar los
+                sectores (los desconocidos van a 'otro'); por defecto la de los agregados
+        """
+        with self._lock:
+            for clave, filas in grupos_sector(resultados.sector, tabla_sectores or self.tabla_sectores):
+                estadisticas = self._sector(clave)
+                for nombre in INDICADORES:
+                    valores = np.asarray(getattr(resultados, nombre))[filas]
+                    welford, bosquejo = estadisticas[nombre]
+                    welford.agregar_lote(valores)
+                    bosquejo.agregar_lote(valores)
+            self.version += 1
+
+    def combinar(self, otros):
+        """
+        Incorpora los agregados parciales de otro proceso o flujo.
+
+        Args:
+            otros (AgregadosSector): Agregados a combinar
+
+        Returns:
+            AgregadosSector: Esta misma instancia
+        """
+        with self._lock:
+            for clave, estadisticas in otros._sectores.items():
+                propias = self._sector(clave)
+                for nombre in INDICADORES:
+                    propias[nombre][0].combinar(estadisticas[nombre][0])
+                    propias[nombre][1].combinar(estadisticas[nombre][1])
+            self.version += 1
+        return self
+
+    def _estadisticas(self, sector, indicador):
+        clave = clave_sector(sector, self.tabla_sectores)
+        estadisticas = self._sectores.get(clave)
+        if estadisticas is None:
+            return None
+        return estadisticas[indicador]
+
+    def tamano(self, sector):
+        """
+        Número de análisis agregados para un sector.
+
+        Args:
+            sector (str): Nombre del sector
+
+        Returns:
+            int: Cantidad de empresas
+        """
+        estadisticas = self._estadisticas(sector, INDICADORES[0])
+        return 0 if estadisticas is None else estadisticas[1].n
+
+    def cuantiles(self, sector, indicador, probabilidades):
+        """
+        Estima cuantiles de un indicador dentro de un sector.
+
+        Args:
+            sector (str): Nombre del sector
+            indicador (str): Nombre del indicador (ver INDICADORES)
+            probabilidades (array-like): Probabilidades entre 0 y 1
+
+        Returns:
+            np.ndarray | None: Cuantiles estimados, o None si el sector no tiene datos
+        """
+        with self._lock:
+            estadisticas = self._estadisticas(sector, indicador)
+            if estadisticas is None:
+                return None
+            return estadisticas[1].cuantiles(probabilidades)
+
+    def resumen(self, sector):
+        """
+        Resume las estadísticas de cada indicador de un sector.
+
+        Args:
+            sector (str): Nombre del sector
+
+        Returns:
+            dict | None: Indicador -> n, media, desviación, mínimo, máximo,
+                no_finitos y cuantiles; None si el sector no tiene datos
+        """
+        with self._lock:
+            clave = clave_sector(sector, self.tabla_sectores)
+            estadisticas = self._sectores.get(clave)
+            if estadisticas is None:
+                return None
+            resumen = {}
+            for nombre, (welford, bosquejo) in estadisticas.items():
+                cuantiles = bosquejo.cuantiles(self.CUANTILES_RESUMEN)
+                resumen[nombre] = {
+                    'n': bosquejo.n,
+                    'media': welford.media if welford.n else float('nan'),
+                    'desviacion': welford.desviacion,
+                    'minimo': bosquejo.minimo,
+                    'maximo': bosquejo.maximo,
+                    'no_finitos': welford.no_finitos,
+                    'cuantiles': {
+                        probabilidad: float(valor) for probabilidad, valor in zip(self.CUANTILES_RESUMEN, cuantiles)
+                    }
+                }
+            return resumen
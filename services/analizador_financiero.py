@@ -1,17 +1,51 @@
+import time
+from contextlib import contextmanager
+from functools import partial
 import numpy as np
-from models.empresa import Empresa
-from models.analisis import ResultadoAnalisis
+from models.empresa import Empresa, EmpresaBatch
+from models.analisis import ResultadoAnalisis, ResultadoBatch, NLPEjemploDiferido
 from services.nlp_service import NLPService
+from services.tabla_sectores import LimitesSector, TablaSectores
+from services.cache_analisis import CacheAnalisis
+from services.instrumentacion import Instrumentacion
+from utils.indicadores import Indicadores
+from utils.reglas import MOTOR_REGLAS
+from utils.ratios import BIBLIOTECA_RATIOS
+from utils.formulas import COMPILADOR_FORMULAS
 
 class AnalizadorFinanciero:
     """
     Servicio para realizar análisis financieros de empresas.
     """
-    def __init__(self):
+    def __init__(self, cache=None, indice_percentiles=None, instrumentacion=None, indice_pares=None,
+                 limites_poblacion=None, detector_anomalias=None):
         """
         Inicializa el analizador financiero.
+        
+        Args:
+            cache (CacheAnalisis, optional): Caché de resultados para analizar_empresa
+            indice_percentiles (IndicePercentiles, optional): Índice sectorial al que
+                se agrega cada análisis nuevo de analizar_empresa
+            instrumentacion (Instrumentacion, optional): Colector de tiempos por
+                etapa; cualquier objeto con métodos registrar(etapa, segundos)
+                y contar(nombre) sirve como hook. Sin él no se mide nada.
+            indice_pares (IndicePares, optional): Índice de empresas pares al que
+                se agrega cada análisis nuevo de analizar_empresa
+            limites_poblacion (LimitesPoblacion, optional): Modo en que los límites
+                por sector se derivan de los cuantiles de los análisis realizados;
+                cada análisis nuevo alimenta sus agregados
+            detector_anomalias (DetectorAnomalias, optional): Etapa opcional que
+                marca en analizar_lote los indicadores no finitos y atípicos por
+                sector (calculada al consultar resultados.anomalias), p. ej.
+                DETECTOR_ANOMALIAS. Sin él las anomalías quedan en cero
         """
         self.nlp_service = NLPService()
+        self.cache = cache
+        self.indice_percentiles = indice_percentiles
+        self.instrumentacion = instrumentacion
+        self.indice_pares = indice_pares
+        self.limites_poblacion = limites_poblacion
+        self.detector_anomalias = detector_anomalias
         self.limites_sector = {
             'tecnología': {
                 'endeudamiento': 0.6,
@@ -45,6 +79,56 @@ class AnalizadorFinanciero:
             }
         }
     
+    @property
+    def limites_sector(self):
+        """
+        Límites por sector usados en la evaluación de indicadores. Se
+        guardan como LimitesSector, que cambia de versión ante cualquier
+        modificación.
+        """
+        return self._limites_sector
+    
+    @limites_sector.setter
+    def limites_sector(self, limites_sector):
+        self._limites_sector = LimitesSector(limites_sector)
+        self._tabla_sectores = None
+    
+    @property
+    def version_limites(self):
+        """
+        Versión actual de los límites por sector.
+        """
+        return self._limites_sector.version
+    
+    @property
+    def tabla_sectores(self):
+        """
+        Tabla compilada de límites; se recompila si los límites cambiaron.
+        """
+        tabla = self._tabla_sectores
+        if tabla is None or tabla.version != self._limites_sector.version:
+            tabla = self._tabla_sectores = TablaSectores(self._limites_sector)
+        return tabla
+    
+    @contextmanager
+    def instrumentar(self, instrumentacion=None):
+        """
+        Activa la medición por etapas dentro de un bloque with.
+        
+        Args:
+            instrumentacion (Instrumentacion, optional): Colector a usar; si no
+                se indica se crea uno nuevo
+            
+        Yields:
+            Instrumentacion: Colector con las mediciones del bloque
+        """
+        anterior = self.instrumentacion
+        self.instrumentacion = instrumentacion if instrumentacion is not None else Instrumentacion()
+        try:
+            yield self.instrumentacion
+        finally:
+            self.instrumentacion = anterior
+    
     def calcular_ratio_endeudamiento(self, valor_deudas, valor_activos):
         """
         Calcula el ratio de endeudamiento de la empresa.
@@ -105,95 +189,249 @@ class AnalizadorFinanciero:
             return float('inf')
         return (valor_cartera / ganancias_anuales) * 365  # Días de rotación
     
-    def analizar_empresa(self, empresa):
+    def calcular_ratios(self, datos, ratios=None):
+        """
+        Calcula ratios adicionales (liquidez, ROE, márgenes, ciclo de caja)
+        sobre un balance extendido, de una empresa o de un lote.
+        
+        Args:
+            datos (dict | pandas.DataFrame | Empresa | EmpresaBatch): Campos del
+                balance (ver utils.ratios.CAMPOS_BALANCE)
+            ratios (iterable, optional): Ratios a calcular; por defecto todos
+                los calculables con los datos disponibles
+            
+        Returns:
+            dict: Ratio -> valor o arreglo de valores
+        """
+        return BIBLIOTECA_RATIOS.calcular(datos, ratios)
+    
+    def calcular_formula(self, expresion, datos):
+        """
+        Evalúa un indicador personalizado, por ejemplo
+        "(activos - deudas) / empleados", sobre una empresa o un lote.
+        
+        Args:
+            expresion (str): Fórmula sobre los campos de Empresa (ver utils.formulas)
+            datos (dict | pandas.DataFrame | Empresa | EmpresaBatch): Datos a evaluar
+            
+        Returns:
+            float | np.ndarray: Valor del indicador por empresa
+        """
+        return COMPILADOR_FORMULAS.evaluar(expresion, datos)
+    
+    def analizar_empresa(self, empresa, incluir_nlp=True):
         """
         Realiza un análisis completo de la situación económica de la empresa.
         
         Args:
             empresa (Empresa): Instancia de Empresa a analizar
+            incluir_nlp (bool): Si es False se omite por completo el
+                procesamiento NLP de ejemplo; si es True se calcula de forma
+                diferida la primera vez que se consulta nlp_ejemplo
             
         Returns:
-            ResultadoAnalisis: Resultados del análisis
+            ResultadoAnalisis: Resultados del análisis. Con caché, los aciertos
+                retornan la misma instancia guardada, que no debe modificarse.
+        """
+        medir = self.instrumentacion
+        if medir is not None:
+            inicio = time.perf_counter()
+        
+        # Refresca los límites derivados antes de construir la clave de caché
+        if self.limites_poblacion is not None:
+            self.limites_poblacion.actualizar(self._limites_sector)
+        
+        if self.cache is None:
+            resultado = self._analizar_empresa(empresa, incluir_nlp)
+        else:
+            clave = (CacheAnalisis.huella(empresa), self.version_limites, incluir_nlp)
+            resultado = self.cache.obtener(clave)
+            if resultado is None:
+                resultado = self._analizar_empresa(empresa, incluir_nlp)
+                self.cache.guardar(clave, resultado)
+                if medir is not None:
+                    medir.contar('cache_fallos')
+            elif medir is not None:
+                medir.contar('cache_aciertos')
+        
+        if medir is not None:
+            medir.registrar('total', time.perf_counter() - inicio)
+            medir.contar('analisis')
+        return resultado
+    
+    def _analizar_empresa(self, empresa, incluir_nlp):
+        """
+        Calcula el análisis de una empresa sin consultar la caché.
         """
+        # Con la instrumentación desactivada el costo es una comparación por etapa
+        medir = self.instrumentacion
+        if medir is not None:
+            marca = time.perf_counter()
+        
         # Calcular indicadores
         ratio_endeudamiento = self.calcular_ratio_endeudamiento(empresa.deudas, empresa.activos)
         rentabilidad = self.calcular_rentabilidad(empresa.ganancias, empresa.activos)
         productividad = self.calcular_productividad_empleado(empresa.ganancias, empresa.empleados)
         rotacion_cartera = self.calcular_rotacion_cartera(empresa.cartera, empresa.ganancias)
         
-        # Si el sector no está en los predefinidos, usar "otro"
-        sector_analisis = empresa.sector.lower()
-        if sector_analisis not in self.limites_sector:
-            sector_analisis = 'otro'
-        
-        # Evaluación por indicador
-        evaluacion = {
-            'endeudamiento': 'bueno' if ratio_endeudamiento <= self.limites_sector[sector_analisis]['endeudamiento'] else 'alto',
-            'rentabilidad': 'buena' if rentabilidad >= self.limites_sector[sector_analisis]['rentabilidad'] else 'baja',
-            'productividad': 'buena' if productividad >= self.limites_sector[sector_analisis]['productividad'] else 'baja',
-            'rotacion': 'buena' if rotacion_cartera <= self.limites_sector[sector_analisis]['rotacion'] else 'alta'
-        }
+        if medir is not None:
+            marca = self._registrar_etapa(medir, 'indicadores', marca)
+        
+        # Límites del sector (los sectores no predefinidos usan "otro")
+        limites = self.tabla_sectores.limites(self.tabla_sectores.codigo(empresa.sector))
+        
+        # Evaluación, estado general y recomendaciones según la tabla de reglas
+        evaluacion, estado_general, recomendaciones = MOTOR_REGLAS.evaluar(
+            (ratio_endeudamiento, rentabilidad, productividad, rotacion_cartera), limites
+        )
+        
+        if medir is not None:
+            marca = self._registrar_etapa(medir, 'evaluacion', marca)
         
-        # Evaluación general
-        puntos_positivos = sum(1 for valor in evaluacion.values() if valor in ['bueno', 'buena'])
+        # Crear objeto de resultado
+        indicadores = {
+            'ratio_endeudamiento': ratio_endeudamiento,
+            'rentabilidad': rentabilidad,
+            'productividad': productividad,
+            'rotacion_cartera': rotacion_cartera
+        }
         
-        if puntos_positivos >= 3:
-            estado_general = "Excelente"
-        elif puntos_positivos == 2:
-            estado_general = "Bueno"
-        elif puntos_positivos == 1:
-            estado_general = "Regular"
+        # Procesamiento NLP de ejemplo, calculado solo si se consulta
+        if incluir_nlp:
+            nlp_ejemplo = NLPEjemploDiferido(partial(
+                self._generar_nlp_ejemplo, empresa.nombre, empresa.sector, empresa.empleados
+            ))
         else:
-            estado_general = "Crítico"
+            nlp_ejemplo = {}
         
-        # Preparar recomendaciones basadas en puntos débiles
-        recomendaciones = []
+        resultado = ResultadoAnalisis(
+            nombre=empresa.nombre,
+            sector=empresa.sector,
+            indicadores=indicadores,
+            evaluacion=evaluacion,
+            estado_general=estado_general,
+            recomendaciones=recomendaciones,
+            nlp_ejemplo=nlp_ejemplo
+        )
         
-        if evaluacion['endeudamiento'] == 'alto':
-            recomendaciones.append("Reducir el nivel de endeudamiento, considerar reestructuración de deuda.")
+        if medir is not None:
+            marca = self._registrar_etapa(medir, 'resultado', marca)
         
-        if evaluacion['rentabilidad'] == 'baja':
-            recomendaciones.append("Mejorar la eficiencia operativa y revisar la estructura de costos.")
+        # Los aciertos de caché no llegan aquí, así que no se indexan dos veces
+        if self.indice_percentiles is not None:
+            self.indice_percentiles.agregar(resultado)
+            if medir is not None:
+                marca = self._registrar_etapa(medir, 'indice_percentiles', marca)
+        if self.indice_pares is not None:
+            self.indice_pares.agregar(resultado)
+            if medir is not None:
+                marca = self._registrar_etapa(medir, 'indice_pares', marca)
+        if self.limites_poblacion is not None:
+            self.limites_poblacion.agregados_sector.agregar(resultado, self.tabla_sectores)
+            if medir is not None:
+                self._registrar_etapa(medir, 'limites_poblacion', marca)
         
-        if evaluacion['productividad'] == 'baja':
-            recomendaciones.append("Optimizar procesos y/o implementar programas de capacitación para los empleados.")
+        return resultado
+    
+    @staticmethod
+    def _registrar_etapa(medir, etapa, marca):
+        """
+        Registra el tiempo transcurrido desde marca y retorna la nueva marca.
+        """
+        ahora = time.perf_counter()
+        medir.registrar(etapa, ahora - marca)
+        return ahora
+    
+    def _generar_nlp_ejemplo(self, nombre, sector, empleados):
+        """
+        Genera los ejemplos de procesamiento NLP para una empresa.
         
-        if evaluacion['rotacion'] == 'alta':
-            recomendaciones.append("Mejorar las políticas de cobro y gestión de cartera.")
+        Args:
+            nombre (str): Nombre de la empresa
+            sector (str): Sector económico
+            empleados (int): Número de empleados
+            
+        Returns:
+            dict: Tokens, lemas, etiquetas POS y dimensión del embedding
+        """
+        # El NLP se resuelve de forma diferida, fuera de analizar_empresa
+        medir = self.instrumentacion
+        if medir is not None:
+            inicio = time.perf_counter()
         
-        # Procesamiento NLP de ejemplo
-        tokens_nombre = self.nlp_service.tokenizar_texto(empresa.nombre)
-        lemas_sector = self.nlp_service.lematizar_texto(empresa.sector)
-        pos_tags = self.nlp_service.pos_tagging(f"{empresa.nombre} es una empresa del sector {empresa.sector}")
+        tokens_nombre = self.nlp_service.tokenizar_texto(nombre)
+        lemas_sector = self.nlp_service.lematizar_texto(sector)
+        pos_tags = self.nlp_service.pos_tagging(f"{nombre} es una empresa del sector {sector}")
         
         # Crear embedding para futuras comparaciones
         embedding = self.nlp_service.crear_embedding(
-            f"Empresa {empresa.nombre} del sector {empresa.sector} con {empresa.empleados} empleados"
+            f"Empresa {nombre} del sector {sector} con {empleados} empleados"
         )
         
-        # Crear objeto de resultado
-        indicadores = {
-            'ratio_endeudamiento': ratio_endeudamiento,
-            'rentabilidad': rentabilidad,
-            'productividad': productividad,
-            'rotacion_cartera': rotacion_cartera
-        }
+        if medir is not None:
+            self._registrar_etapa(medir, 'nlp', inicio)
         
-        nlp_ejemplo = {
+        return {
             'tokens': tokens_nombre,
             'lemas': lemas_sector,
             'pos_tags': pos_tags,
             'embedding_dim': len(embedding) if isinstance(embedding, np.ndarray) else 0
         }
+    
+    def analizar_lote(self, datos):
+        """
+        Analiza un lote de empresas con operaciones sobre arreglos.
         
-        resultado = ResultadoAnalisis(
-            nombre=empresa.nombre,
-            sector=empresa.sector,
-            indicadores=indicadores,
+        Produce exactamente los mismos indicadores, evaluaciones y estado
+        general que analizar_empresa, pero sin crear objetos por empresa
+        ni realizar el procesamiento NLP de ejemplo.
+        
+        Args:
+            datos (EmpresaBatch | dict | pandas.DataFrame): Lote de empresas o
+                columnas 'ganancias', 'empleados', 'activos', 'cartera',
+                'deudas' y 'sector' ('nombre' es opcional)
+            
+        Returns:
+            ResultadoBatch: Resultados columnares del análisis
+        """
+        medir = self.instrumentacion
+        if medir is not None:
+            inicio = time.perf_counter()
+        
+        lote = datos if isinstance(datos, EmpresaBatch) else EmpresaBatch.from_dict(datos)
+        
+        if self.limites_poblacion is not None:
+            self.limites_poblacion.actualizar(self._limites_sector)
+        
+        # Límites por fila mediante indexación sobre la tabla de sectores
+        codigos = self.tabla_sectores.codigos_lote(lote.sector)
+        limites = self.tabla_sectores.limites(codigos)
+        
+        indicadores, evaluacion, estado, recomendaciones = Indicadores.analizar_columnas(
+            lote.ganancias, lote.empleados, lote.activos, lote.cartera, lote.deudas, limites
+        )
+        
+        # Las anomalías se calculan en el primer acceso, con las estadísticas
+        # de todo el lote, para no cargar el camino de quien no las consulta
+        anomalias = None
+        if self.detector_anomalias is not None:
+            anomalias = partial(self.detector_anomalias.detectar, indicadores, codigos,
+                                len(self.tabla_sectores.sectores))
+        
+        resultados = ResultadoBatch(
+            lote.nombre,
+            lote.sector,
+            *indicadores,
             evaluacion=evaluacion,
-            estado_general=estado_general,
+            estado=estado,
             recomendaciones=recomendaciones,
-            nlp_ejemplo=nlp_ejemplo
+            anomalias=anomalias
         )
         
-        return resultado
\ No newline at end of file
+        if self.limites_poblacion is not None:
+            self.limites_poblacion.agregados_sector.agregar_lote(resultados, self.tabla_sectores)
+        
+        if medir is not None:
+            self._registrar_etapa(medir, 'lote', inicio)
+            medir.contar('filas_lote', len(resultados))
+        return resultados
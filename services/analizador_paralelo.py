@@ -0,0 +1,192 @@
+import os
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from models.empresa import EmpresaBatch
+from models.analisis import ResultadoBatch, INDICADORES
+from utils.indicadores import Indicadores
+
+# Orden de las columnas numéricas dentro del bloque de memoria compartida
+_COLUMNAS_ENTRADA = ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+
+
+def _adjuntar_memoria(nombre):
+    """
+    Se adjunta a un bloque de memoria compartida creado por el proceso padre,
+    que es el único responsable de liberarlo.
+    """
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:  # Python < 3.13: el registro lo comparte el resource_tracker del padre
+        return shared_memory.SharedMemory(name=nombre)
+
+
+def _analizar_bloque(nombres, n, inicio, fin, matriz_limites):
+    """
+    Analiza las filas [inicio, fin) leyendo y escribiendo directamente en
+    memoria compartida. Se ejecuta en un proceso trabajador.
+    """
+    memorias = [_adjuntar_memoria(nombre) for nombre in nombres]
+    try:
+        entrada = np.ndarray((len(_COLUMNAS_ENTRADA), n), dtype=np.float64, buffer=memorias[0].buf)
+        codigos = np.ndarray((n,), dtype=np.intp, buffer=memorias[1].buf)
+        indicadores_salida = np.ndarray((len(INDICADORES), n), dtype=np.float64, buffer=memorias[2].buf)
+        codigos_salida = np.ndarray((3, n), dtype=np.uint8, buffer=memorias[3].buf)
+
+        tramo = slice(inicio, fin)
+        indicadores, evaluacion, estado, recomendaciones = Indicadores.analizar_columnas(
+            *(columna[tramo] for columna in entrada),
+            matriz_limites[codigos[tramo]]
+        )
+        for fila, valores in enumerate(indicadores):
+            indicadores_salida[fila, tramo] = valores
+        codigos_salida[0, tramo] = evaluacion
+        codigos_salida[1, tramo] = estado
+        codigos_salida[2, tramo] = recomendaciones
+        del entrada, codigos, indicadores_salida, codigos_salida
+    finally:
+        for memoria in memorias:
+            memoria.close()
+    return inicio, fin
+
+
+class AnalizadorParalelo:
+    """
+    Distribuye el análisis por lotes de AnalizadorFinanciero entre varios
+    procesos. Las columnas viajan en bloques de memoria compartida y cada
+    trabajador escribe sus resultados en su tramo, por lo que el orden de
+    entrada se conserva.
+    """
+    def __init__(self, analizador_financiero, workers=None, tamano_bloque=131072):
+        """
+        Inicializa el analizador paralelo.
+
+        Args:
+            analizador_financiero (AnalizadorFinanciero): Analizador con los límites a usar
+            workers (int, optional): Número de procesos; por defecto os.cpu_count()
+            tamano_bloque (int): Filas por tarea enviada a cada trabajador
+        """
+        if tamano_bloque < 1:
+            raise ValueError("tamano_bloque debe ser mayor o igual a 1")
+        self.analizador_financiero = analizador_financiero
+        self.workers = workers or os.cpu_count() or 1
+        self.tamano_bloque = tamano_bloque
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cerrar()
+
+    def cerrar(self):
+        """
+        Detiene los procesos trabajadores, si fueron creados.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _obtener_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def analizar_lote(self, datos):
+        """
+        Analiza un lote de empresas repartiéndolo en bloques entre procesos.
+        Igual que AnalizadorFinanciero.analizar_lote, actualiza los límites
+        derivados de la población antes del análisis, agrega los resultados
+        a sus agregados por sector y registra la etapa 'lote' en la
+        instrumentación del analizador.
+
+        Args:
+            datos (EmpresaBatch | dict | pandas.DataFrame): Lote de empresas,
+                con el mismo formato que AnalizadorFinanciero.analizar_lote
+
+        Returns:
+            ResultadoBatch: Resultados en el mismo orden de entrada
+        """
+        lote = datos if isinstance(datos, EmpresaBatch) else EmpresaBatch.from_dict(datos)
+        n = len(lote)
+
+        # Con un solo bloque o un solo proceso no compensa repartir
+        if self.workers == 1 or n <= self.tamano_bloque:
+            return self.analizador_financiero.analizar_lote(lote)
+
+        analizador = self.analizador_financiero
+        medir = analizador.instrumentacion
+        if medir is not None:
+            inicio_lote = time.perf_counter()
+
+        # Los límites se actualizan antes de tomar la matriz que reciben los trabajadores
+        if analizador.limites_poblacion is not None:
+            analizador.limites_poblacion.actualizar(analizador.limites_sector)
+        tabla = analizador.tabla_sectores
+        codigos = tabla.codigos_lote(lote.sector)
+
+        tamanos = (
+            len(_COLUMNAS_ENTRADA) * n * np.dtype(np.float64).itemsize,
+            n * np.dtype(np.intp).itemsize,
+            len(INDICADORES) * n * np.dtype(np.float64).itemsize,
+            3 * n
+        )
+        memorias = []
+        entrada = None
+        try:
+            for tamano in tamanos:
+                memorias.append(shared_memory.SharedMemory(create=True, size=tamano))
+
+            entrada = np.ndarray((len(_COLUMNAS_ENTRADA), n), dtype=np.float64, buffer=memorias[0].buf)
+            for fila, campo in enumerate(_COLUMNAS_ENTRADA):
+                entrada[fila] = getattr(lote, campo)
+            np.ndarray((n,), dtype=np.intp, buffer=memorias[1].buf)[:] = codigos
+
+            nombres = [memoria.name for memoria in memorias]
+            executor = self._obtener_executor()
+            tareas = [
+                executor.submit(
+                    _analizar_bloque, nombres, n, inicio,
+                    min(inicio + self.tamano_bloque, n), tabla.matriz
+                )
+                for inicio in range(0, n, self.tamano_bloque)
+            ]
+            for tarea in tareas:
+                tarea.result()
+
+            # Copiar los resultados fuera de la memoria compartida antes de liberarla
+            indicadores = np.array(
+                np.ndarray((len(INDICADORES), n), dtype=np.float64, buffer=memorias[2].buf)
+            )
+            codigos_salida = np.array(np.ndarray((3, n), dtype=np.uint8, buffer=memorias[3].buf))
+        finally:
+            entrada = None
+            for memoria in memorias:
+                memoria.close()
+                memoria.unlink()
+
+        # Las estadísticas de anomalías son de todo el lote, no de cada bloque
+        anomalias = None
+        detector = analizador.detector_anomalias
+        if detector is not None:
+            anomalias = partial(detector.detectar, indicadores, codigos, len(tabla.sectores))
+
+        resultados = ResultadoBatch(
+            lote.nombre,
+            lote.sector,
+            *indicadores,
+            evaluacion=codigos_salida[0],
+            estado=codigos_salida[1],
+            recomendaciones=codigos_salida[2],
+            anomalias=anomalias
+        )
+
+        if analizador.limites_poblacion is not None:
+            analizador.limites_poblacion.agregados_sector.agregar_lote(resultados, tabla)
+
+        if medir is not None:
+            analizador._registrar_etapa(medir, 'lote', inicio_lote)
+            medir.contar('filas_lote', len(resultados))
+        return resultados
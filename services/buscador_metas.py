@@ -0,0 +1,201 @@
+import numpy as np
+from models.analisis import ESTADOS, UMBRALES_ESTADO, REGLAS_EVALUACION
+from models.empresa import EmpresaBatch
+from utils.indicadores import Indicadores
+
+
+class BuscadorMetas:
+    """
+    Calcula, para todo un portafolio, el ajuste mínimo de cada dato de
+    entrada que lleva a una empresa a un estado general objetivo (por
+    ejemplo "reducir las deudas en X COP o aumentar las ganancias en Y COP
+    para llegar a 'Bueno'").
+
+    Los umbrales se despejan en forma cerrada de las fórmulas de los
+    indicadores y los límites del sector, sobre columnas completas. Como el
+    límite despejado puede quedar a un redondeo de cumplir la comparación,
+    el ajuste se corrige unos pocos pasos de un ulp (o de a un empleado)
+    hasta que la regla efectivamente cambia; lo que aun así no alcanza el
+    objetivo se marca como NaN.
+    """
+    CAMPOS = ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+    # Pasos de corrección por redondeo antes de declarar la meta inalcanzable
+    PASOS_AJUSTE = 4
+
+    def __init__(self, analizador_financiero):
+        """
+        Inicializa el buscador de metas.
+
+        Args:
+            analizador_financiero (AnalizadorFinanciero): Analizador con los límites a usar
+        """
+        self.analizador_financiero = analizador_financiero
+        self._regla = {regla['indicador']: posicion for posicion, regla in enumerate(REGLAS_EVALUACION)}
+
+    @staticmethod
+    def _estado(valores, limites):
+        indicadores = Indicadores.calcular_lote(*(valores[campo] for campo in BuscadorMetas.CAMPOS))
+        return Indicadores.estado_lote(Indicadores.evaluar_lote(indicadores, limites))
+
+    def _faltantes(self, favorable, puntos_objetivo, indicadores):
+        """
+        Puntos que deben aportar las reglas de los indicadores dados, sabiendo
+        lo que ya aportan las demás.
+        """
+        otras = [posicion for indicador, posicion in self._regla.items() if indicador not in indicadores]
+        return puntos_objetivo - np.count_nonzero(favorable[:, otras], axis=1)
+
+    def _limite(self, limites, indicador):
+        return limites[:, self._regla[indicador]]
+
+    def _meta_deudas(self, valores, limites, favorable, puntos_objetivo):
+        # deudas / activos <= L  =>  deudas <= L * activos
+        faltan = self._faltantes(favorable, puntos_objetivo, ('ratio_endeudamiento',))
+        meta = np.minimum(valores['deudas'], self._limite(limites, 'ratio_endeudamiento') * valores['activos'])
+        return np.where(faltan <= 1, meta, np.nan)
+
+    def _meta_cartera(self, valores, limites, favorable, puntos_objetivo):
+        # 365 * cartera / ganancias <= L  =>  cartera <= L * ganancias / 365
+        faltan = self._faltantes(favorable, puntos_objetivo, ('rotacion_cartera',))
+        meta = np.minimum(valores['cartera'], self._limite(limites, 'rotacion_cartera') * valores['ganancias'] / 365)
+        return np.where((faltan <= 1) & (valores['ganancias'] > 0), meta, np.nan)
+
+    def _meta_empleados(self, valores, limites, favorable, puntos_objetivo):
+        # ganancias / empleados >= L  =>  empleados <= ganancias / L (entero, al menos 1)
+        faltan = self._faltantes(favorable, puntos_objetivo, ('productividad',))
+        limite = self._limite(limites, 'productividad')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            maximo = np.floor(valores['ganancias'] / limite)
+        meta = np.minimum(valores['empleados'], maximo)
+        return np.where((faltan <= 1) & (limite > 0) & (meta >= 1), meta, np.nan)
+
+    def _meta_ganancias(self, valores, limites, favorable, puntos_objetivo):
+        # Las ganancias mejoran rentabilidad, productividad y rotación a la vez:
+        # se toma el umbral de ganancias de cada regla y, ordenados, el
+        # k-ésimo menor da los k puntos que faltan
+        afectados = ('rentabilidad', 'productividad', 'rotacion_cartera')
+        faltan = self._faltantes(favorable, puntos_objetivo, afectados)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            umbrales = np.column_stack((
+                np.where(valores['activos'] > 0, self._limite(limites, 'rentabilidad') * valores['activos'], np.inf),
+                np.where(valores['empleados'] > 0, self._limite(limites, 'productividad') * valores['empleados'], np.inf),
+                np.where(self._limite(limites, 'rotacion_cartera') > 0,
+                         365 * valores['cartera'] / self._limite(limites, 'rotacion_cartera'), np.inf)
+            ))
+        umbrales.sort(axis=1)
+        posicion = np.clip(faltan - 1, 0, len(afectados) - 1)
+        meta = np.take_along_axis(umbrales, posicion[:, None], axis=1)[:, 0]
+        meta = np.where(faltan <= 0, valores['ganancias'], np.maximum(valores['ganancias'], meta))
+        return np.where((faltan <= len(afectados)) & np.isfinite(meta), meta, np.nan)
+
+    def _meta_activos(self, valores, limites, favorable, puntos_objetivo):
+        # Más activos mejoran el endeudamiento (activos >= deudas / L) pero
+        # empeoran la rentabilidad (activos <= ganancias / L): con un punto
+        # faltante se elige el límite más cercano, con dos el intervalo entre ambos
+        faltan = self._faltantes(favorable, puntos_objetivo, ('ratio_endeudamiento', 'rentabilidad'))
+        activos = valores['activos']
+        limite_deuda = self._limite(limites, 'ratio_endeudamiento')
+        limite_rentabilidad = self._limite(limites, 'rentabilidad')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            minimo = np.where(limite_deuda > 0, valores['deudas'] / limite_deuda, np.inf)
+            maximo = np.where(limite_rentabilidad > 0, valores['ganancias'] / limite_rentabilidad, np.inf)
+        subir = np.maximum(activos, minimo)
+        bajar = np.minimum(activos, maximo)
+        # Un candidato no realizable (no finito o sin activos positivos, p. ej.
+        # bajar con ganancias negativas) nunca es el más cercano
+        with np.errstate(invalid='ignore'):
+            distancia_subir = np.where(np.isfinite(subir) & (subir > 0), np.abs(subir - activos), np.inf)
+            distancia_bajar = np.where(np.isfinite(bajar) & (bajar > 0), np.abs(activos - bajar), np.inf)
+        un_punto = np.where(distancia_subir <= distancia_bajar, subir, bajar)
+        dos_puntos = np.where(minimo <= maximo, np.clip(activos, minimo, maximo), np.nan)
+        meta = np.select([faltan <= 0, faltan == 1, faltan == 2], [activos, un_punto, dos_puntos], np.nan)
+        return np.where(np.isfinite(meta) & (meta > 0), meta, np.nan)
+
+    def _asegurar(self, campo, meta, valores, limites, objetivo):
+        """
+        Corrige el redondeo de la meta hasta que el estado objetivo se cumpla
+        con las fórmulas exactas; marca NaN donde no se alcanza.
+
+        Se verifica el valor que obtendrá quien aplique el ajuste
+        (valor + ajuste), que puede diferir de la meta en un redondeo.
+
+        Returns:
+            np.ndarray: Ajuste por empresa
+        """
+        actual = valores[campo]
+        ajuste = meta - actual
+        estado = self._estado(dict(valores, **{campo: actual + ajuste}), limites)
+        # Tras la primera evaluación solo se recalculan las filas que fallan
+        filas = np.flatnonzero((estado < objetivo) & ~np.isnan(ajuste))
+        for paso in range(self.PASOS_AJUSTE):
+            if not len(filas):
+                break
+            base = actual[filas]
+            direccion = np.sign(ajuste[filas])
+            if campo == 'empleados':
+                ajuste[filas] += direccion
+            else:
+                # Un ulp de la cota |valor| + |ajuste| de la suma: el paso es
+                # exacto en el ajuste y siempre cambia valor + ajuste
+                ajuste[filas] += direccion * np.spacing(np.abs(base) + np.abs(ajuste[filas]))
+            # Sin dirección de ajuste no hay corrección posible
+            ajuste[filas[direccion == 0]] = np.nan
+            subconjunto = {nombre: columna[filas] for nombre, columna in valores.items()}
+            subconjunto[campo] = base + ajuste[filas]
+            estado = self._estado(subconjunto, limites[filas])
+            filas = filas[(estado < objetivo) & ~np.isnan(ajuste[filas])]
+        ajuste[filas] = np.nan
+        return ajuste
+
+    def calcular(self, datos, estado_objetivo='Bueno', campos=None):
+        """
+        Calcula el ajuste mínimo de cada campo, por separado, para alcanzar
+        el estado objetivo.
+
+        Cada ajuste supone que los demás campos no cambian. Las reducciones
+        son negativas (deudas, cartera, empleados), los aumentos positivos
+        (ganancias) y los activos pueden ir en cualquier sentido. Las empresas
+        que ya están en el estado objetivo o uno mejor tienen ajuste 0; las
+        que no pueden alcanzarlo cambiando solo ese campo tienen NaN.
+
+        Args:
+            datos (EmpresaBatch | dict | pandas.DataFrame): Portafolio, en el
+                formato de AnalizadorFinanciero.analizar_lote
+            estado_objetivo (str): Estado general a alcanzar (ver ESTADOS)
+            campos (iterable, optional): Campos a ajustar; por defecto CAMPOS
+
+        Returns:
+            dict: 'estado_actual' (códigos de estado por empresa),
+                'estado_objetivo' (código) y 'ajustes' (campo -> arreglo de
+                variaciones absolutas por empresa)
+        """
+        if estado_objetivo not in UMBRALES_ESTADO:
+            raise ValueError(f"Estado desconocido: {estado_objetivo}")
+        campos = self.CAMPOS if campos is None else tuple(campos)
+        desconocidos = set(campos) - set(self.CAMPOS)
+        if desconocidos:
+            raise ValueError(f"Campos no soportados: {', '.join(sorted(desconocidos))}")
+
+        lote = datos if isinstance(datos, EmpresaBatch) else EmpresaBatch.from_dict(datos)
+        tabla = self.analizador_financiero.tabla_sectores
+        limites = tabla.limites(tabla.codigos_lote(lote.sector))
+        valores = {campo: np.asarray(getattr(lote, campo), dtype=np.float64) for campo in self.CAMPOS}
+
+        indicadores = Indicadores.calcular_lote(*(valores[campo] for campo in self.CAMPOS))
+        favorable = Indicadores.evaluar_lote(indicadores, limites)
+        estado = Indicadores.estado_lote(favorable)
+        objetivo = ESTADOS.index(estado_objetivo)
+        puntos_objetivo = UMBRALES_ESTADO[estado_objetivo]
+        alcanzado = estado >= objetivo
+
+        ajustes = {}
+        for campo in campos:
+            meta = getattr(self, '_meta_' + campo)(valores, limites, favorable, puntos_objetivo)
+            ajuste = self._asegurar(campo, np.where(alcanzado, valores[campo], meta), valores, limites, objetivo)
+            ajustes[campo] = np.where(alcanzado, 0.0, ajuste)
+
+        return {
+            'estado_actual': estado,
+            'estado_objetivo': objetivo,
+            'ajustes': ajustes
+        }
@@ -0,0 +1,117 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class CacheAnalisis:
+    """
+    Caché LRU de resultados de análisis indexada por la huella de los datos
+    de la empresa y la versión de los límites por sector.
+    """
+    CAMPOS_HUELLA = ('nombre', 'sector', 'ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+
+    def __init__(self, max_entradas=1024):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_entradas (int): Número máximo de resultados guardados
+        """
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser mayor o igual a 1")
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @staticmethod
+    def _normalizar(valor):
+        """
+        Representación canónica de un campo: los números como float (1 y
+        1.0, o un entero de NumPy, dan la misma huella, y -0.0 se une a 0.0)
+        y el resto como texto.
+        """
+        if isinstance(valor, (int, float, np.integer, np.floating)) and not isinstance(valor, bool):
+            return float(valor) + 0.0
+        return str(valor)
+
+    @classmethod
+    def huella(cls, empresa):
+        """
+        Calcula una huella estable (igual entre procesos y ejecuciones) de
+        los datos de una empresa. Los campos numéricos se comparan por
+        valor, sin importar su tipo.
+
+        Args:
+            empresa (Empresa): Empresa a identificar
+
+        Returns:
+            str: Huella hexadecimal
+        """
+        datos = empresa.data_dict
+        texto = repr(tuple(cls._normalizar(datos[campo]) for campo in cls.CAMPOS_HUELLA))
+        return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+    def obtener(self, clave):
+        """
+        Busca un resultado y lo marca como usado recientemente.
+
+        Args:
+            clave (tuple): Clave construida por el analizador
+
+        Returns:
+            ResultadoAnalisis | None: Resultado guardado o None si no existe
+        """
+        with self._lock:
+            resultado = self._entradas.get(clave)
+            if resultado is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return resultado
+
+    def guardar(self, clave, resultado):
+        """
+        Guarda un resultado, desalojando el menos usado si se supera el límite.
+
+        Args:
+            clave (tuple): Clave construida por el analizador
+            resultado (ResultadoAnalisis): Resultado a guardar
+        """
+        with self._lock:
+            self._entradas[clave] = resultado
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def limpiar(self):
+        """
+        Elimina todas las entradas (las estadísticas se conservan).
+        """
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def estadisticas(self):
+        """
+        Retorna las estadísticas de uso de la caché.
+
+        Returns:
+            dict: Entradas, capacidad, aciertos, fallos, desalojos y tasa de aciertos
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._entradas),
+            'max_entradas': self.max_entradas,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+        }
@@ -0,0 +1,158 @@
+import math
+import numpy as np
+from models.analisis import INDICADORES, REGLAS_EVALUACION
+from services.tabla_sectores import clave_sector, grupos_sector
+
+
+class ConsultaResultados:
+    """
+    Consultas de ranking sobre un ResultadoBatch: los k mejores o peores por
+    indicador, globales o por sector, y el top por porcentaje. Usa selección
+    parcial (argpartition) y solo ordena las filas seleccionadas; el resultado
+    son vistas (ResultadoVista) de esas filas, sin materializar el resto.
+    """
+    # Indicadores donde un valor menor es mejor desempeño, según las reglas
+    MENOR_ES_MEJOR = {regla['indicador']: regla['comparacion'] in ('<', '<=') for regla in REGLAS_EVALUACION}
+
+    def __init__(self, resultados, tabla_sectores=None):
+        """
+        Inicializa las consultas sobre un lote.
+
+        Args:
+            resultados (ResultadoBatch): Resultados del análisis por lotes
+            tabla_sectores (TablaSectores, optional): Tabla usada para agrupar
+                sinónimos de sector; sin ella se agrupa por nombre normalizado
+        """
+        self.resultados = resultados
+        self.tabla_sectores = tabla_sectores
+        self._grupos = None
+
+    @property
+    def grupos(self):
+        """
+        Filas de cada sector, calculadas una sola vez.
+
+        Returns:
+            dict: Clave de sector -> índices de las filas
+        """
+        if self._grupos is None:
+            self._grupos = dict(grupos_sector(self.resultados.sector, self.tabla_sectores))
+        return self._grupos
+
+    def _filas_sector(self, sector):
+        if sector is None:
+            return None
+        return self.grupos.get(clave_sector(sector, self.tabla_sectores), np.empty(0, dtype=np.intp))
+
+    def _columna(self, indicador):
+        if indicador not in INDICADORES:
+            raise ValueError(f"Indicador desconocido: {indicador}")
+        return np.asarray(getattr(self.resultados, indicador))
+
+    def seleccionar(self, indicador, k, mejores=True, filas=None):
+        """
+        Selecciona las k filas con mejor (o peor) desempeño en un indicador.
+
+        Args:
+            indicador (str): Nombre del indicador (ver INDICADORES)
+            k (int): Número de filas a seleccionar
+            mejores (bool): True para el mejor desempeño, False para el peor
+            filas (np.ndarray, optional): Restringe la selección a estas filas
+
+        Returns:
+            np.ndarray: Índices de las filas, del primero al último del ranking
+                (empates por posición en el lote; se omiten los NaN)
+        """
+        valores = self._columna(indicador)
+        if filas is not None:
+            valores = valores[filas]
+        candidatos = None
+        if np.isnan(valores).any():
+            candidatos = np.flatnonzero(~np.isnan(valores))
+            valores = valores[candidatos]
+
+        k = min(int(k), len(valores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+
+        # Se seleccionan siempre los menores: se invierte el signo si conviene el mayor
+        ascendente = self.MENOR_ES_MEJOR[indicador] == mejores
+        clave = valores if ascendente else -valores
+        if k < len(clave):
+            # argpartition elige empates al azar en el límite: se toman los
+            # estrictamente mejores y se completa con los empatados en orden de fila
+            umbral = np.partition(clave, k - 1)[k - 1]
+            mejores_filas = np.flatnonzero(clave < umbral)
+            empatadas = np.flatnonzero(clave == umbral)[:k - len(mejores_filas)]
+            seleccion = np.concatenate((mejores_filas, empatadas))
+        else:
+            seleccion = np.arange(len(clave))
+        seleccion = seleccion[np.lexsort((seleccion, clave[seleccion]))]
+
+        if candidatos is not None:
+            seleccion = candidatos[seleccion]
+        if filas is not None:
+            seleccion = np.asarray(filas)[seleccion]
+        return seleccion
+
+    def _vistas(self, filas):
+        return [self.resultados[fila] for fila in filas.tolist()]
+
+    def top(self, indicador, k=10, mejores=True, sector=None):
+        """
+        Las k empresas con mejor o peor desempeño en un indicador.
+
+        Por ejemplo, las 100 peores en rotación de cartera de Manufactura:
+        top('rotacion_cartera', 100, mejores=False, sector='Manufactura').
+
+        Args:
+            indicador (str): Nombre del indicador
+            k (int): Número de empresas
+            mejores (bool): True para el mejor desempeño, False para el peor
+            sector (str, optional): Restringe la consulta a un sector
+
+        Returns:
+            list: ResultadoVista de las filas seleccionadas, en orden de ranking
+        """
+        return self._vistas(self.seleccionar(indicador, k, mejores, self._filas_sector(sector)))
+
+    def top_por_sector(self, indicador, k=10, mejores=True):
+        """
+        Las k empresas con mejor o peor desempeño de cada sector.
+
+        Args:
+            indicador (str): Nombre del indicador
+            k (int): Número de empresas por sector
+            mejores (bool): True para el mejor desempeño, False para el peor
+
+        Returns:
+            dict: Clave de sector -> lista de ResultadoVista en orden de ranking
+        """
+        return {
+            clave: self._vistas(self.seleccionar(indicador, k, mejores, filas))
+            for clave, filas in self.grupos.items()
+        }
+
+    def top_fraccion(self, indicador, fraccion=0.01, mejores=True, por_sector=True):
+        """
+        El porcentaje superior (o inferior) de empresas en un indicador; por
+        ejemplo el 1% con mayor ROA de cada sector: top_fraccion('rentabilidad', 0.01).
+
+        Args:
+            indicador (str): Nombre del indicador
+            fraccion (float): Fracción de empresas (0.01 = 1%), redondeada hacia arriba
+            mejores (bool): True para el mejor desempeño, False para el peor
+            por_sector (bool): Si es True la fracción se aplica dentro de cada sector
+
+        Returns:
+            dict | list: Por sector, clave -> lista de ResultadoVista; si no, una lista
+        """
+        if not 0 < fraccion <= 1:
+            raise ValueError("fraccion debe estar entre 0 y 1")
+        if not por_sector:
+            k = math.ceil(fraccion * len(self.resultados))
+            return self._vistas(self.seleccionar(indicador, k, mejores))
+        return {
+            clave: self._vistas(self.seleccionar(indicador, math.ceil(fraccion * len(filas)), mejores, filas))
+            for clave, filas in self.grupos.items()
+        }
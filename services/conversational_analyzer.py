@@ -7,9 +7,11 @@ class ConversationalAnalyzer:
     Maneja la recopilación de datos de manera conversacional
     y asegura que las respuestas estén enfocadas EXCLUSIVAMENTE en temas financieros
     """
-    def __init__(self, analizador_financiero, nlp_service):
+    def __init__(self, analizador_financiero, nlp_service, indice_pares=None):
         self.analizador_financiero = analizador_financiero
         self.nlp_service = nlp_service
+        # Índice de pares de la sesión (NLPService es compartido entre sesiones)
+        self.indice_pares = indice_pares
         
         # Estados de la conversación
         self.ESTADOS = {
@@ -462,8 +464,8 @@ Intenta de nuevo:"""
                 deudas=datos['deudas']
             )
             
-            # Realizar análisis
-            resultados = self.analizador_financiero.analizar_empresa(empresa)
+            # Realizar análisis (el chat no muestra los ejemplos NLP)
+            resultados = self.analizador_financiero.analizar_empresa(empresa, incluir_nlp=False)
             
             # Guardar resultados
             st.session_state.datos_empresa = {
@@ -523,7 +525,8 @@ Aunque me encantaría ayudarte con esta consulta específica, te puedo ser mucho
             
         # Para temas financieros o conversacionales, procesamos normalmente
         if 'datos_empresa' in st.session_state:
-            return self.nlp_service.generar_respuesta_chat(mensaje, st.session_state.datos_empresa)
+            return self.nlp_service.generar_respuesta_chat(mensaje, st.session_state.datos_empresa,
+                                                          indice_pares=self.indice_pares)
         else:
             return "Parece que hubo un error. ¿Te gustaría empezar un nuevo análisis?"
     
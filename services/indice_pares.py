@@ -0,0 +1,243 @@
+import threading
+import numpy as np
+from models.analisis import INDICADORES
+from services.tabla_sectores import clave_sector
+
+
+class IndicePares:
+    """
+    Índice de empresas pares: búsqueda de los k vecinos más cercanos sobre
+    los cuatro indicadores normalizados de los análisis guardados.
+
+    Los indicadores se comprimen con un logaritmo con signo (productividad y
+    rotación abarcan varios órdenes de magnitud) y se estandarizan con la
+    media y varianza de la población, mantenidas de forma incremental. La
+    búsqueda es fuerza bruta por bloques con NumPy: cada bloque conserva sus
+    k mejores candidatos y al final se ordenan solo esos.
+
+    Cada nombre de empresa ocupa una sola fila: volver a agregar una empresa
+    reemplaza su análisis anterior.
+    """
+    # Valor usado en lugar de inf (activos o ganancias en cero)
+    LIMITE_VALOR = 1e12
+
+    def __init__(self, capacidad=1024, tamano_bloque=65536):
+        """
+        Inicializa un índice vacío.
+
+        Args:
+            capacidad (int): Empresas reservadas inicialmente (se duplica al llenarse)
+            tamano_bloque (int): Filas procesadas a la vez en cada búsqueda
+        """
+        self.tamano_bloque = tamano_bloque
+        self._n = 0
+        # Una fila por indicador: cada bloque de la búsqueda lee memoria contigua
+        self._vectores = np.empty((len(INDICADORES), max(int(capacidad), 1)), dtype=np.float32)
+        self._indicadores = np.empty((len(INDICADORES), max(int(capacidad), 1)), dtype=np.float64)
+        self._sectores = np.empty(max(int(capacidad), 1), dtype=np.int32)
+        self._codigos_sector = {}
+        self._nombres_sector = []
+        self.nombres = []
+        # Nombre -> fila, para reemplazar los análisis repetidos
+        self._filas = {}
+        # Sumas para media y varianza de los vectores transformados
+        self._suma = np.zeros(len(INDICADORES), dtype=np.float64)
+        self._suma_cuadrados = np.zeros(len(INDICADORES), dtype=np.float64)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._n
+
+    @classmethod
+    def transformar(cls, indicadores):
+        """
+        Aplica la compresión logarítmica con signo a los indicadores.
+
+        Args:
+            indicadores (np.ndarray): Arreglo (4, ...) en el orden de INDICADORES
+
+        Returns:
+            np.ndarray: Valores transformados (NaN se trata como 0)
+        """
+        valores = np.nan_to_num(
+            np.asarray(indicadores, dtype=np.float64),
+            nan=0.0, posinf=cls.LIMITE_VALOR, neginf=-cls.LIMITE_VALOR
+        )
+        return np.sign(valores) * np.log1p(np.abs(valores))
+
+    def _codigo_sector(self, sector):
+        clave = clave_sector(sector)
+        codigo = self._codigos_sector.get(clave)
+        if codigo is None:
+            codigo = self._codigos_sector[clave] = len(self._nombres_sector)
+            self._nombres_sector.append(sector)
+        return codigo
+
+    def _reservar(self, filas):
+        capacidad = self._vectores.shape[1]
+        if self._n + filas <= capacidad:
+            return
+        while capacidad < self._n + filas:
+            capacidad *= 2
+        for atributo in ('_vectores', '_indicadores'):
+            anterior = getattr(self, atributo)
+            nuevo = np.empty((anterior.shape[0], capacidad), dtype=anterior.dtype)
+            nuevo[:, :self._n] = anterior[:, :self._n]
+            setattr(self, atributo, nuevo)
+        sectores = np.empty(capacidad, dtype=np.int32)
+        sectores[:self._n] = self._sectores[:self._n]
+        self._sectores = sectores
+
+    def _agregar_columnas(self, nombres, codigos_sector, indicadores):
+        # Una fila por nombre: dentro del lote gana la última aparición
+        ultimas = {}
+        for posicion, nombre in enumerate(nombres):
+            ultimas[nombre] = posicion
+        if len(ultimas) < len(nombres):
+            seleccion = np.fromiter(ultimas.values(), dtype=np.intp, count=len(ultimas))
+            nombres = list(ultimas)
+            codigos_sector = np.asarray(codigos_sector)[seleccion]
+            indicadores = np.asarray(indicadores)[:, seleccion]
+        indicadores = np.asarray(indicadores, dtype=np.float64)
+        codigos_sector = np.asarray(codigos_sector, dtype=np.int32)
+        vectores = self.transformar(indicadores).astype(np.float32)
+
+        destino = np.fromiter(
+            (self._filas.get(nombre, -1) for nombre in nombres), dtype=np.intp, count=len(nombres)
+        )
+        existentes = destino >= 0
+        if existentes.any():
+            filas = destino[existentes]
+            anteriores = self._vectores[:, filas].astype(np.float64)
+            self._suma -= anteriores.sum(axis=1)
+            self._suma_cuadrados -= np.square(anteriores).sum(axis=1)
+        nuevas = np.flatnonzero(~existentes)
+        self._reservar(len(nuevas))
+        destino[nuevas] = np.arange(self._n, self._n + len(nuevas))
+        for posicion in nuevas.tolist():
+            self._filas[nombres[posicion]] = self._n
+            self.nombres.append(nombres[posicion])
+            self._n += 1
+
+        self._indicadores[:, destino] = indicadores
+        self._vectores[:, destino] = vectores
+        self._sectores[destino] = codigos_sector
+        vectores = vectores.astype(np.float64)
+        self._suma += vectores.sum(axis=1)
+        self._suma_cuadrados += np.square(vectores).sum(axis=1)
+
+    def agregar(self, resultado):
+        """
+        Agrega un análisis al índice en tiempo constante amortizado, o
+        reemplaza el anterior de la misma empresa.
+
+        Args:
+            resultado (ResultadoAnalisis | ResultadoVista): Análisis a indexar
+        """
+        indicadores = np.array([[resultado.indicadores[nombre]] for nombre in INDICADORES], dtype=np.float64)
+        with self._lock:
+            self._agregar_columnas([resultado.nombre], [self._codigo_sector(resultado.sector)], indicadores)
+
+    def agregar_lote(self, resultados):
+        """
+        Agrega todos los análisis de un lote al índice.
+
+        Args:
+            resultados (ResultadoBatch): Resultados a indexar
+        """
+        indicadores = np.stack([np.asarray(getattr(resultados, nombre), dtype=np.float64) for nombre in INDICADORES])
+        sectores = resultados.sector
+        with self._lock:
+            valores = sectores.valores if hasattr(sectores, 'codigos') else None
+            if valores is not None:
+                traduccion = np.array([self._codigo_sector(valor) for valor in valores], dtype=np.int32)
+                codigos = traduccion[np.asarray(sectores.codigos)]
+            else:
+                codigos = np.fromiter(map(self._codigo_sector, sectores), dtype=np.int32, count=len(resultados))
+            self._agregar_columnas(list(resultados.nombre), codigos, indicadores)
+
+    def _pesos(self):
+        """
+        Inverso de la varianza de cada dimensión transformada.
+        """
+        media = self._suma / self._n
+        varianza = np.maximum(self._suma_cuadrados / self._n - np.square(media), 0.0)
+        return np.where(varianza > 0, 1.0 / np.where(varianza > 0, varianza, 1.0), 1.0).astype(np.float32)
+
+    def buscar(self, resultado, k=5, sector=None, excluir=None):
+        """
+        Busca las k empresas más parecidas a un análisis.
+
+        Args:
+            resultado (ResultadoAnalisis | ResultadoVista | dict): Análisis o
+                diccionario de indicadores a comparar
+            k (int): Número de pares a retornar
+            sector (str, optional): Restringe la búsqueda a un sector
+            excluir (str, optional): Nombre de empresa a omitir (p. ej. la
+                propia empresa si ya está indexada)
+
+        Returns:
+            list: Pares del más cercano al más lejano, cada uno con 'nombre',
+                'sector', 'distancia' e 'indicadores'
+        """
+        indicadores = resultado if isinstance(resultado, dict) else resultado.indicadores
+        consulta = self.transformar([indicadores[nombre] for nombre in INDICADORES]).astype(np.float32)
+
+        with self._lock:
+            n = self._n
+            if n == 0 or k < 1:
+                return []
+            codigo_sector = None
+            if sector is not None:
+                codigo_sector = self._codigos_sector.get(clave_sector(sector))
+                if codigo_sector is None:
+                    return []
+
+            pesos = self._pesos()
+            candidatos = min(k, n)
+            # Cada nombre ocupa una fila: la excluida se descarta antes de elegir candidatos
+            fila_excluida = self._filas.get(excluir, -1) if excluir is not None else -1
+            distancias_bloque = np.empty(min(self.tamano_bloque, n), dtype=np.float32)
+            temporal = np.empty_like(distancias_bloque)
+            otro_sector = np.empty(len(distancias_bloque), dtype=bool) if codigo_sector is not None else None
+            mejores_distancias = []
+            mejores_filas = []
+
+            for inicio in range(0, n, self.tamano_bloque):
+                fin = min(n, inicio + self.tamano_bloque)
+                distancias = distancias_bloque[:fin - inicio]
+                diferencia = temporal[:fin - inicio]
+                distancias.fill(0)
+                for dimension in range(len(INDICADORES)):
+                    np.subtract(self._vectores[dimension, inicio:fin], consulta[dimension], out=diferencia)
+                    np.multiply(diferencia, diferencia, out=diferencia)
+                    diferencia *= pesos[dimension]
+                    distancias += diferencia
+                if codigo_sector is not None:
+                    mascara = otro_sector[:fin - inicio]
+                    np.not_equal(self._sectores[inicio:fin], codigo_sector, out=mascara)
+                    np.copyto(distancias, np.inf, where=mascara)
+                if inicio <= fila_excluida < fin:
+                    distancias[fila_excluida - inicio] = np.inf
+
+                tomar = min(candidatos, fin - inicio)
+                filas = np.argpartition(distancias, tomar - 1)[:tomar]
+                mejores_distancias.append(distancias[filas].copy())
+                mejores_filas.append(filas + inicio)
+
+            distancias = np.concatenate(mejores_distancias)
+            filas = np.concatenate(mejores_filas)
+            orden = np.argsort(distancias, kind='stable')
+
+            pares = []
+            for posicion in orden:
+                if len(pares) == k or not np.isfinite(distancias[posicion]):
+                    break
+                fila = int(filas[posicion])
+                pares.append({
+                    'nombre': self.nombres[fila],
+                    'sector': self._nombres_sector[self._sectores[fila]],
+                    'distancia': float(np.sqrt(distancias[posicion])),
+                    'indicadores': dict(zip(INDICADORES, self._indicadores[:, fila].tolist()))
+                })
+            return pares
@@ -0,0 +1,202 @@
+import threading
+import numpy as np
+from models.analisis import INDICADORES
+from services.tabla_sectores import clave_sector, grupos_sector
+
+
+class IndicePercentiles:
+    """
+    Índice por sector de los valores ordenados de cada indicador, construido
+    a partir de análisis guardados. El percentil de una empresa es una
+    búsqueda binaria (searchsorted) sobre el arreglo ordenado más otra sobre
+    el búfer de inserciones pendientes, que se ordena aparte; el búfer solo
+    se mezcla con el arreglo (una concatenación y un ordenamiento) al
+    superar max_pendientes valores, de modo que las consultas no copian el
+    índice. Los valores NaN no se indexan.
+    """
+    # Indicadores donde un valor menor es mejor desempeño
+    MENOR_ES_MEJOR = {
+        'ratio_endeudamiento': True,
+        'rentabilidad': False,
+        'productividad': False,
+        'rotacion_cartera': True
+    }
+
+    def __init__(self, tabla_sectores=None, max_pendientes=4096):
+        """
+        Inicializa un índice vacío.
+
+        Args:
+            tabla_sectores (TablaSectores, optional): Tabla usada para agrupar
+                sinónimos de sector; sin ella se agrupa por nombre normalizado
+            max_pendientes (int): Valores acumulados antes de mezclarlos en el índice
+        """
+        self.tabla_sectores = tabla_sectores
+        self.max_pendientes = max_pendientes
+        self._ordenados = {}
+        self._pendientes = {}
+        self._num_pendientes = {}
+        self._filas = {}
+        self._lock = threading.RLock()
+
+    def _clave_sector(self, sector):
+        return clave_sector(sector, self.tabla_sectores)
+
+    def _sector(self, clave):
+        if clave not in self._ordenados:
+            self._ordenados[clave] = {nombre: np.empty(0, dtype=np.float64) for nombre in INDICADORES}
+            self._pendientes[clave] = {nombre: [] for nombre in INDICADORES}
+            self._num_pendientes[clave] = 0
+            self._filas[clave] = 0
+        return self._pendientes[clave]
+
+    def _pendientes_ordenados(self, clave, nombre):
+        """
+        Valores pendientes de un indicador, ordenados y unidos en un solo arreglo.
+        """
+        pendientes = self._pendientes[clave][nombre]
+        if not pendientes:
+            return np.empty(0, dtype=np.float64)
+        if len(pendientes) > 1:
+            pendientes[:] = [np.sort(np.concatenate(pendientes), kind='stable')]
+        return pendientes[0]
+
+    def _mezclar(self, clave):
+        """
+        Mezcla los valores pendientes de un sector con sus arreglos ordenados.
+        """
+        ordenados, pendientes = self._ordenados[clave], self._pendientes[clave]
+        for nombre in INDICADORES:
+            if pendientes[nombre]:
+                # Dos tramos ya ordenados: el ordenamiento estable los mezcla en tiempo lineal
+                ordenados[nombre] = np.sort(
+                    np.concatenate((ordenados[nombre], self._pendientes_ordenados(clave, nombre))), kind='stable'
+                )
+                pendientes[nombre] = []
+        self._num_pendientes[clave] = 0
+
+    def _agregar_valores(self, clave, valores, filas):
+        pendientes = self._sector(clave)
+        for nombre in INDICADORES:
+            columna = np.asarray(valores[nombre], dtype=np.float64).reshape(-1)
+            columna = columna[~np.isnan(columna)]
+            if len(columna):
+                # Cada arreglo pendiente se guarda ordenado
+                pendientes[nombre].append(np.sort(columna))
+        self._filas[clave] += filas
+        self._num_pendientes[clave] += filas
+        if self._num_pendientes[clave] >= self.max_pendientes:
+            self._mezclar(clave)
+
+    def agregar(self, resultado):
+        """
+        Agrega un análisis al índice.
+
+        Args:
+            resultado (ResultadoAnalisis | ResultadoVista): Análisis a indexar
+        """
+        with self._lock:
+            self._agregar_valores(self._clave_sector(resultado.sector), resultado.indicadores, 1)
+
+    def agregar_lote(self, resultados):
+        """
+        Agrega todos los análisis de un lote al índice.
+
+        Args:
+            resultados (ResultadoBatch): Resultados a indexar
+        """
+        with self._lock:
+            for clave, filas in grupos_sector(resultados.sector, self.tabla_sectores):
+                valores = {nombre: getattr(resultados, nombre)[filas] for nombre in INDICADORES}
+                self._agregar_valores(clave, valores, len(filas))
+
+    def tamano(self, sector):
+        """
+        Número de análisis indexados para un sector.
+
+        Args:
+            sector (str): Nombre del sector
+
+        Returns:
+            int: Cantidad de empresas en el índice del sector
+        """
+        return self._filas.get(self._clave_sector(sector), 0)
+
+    def _percentil_desempeno(self, clave, nombre, valores):
+        ordenado = self._ordenados[clave][nombre]
+        pendientes = self._pendientes_ordenados(clave, nombre)
+        n = len(ordenado) + len(pendientes)
+        valores = np.asarray(valores, dtype=np.float64)
+        if n == 0:
+            return np.full(np.shape(valores), np.nan)
+        if self.MENOR_ES_MEJOR[nombre]:
+            iguales_o_peores = n - (
+                np.searchsorted(ordenado, valores, side='left') + np.searchsorted(pendientes, valores, side='left')
+            )
+        else:
+            iguales_o_peores = (
+                np.searchsorted(ordenado, valores, side='right') + np.searchsorted(pendientes, valores, side='right')
+            )
+        return np.where(np.isnan(valores), np.nan, 100.0 * iguales_o_peores / n)
+
+    def percentiles(self, sector, indicadores):
+        """
+        Calcula el percentil de desempeño de cada indicador dentro del sector:
+        el porcentaje de empresas del índice con un desempeño igual o peor.
+
+        Args:
+            sector (str): Sector de la empresa
+            indicadores (dict): Indicadores de la empresa
+
+        Returns:
+            dict: Indicador -> percentil (0-100), sin los indicadores que no
+                tienen datos en el sector o son NaN en la empresa; None si
+                no queda ninguno
+        """
+        clave = self._clave_sector(sector)
+        with self._lock:
+            if clave not in self._ordenados:
+                return None
+            percentiles = {}
+            for nombre in INDICADORES:
+                percentil = float(self._percentil_desempeno(clave, nombre, indicadores[nombre]))
+                if percentil == percentil:
+                    percentiles[nombre] = percentil
+            return percentiles or None
+
+    def percentil_general(self, sector, indicadores):
+        """
+        Promedio de los percentiles de desempeño de los indicadores con datos.
+
+        Args:
+            sector (str): Sector de la empresa
+            indicadores (dict): Indicadores de la empresa
+
+        Returns:
+            float | None: Percentil general (0-100), o None si el sector no tiene datos
+        """
+        percentiles = self.percentiles(sector, indicadores)
+        if percentiles is None:
+            return None
+        return float(np.mean(list(percentiles.values())))
+
+    def percentiles_lote(self, resultados):
+        """
+        Calcula los percentiles de desempeño de todo un lote con una búsqueda
+        vectorizada por sector.
+
+        Args:
+            resultados (ResultadoBatch): Resultados a clasificar
+
+        Returns:
+            dict: Indicador -> arreglo de percentiles (NaN si el sector no tiene datos)
+        """
+        salida = {nombre: np.full(len(resultados), np.nan) for nombre in INDICADORES}
+        with self._lock:
+            for clave, filas in grupos_sector(resultados.sector, self.tabla_sectores):
+                if clave not in self._ordenados:
+                    continue
+                for nombre in INDICADORES:
+                    valores = getattr(resultados, nombre)[filas]
+                    salida[nombre][filas] = self._percentil_desempeno(clave, nombre, valores)
+        return salida
@@ -0,0 +1,143 @@
+import bisect
+import math
+import threading
+
+
+class Instrumentacion:
+    """
+    Colector de tiempos por etapa y contadores del análisis. Cada etapa
+    se agrega en un histograma de cubetas logarítmicas (de 1 µs a ~10 s),
+    sin guardar las mediciones individuales.
+    """
+    # Límites superiores de las cubetas en segundos: 4 por década desde 1 µs
+    LIMITES_CUBETAS = tuple(10 ** (exponente / 4) * 1e-6 for exponente in range(29))
+
+    def __init__(self):
+        """
+        Inicializa un colector vacío.
+        """
+        self._lock = threading.Lock()
+        self._etapas = {}
+        self.contadores = {}
+
+    def registrar(self, etapa, segundos):
+        """
+        Registra la duración de una etapa.
+
+        Args:
+            etapa (str): Nombre de la etapa (p. ej. 'indicadores')
+            segundos (float): Duración medida
+        """
+        cubeta = bisect.bisect_left(self.LIMITES_CUBETAS, segundos)
+        with self._lock:
+            datos = self._etapas.get(etapa)
+            if datos is None:
+                datos = self._etapas[etapa] = {
+                    'conteo': 0,
+                    'suma': 0.0,
+                    'minimo': math.inf,
+                    'maximo': 0.0,
+                    'cubetas': [0] * (len(self.LIMITES_CUBETAS) + 1)
+                }
+            datos['conteo'] += 1
+            datos['suma'] += segundos
+            datos['minimo'] = min(datos['minimo'], segundos)
+            datos['maximo'] = max(datos['maximo'], segundos)
+            datos['cubetas'][cubeta] += 1
+
+    def contar(self, nombre, cantidad=1):
+        """
+        Incrementa un contador.
+
+        Args:
+            nombre (str): Nombre del contador (p. ej. 'cache_aciertos')
+            cantidad (int): Incremento
+        """
+        with self._lock:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def percentil(self, etapa, q):
+        """
+        Estima un percentil de la duración de una etapa a partir del histograma
+        (límite superior de la cubeta que lo contiene).
+
+        Args:
+            etapa (str): Nombre de la etapa
+            q (float): Percentil entre 0 y 100
+
+        Returns:
+            float | None: Segundos, o None si la etapa no tiene mediciones
+        """
+        datos = self._etapas.get(etapa)
+        if not datos:
+            return None
+        objetivo = q / 100 * datos['conteo']
+        acumulado = 0
+        for posicion, conteo in enumerate(datos['cubetas']):
+            acumulado += conteo
+            if conteo and acumulado >= objetivo:
+                limite = self.LIMITES_CUBETAS[posicion] if posicion < len(self.LIMITES_CUBETAS) else math.inf
+                return min(limite, datos['maximo'])
+        return datos['maximo']
+
+    def reiniciar(self):
+        """
+        Descarta todas las mediciones y contadores.
+        """
+        with self._lock:
+            self._etapas.clear()
+            self.contadores.clear()
+
+    def exportar(self):
+        """
+        Exporta las mediciones agregadas.
+
+        Returns:
+            dict: 'etapas' (conteo, total, promedio, mínimo, máximo, p50, p99 y
+                cubetas acumuladas por etapa, en segundos) y 'contadores'
+        """
+        with self._lock:
+            etapas = {etapa: dict(datos, cubetas=list(datos['cubetas'])) for etapa, datos in self._etapas.items()}
+            contadores = dict(self.contadores)
+
+        salida = {}
+        for etapa, datos in etapas.items():
+            acumulado = 0
+            cubetas = []
+            for limite, conteo in zip(self.LIMITES_CUBETAS + (math.inf,), datos['cubetas']):
+                acumulado += conteo
+                cubetas.append({'hasta': limite, 'conteo': acumulado})
+            salida[etapa] = {
+                'conteo': datos['conteo'],
+                'total': datos['suma'],
+                'promedio': datos['suma'] / datos['conteo'],
+                'minimo': datos['minimo'],
+                'maximo': datos['maximo'],
+                'p50': self.percentil(etapa, 50),
+                'p99': self.percentil(etapa, 99),
+                'cubetas': cubetas
+            }
+        return {'etapas': salida, 'contadores': contadores}
+
+    def exportar_prometheus(self, prefijo='finanzgpt_analisis'):
+        """
+        Exporta las mediciones en el formato de texto de Prometheus.
+
+        Args:
+            prefijo (str): Prefijo de las métricas
+
+        Returns:
+            str: Histograma '<prefijo>_etapa_segundos' y un contador por nombre
+        """
+        exportado = self.exportar()
+        lineas = [f"# TYPE {prefijo}_etapa_segundos histogram"]
+        for etapa, datos in exportado['etapas'].items():
+            for cubeta in datos['cubetas']:
+                limite = '+Inf' if cubeta['hasta'] == math.inf else f"{cubeta['hasta']:.6g}"
+                lineas.append(f'{prefijo}_etapa_segundos_bucket{{etapa="{etapa}",le="{limite}"}} {cubeta["conteo"]}')
+            lineas.append(f'{prefijo}_etapa_segundos_sum{{etapa="{etapa}"}} {datos["total"]:.9g}')
+            lineas.append(f'{prefijo}_etapa_segundos_count{{etapa="{etapa}"}} {datos["conteo"]}')
+        for nombre, valor in exportado['contadores'].items():
+            lineas.append(f"# TYPE {prefijo}_{nombre}_total counter")
+            lineas.append(f"{prefijo}_{nombre}_total {valor}")
+        return '\n'.join(lineas) + '\n'
@@ -0,0 +1,95 @@
+from models.analisis import REGLAS_EVALUACION
+
+
+class LimitesPoblacion:
+    """
+    Deriva los límites por sector de los cuantiles de la población de
+    análisis guardados, leídos de los bosquejos de AgregadosSector en lugar
+    de recorrer el historial. El analizador agrega cada resultado con su
+    tabla de sectores, de modo que los sectores desconocidos alimentan los
+    límites de 'otro', que es con los que se evalúan.
+
+    Los límites se escriben en el LimitesSector del analizador, cuya versión
+    cambia con cada escritura; así las entradas de caché calculadas con los
+    límites anteriores dejan de usarse. Para no invalidar la caché en cada
+    análisis, solo se recalcula tras 'cada' empresas nuevas y solo se
+    escriben los límites que cambian más que 'tolerancia'.
+    """
+    # Cuantil del sector usado como límite de cada evaluación: con 0.5 una
+    # empresa es favorable si supera a la mediana de su sector
+    CUANTILES = {regla['evaluacion']: 0.5 for regla in REGLAS_EVALUACION}
+
+    def __init__(self, agregados_sector, cuantiles=None, min_empresas=100, cada=1000, tolerancia=0.01):
+        """
+        Inicializa el modo de límites poblacionales.
+
+        Args:
+            agregados_sector (AgregadosSector): Agregados con los bosquejos por sector
+            cuantiles (dict, optional): Evaluación -> cuantil del límite; por defecto CUANTILES
+            min_empresas (int): Empresas mínimas en un sector para reemplazar sus
+                límites; los sectores con menos datos conservan los fijos
+            cada (int): Empresas nuevas entre recálculos
+            tolerancia (float): Cambio relativo mínimo para escribir un límite
+        """
+        self.agregados_sector = agregados_sector
+        self.cuantiles = dict(self.CUANTILES, **(cuantiles or {}))
+        self.min_empresas = min_empresas
+        self.cada = cada
+        self.tolerancia = tolerancia
+        self._indicador = {regla['evaluacion']: regla['indicador'] for regla in REGLAS_EVALUACION}
+        self._total_ultimo_calculo = None
+
+    def _total(self):
+        return sum(self.agregados_sector.tamano(sector) for sector in self.agregados_sector.sectores)
+
+    def calcular(self, sector):
+        """
+        Calcula los límites de un sector a partir de sus cuantiles.
+
+        Args:
+            sector (str): Nombre del sector
+
+        Returns:
+            dict | None: Evaluación -> límite, o None si el sector tiene menos
+                de min_empresas análisis
+        """
+        if self.agregados_sector.tamano(sector) < self.min_empresas:
+            return None
+        return {
+            evaluacion: float(self.agregados_sector.cuantiles(sector, self._indicador[evaluacion], [cuantil])[0])
+            for evaluacion, cuantil in self.cuantiles.items()
+        }
+
+    def actualizar(self, limites_sector, forzar=False):
+        """
+        Recalcula y escribe los límites derivados si hay suficientes datos nuevos.
+
+        Args:
+            limites_sector (LimitesSector): Límites del analizador a actualizar
+            forzar (bool): Recalcula aunque no se hayan agregado 'cada' empresas
+
+        Returns:
+            bool: True si algún límite cambió (y con él la versión)
+        """
+        total = self._total()
+        if not forzar and self._total_ultimo_calculo is not None and total - self._total_ultimo_calculo < self.cada:
+            return False
+        self._total_ultimo_calculo = total
+
+        cambio = False
+        for sector, limites in limites_sector.items():
+            nuevos = self.calcular(sector)
+            if nuevos is None:
+                continue
+            cambios = {
+                evaluacion: valor for evaluacion, valor in nuevos.items()
+                if valor == valor and (
+                    limites.get(evaluacion) is None
+                    or abs(valor - limites[evaluacion]) > self.tolerancia * max(abs(limites[evaluacion]), 1e-12)
+                )
+            }
+            if cambios:
+                # Una sola escritura por sector: una nueva versión por sector modificado
+                limites.update(cambios)
+                cambio = True
+        return cambio
@@ -0,0 +1,130 @@
+import numpy as np
+from models.analisis import ESTADOS
+from utils.indicadores import Indicadores
+
+
+class ResultadoEscenarios:
+    """
+    Resultado de un barrido de escenarios: el estado general en cada punto
+    de la rejilla de variaciones.
+    """
+    def __init__(self, ejes, estado, estado_base):
+        """
+        Inicializa el resultado.
+
+        Args:
+            ejes (dict): Campo -> arreglo de variaciones relativas (un eje por campo)
+            estado (np.ndarray): Código de estado general en cada punto de la rejilla
+            estado_base (int): Código de estado general sin variaciones
+        """
+        self.ejes = ejes
+        self.estado = estado
+        self.estado_base = estado_base
+
+    @property
+    def estado_general_base(self):
+        return ESTADOS[self.estado_base]
+
+    @property
+    def cambia(self):
+        """
+        Máscara de los puntos de la rejilla donde cambia el estado general.
+        """
+        return self.estado != self.estado_base
+
+    def _combinaciones(self, mascara):
+        posiciones = np.nonzero(mascara)
+        variaciones = np.column_stack([
+            eje[posicion] for eje, posicion in zip(self.ejes.values(), posiciones)
+        ]) if posiciones else np.empty((0, 0))
+        return variaciones, self.estado[posiciones]
+
+    def cambios(self):
+        """
+        Combinaciones de variaciones que cambian el estado general.
+
+        Returns:
+            tuple: (matriz k × campos de variaciones, códigos de estado resultantes)
+        """
+        return self._combinaciones(self.cambia)
+
+    def mejoras(self):
+        """
+        Combinaciones de variaciones que mejoran el estado general.
+
+        Returns:
+            tuple: (matriz k × campos de variaciones, códigos de estado resultantes)
+        """
+        return self._combinaciones(self.estado > self.estado_base)
+
+    def resumen(self):
+        """
+        Cuenta los puntos de la rejilla que terminan en cada estado general.
+
+        Returns:
+            dict: Estado general -> número de combinaciones
+        """
+        conteo = np.bincount(self.estado.reshape(-1), minlength=len(ESTADOS))
+        return {estado: int(total) for estado, total in zip(ESTADOS, conteo)}
+
+
+class MotorEscenarios:
+    """
+    Evalúa rejillas completas de variaciones sobre los datos de una empresa
+    en un único cálculo difundido (broadcasting) de NumPy, con las mismas
+    fórmulas y límites que AnalizadorFinanciero.
+    """
+    CAMPOS = ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+
+    def __init__(self, analizador_financiero):
+        """
+        Inicializa el motor de escenarios.
+
+        Args:
+            analizador_financiero (AnalizadorFinanciero): Analizador con los límites a usar
+        """
+        self.analizador_financiero = analizador_financiero
+
+    def barrer(self, empresa, variaciones):
+        """
+        Evalúa el estado general para todas las combinaciones de variaciones.
+
+        Por ejemplo, {'deudas': np.linspace(-0.5, 0, 11),
+        'ganancias': np.linspace(0, 0.4, 9), 'empleados': np.linspace(-0.2, 0.2, 5)}
+        evalúa 11 × 9 × 5 escenarios. El número de empleados se trunca a
+        entero, como int() al construir una Empresa.
+
+        Args:
+            empresa (Empresa): Empresa base
+            variaciones (dict): Campo -> variaciones relativas (-0.2 = -20%)
+
+        Returns:
+            ResultadoEscenarios: Estado general en cada punto de la rejilla
+        """
+        desconocidos = set(variaciones) - set(self.CAMPOS)
+        if desconocidos:
+            raise ValueError(f"Campos no soportados en el barrido: {', '.join(sorted(desconocidos))}")
+
+        ejes = {campo: np.asarray(valores, dtype=np.float64).reshape(-1) for campo, valores in variaciones.items()}
+        dimensiones = len(ejes)
+
+        # Cada campo variado ocupa su propio eje de la rejilla
+        valores = {campo: np.float64(getattr(empresa, campo)) for campo in self.CAMPOS}
+        for eje, (campo, variacion) in enumerate(ejes.items()):
+            forma = [1] * dimensiones
+            forma[eje] = len(variacion)
+            valores[campo] = valores[campo] * (1 + variacion.reshape(forma))
+        valores['empleados'] = np.trunc(valores['empleados'])
+
+        tabla = self.analizador_financiero.tabla_sectores
+        limites = tabla.limites(tabla.codigo(empresa.sector))
+
+        indicadores = Indicadores.calcular_lote(*(valores[campo] for campo in self.CAMPOS))
+        favorable = Indicadores.evaluar_lote(indicadores, limites)
+        estado = Indicadores.estado_lote(favorable)
+        estado = np.broadcast_to(estado, tuple(len(variacion) for variacion in ejes.values()))
+
+        indicadores_base = Indicadores.calcular_lote(*(getattr(empresa, campo) for campo in self.CAMPOS))
+        estado_base = int(Indicadores.estado_lote(Indicadores.evaluar_lote(indicadores_base, limites)))
+
+        return ResultadoEscenarios(ejes, estado, estado_base)
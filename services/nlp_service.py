@@ -107,12 +107,21 @@ class NLPService:
             'robot', 'gemini', 'poesía', 'chiste', 'broma', 'anime', 'videojuegos', 'cuento'
         ]
         
+        # Índice opcional de percentiles sectoriales (IndicePercentiles)
+        self.indice_percentiles = None
+        
         print("✅ Gemini 2.0 Flash cargado exitosamente")
         NLPService._initialized = True
     
-    def generar_respuesta_chat(self, mensaje, contexto_empresa=None):
+    def generar_respuesta_chat(self, mensaje, contexto_empresa=None, indice_pares=None):
         """
         Genera respuestas excepcionales tipo ChatGPT en español con enfoque financiero.
+        
+        Args:
+            mensaje (str): Mensaje del usuario
+            contexto_empresa (dict): Datos de la empresa analizada en la sesión
+            indice_pares (IndicePares): Índice de empresas pares de la sesión; se
+                recibe en cada llamada porque el servicio es compartido entre sesiones
         """
         try:
             # Verificar si el mensaje está relacionado con finanzas
@@ -215,7 +224,7 @@ Usa estos datos para personalizar tus respuestas y dar consejos específicos.
                     
                     # Verificar que esté en español
                     if self._detectar_ingles(respuesta):
-                        return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero)
+                        return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero, indice_pares)
                     
                     # Verificar que sea respuesta financiera para temas no financieros
                     if not es_tema_financiero and tipo_mensaje != "conversacional":
@@ -226,14 +235,14 @@ Usa estos datos para personalizar tus respuestas y dar consejos específicos.
                     
                     return respuesta
                 else:
-                    return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero)
+                    return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero, indice_pares)
             else:
                 print(f"Error de API: {response.status_code} - {response.text}")
-                return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero)
+                return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero, indice_pares)
                 
         except Exception as e:
             print(f"Error con Gemini: {e}")
-            return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero)
+            return self._respuesta_premium_espanol(mensaje, contexto_empresa, es_tema_financiero, indice_pares)
     
     def es_mensaje_financiero(self, mensaje):
         """
@@ -278,7 +287,7 @@ Usa estos datos para personalizar tus respuestas y dar consejos específicos.
         contador = sum(1 for palabra in palabras_ingles if ' ' + palabra + ' ' in ' ' + texto.lower() + ' ')
         return contador >= 3
     
-    def _respuesta_premium_espanol(self, mensaje, contexto_empresa=None, es_tema_financiero=True):
+    def _respuesta_premium_espanol(self, mensaje, contexto_empresa=None, es_tema_financiero=True, indice_pares=None):
         """Respuestas premium en español cuando falla Gemini."""
         mensaje_lower = mensaje.lower().strip()
         
@@ -376,7 +385,7 @@ A veces, hablar sobre los desafíos financieros puede aliviar mucho el estrés.
         
         # PREGUNTAS FINANCIERAS CON CONTEXTO
         if contexto_empresa and 'resultados' in contexto_empresa:
-            return self._respuesta_contextual_premium(mensaje, contexto_empresa)
+            return self._respuesta_contextual_premium(mensaje, contexto_empresa, indice_pares)
         
         # RESPUESTA GENERAL INTELIGENTE
         return """Interesante consulta. Como tu asistente financiero especializado, puedo ayudarte mejor si me das un poco más de contexto sobre lo que necesitas.
@@ -421,7 +430,7 @@ Puedo ser mucho más útil en temas como:
 
 ¿Te gustaría que exploremos alguno de estos temas financieros? ¿O quizás tienes alguna otra consulta relacionada con finanzas o economía en la que pueda ayudarte hoy?"""
     
-    def _respuesta_contextual_premium(self, mensaje, contexto_empresa):
+    def _respuesta_contextual_premium(self, mensaje, contexto_empresa, indice_pares=None):
         """Respuestas premium cuando hay contexto de empresa."""
         resultados = contexto_empresa['resultados']
         nombre = resultados['nombre']
@@ -792,6 +801,10 @@ Tu equipo está generando menos valor que el promedio del sector {sector}.
             
             return respuesta
         
+        # EMPRESAS PARES
+        elif indice_pares is not None and any(palabra in mensaje_lower for palabra in ['parecid', 'similar', 'pares', 'comparable', 'se parecen']):
+            return self._respuesta_empresas_pares(resultados, indice_pares)
+        
         # RESUMEN GENERAL EJECUTIVO
         elif any(palabra in mensaje_lower for palabra in ['resumen', 'general', 'completo', 'informe', 'reporte', 'análisis']):
             estado = resultados['estado_general']
@@ -923,14 +936,51 @@ Puedo profundizar en:
 
 ¿Qué necesitas?"""
     
+    def _respuesta_empresas_pares(self, resultados, indice_pares, k=5):
+        """Lista las empresas de la sesión con indicadores más parecidos según el índice de pares."""
+        nombre = resultados['nombre']
+        pares = indice_pares.buscar(resultados['indicadores'], k=k, excluir=nombre)
+        if not pares:
+            return f"""## 🔎 Empresas Similares a {nombre}
+
+Aún no hay suficientes análisis guardados para encontrar empresas comparables. A medida que más empresas se analicen podré mostrarte tus pares más cercanos."""
+        
+        filas = []
+        for posicion, par in enumerate(pares, 1):
+            indicadores = par['indicadores']
+            filas.append(
+                f"| {posicion} | {par['nombre']} | {par['sector']} | {indicadores['ratio_endeudamiento']:.2f} | "
+                f"{indicadores['rentabilidad']:.2%} | ${indicadores['productividad']:,.0f} | "
+                f"{indicadores['rotacion_cartera']:.1f} días |"
+            )
+        tabla = '\n'.join(filas)
+        return f"""## 🔎 Empresas Similares a {nombre}
+
+Estas son las {len(pares)} empresas con indicadores financieros más parecidos a los tuyos:
+
+| # | Empresa | Sector | Endeudamiento | Rentabilidad | Productividad | Rotación |
+|---|---------|--------|---------------|--------------|---------------|----------|
+{tabla}
+
+Comparar tus resultados con estos pares te ayuda a identificar qué prácticas adoptar y dónde tienes ventaja competitiva."""
+    
+    def _describir_posicion_sector(self, resultados):
+        """Describe la posición sectorial con el percentil real si hay un índice disponible."""
+        percentil = None
+        if self.indice_percentiles is not None:
+            percentil = self.indice_percentiles.percentil_general(resultados['sector'], resultados['indicadores'])
+        if percentil is None:
+            return "ubicándose entre las empresas líderes de su sector"
+        return f"ubicándose en el percentil {percentil:.0f} del sector"
+    
     def _generar_diagnostico_ejecutivo(self, resultados):
         """Genera diagnóstico ejecutivo ultra profesional."""
         problemas = sum(1 for val in resultados['evaluacion'].values() if val not in ['bueno', 'buena'])
         
         if problemas == 0:
-            return """### 🌟 POSICIÓN DE LIDERAZGO ABSOLUTO
+            return f"""### 🌟 POSICIÓN DE LIDERAZGO ABSOLUTO
 
-Su empresa demuestra un desempeño financiero excepcional, ubicándose en el percentil 90 del sector. Esta posición privilegiada refleja:
+Su empresa demuestra un desempeño financiero excepcional, {self._describir_posicion_sector(resultados)}. Esta posición privilegiada refleja:
 
 - **Gestión de Clase Mundial:** Todos los indicadores superan ampliamente los benchmarks sectoriales
 - **Modelo de Negocio Robusto:** Alta eficiencia operativa y rentabilidad sostenible
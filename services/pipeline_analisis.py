@@ -0,0 +1,288 @@
+import csv
+import json
+import math
+import os
+import sys
+import time
+from contextlib import ExitStack
+from models.analisis import ESTADOS, EVALUACIONES, ETIQUETAS_EVALUACION, INDICADORES, RECOMENDACIONES
+from utils.validators import ESQUEMA_EMPRESA, Validators
+
+
+class PipelineAnalisis:
+    """
+    Pipeline de lectura → validación → análisis por lotes → escritura que
+    procesa archivos CSV/JSONL de cualquier tamaño con memoria acotada.
+    """
+    # Campo -> nombre para mensajes, igual que FormUI. Las reglas son las de
+    # ESQUEMA_EMPRESA (utils.validators)
+    NOMBRES_CAMPO = {
+        'nombre': "nombre de la empresa",
+        'sector': "sector",
+        'ganancias': "valor de ganancias",
+        'activos': "valor de activos",
+        'empleados': "número de empleados",
+        'cartera': "valor en cartera",
+        'deudas': "valor en deudas"
+    }
+    # Motivo del reporte de validación -> plantilla del mensaje de error
+    MENSAJES_MOTIVO = {
+        'faltante': "Por favor, ingresa un {nombre}.",
+        'no_numerico': "El {nombre} debe ser un número válido.",
+        'no_finito': "El {nombre} debe ser un número finito.",
+        'no_entero': "El {nombre} debe ser un número entero.",
+        'fuera_de_rango': "El {nombre} está fuera del rango permitido.",
+        'menor_al_minimo': "El {nombre} debe ser mayor o igual a {minimo}."
+    }
+    EXTENSIONES_JSONL = ('.jsonl', '.ndjson')
+
+    def __init__(self, analizador_financiero, tamano_lote=10000, reportar=None, intervalo_reporte=1.0):
+        """
+        Inicializa el pipeline.
+
+        Args:
+            analizador_financiero (AnalizadorFinanciero | AnalizadorParalelo): Analizador
+                con método analizar_lote
+            tamano_lote (int): Filas por lote de análisis; acota la memoria usada
+            reportar (callable, optional): Recibe el dict de estadísticas durante la ejecución
+            intervalo_reporte (float): Segundos mínimos entre reportes de progreso
+        """
+        if tamano_lote < 1:
+            raise ValueError("tamano_lote debe ser mayor o igual a 1")
+        self.analizador_financiero = analizador_financiero
+        self.tamano_lote = tamano_lote
+        self.reportar = reportar
+        self.intervalo_reporte = intervalo_reporte
+        self.validators = Validators()
+
+    @classmethod
+    def _es_jsonl(cls, ruta):
+        return os.path.splitext(ruta)[1].lower() in cls.EXTENSIONES_JSONL
+
+    def leer_registros(self, ruta, rechazar=None):
+        """
+        Lee registros de empresa uno a uno desde un archivo CSV o JSONL.
+
+        Args:
+            ruta (str): Ruta del archivo (.csv, .jsonl o .ndjson)
+            rechazar (callable, optional): Se llama con (fila, [mensajes]) por
+                cada línea JSONL que no es un objeto JSON válido; sin él, esas
+                líneas lanzan ValueError
+
+        Yields:
+            tuple: (número de fila, dict del registro)
+        """
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            if self._es_jsonl(ruta):
+                for numero, linea in enumerate(archivo, 1):
+                    if not linea.strip():
+                        continue
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError as error:
+                        mensaje = f"La línea no es JSON válido: {error.msg}."
+                    else:
+                        if isinstance(registro, dict):
+                            yield numero, registro
+                            continue
+                        mensaje = "La línea no es un objeto JSON con los datos de una empresa."
+                    if rechazar is None:
+                        raise ValueError(f"Fila {numero}: {mensaje}")
+                    rechazar(numero, [mensaje])
+            else:
+                # La fila 1 es el encabezado
+                for numero, registro in enumerate(csv.DictReader(archivo), 2):
+                    yield numero, registro
+
+    def _mensaje(self, campo, motivo):
+        if campo == 'nombre' and motivo == 'faltante':
+            return "El nombre de la empresa es obligatorio."
+        return self.MENSAJES_MOTIVO[motivo].format(
+            nombre=self.NOMBRES_CAMPO.get(campo, campo),
+            minimo=ESQUEMA_EMPRESA.get(campo, {}).get('minimo')
+        )
+
+    def validar(self, registros, rechazar=None):
+        """
+        Valida registros por bloques de tamano_lote con el esquema de
+        ESQUEMA_EMPRESA y los convierte en lotes de empresas.
+
+        Args:
+            registros (iterable): Tuplas (número de fila, dict)
+            rechazar (callable, optional): Se llama con (fila, [mensajes]) por cada registro inválido
+
+        Yields:
+            EmpresaBatch: Empresas válidas de cada bloque
+        """
+        for bloque in self.agrupar(registros):
+            numeros = [numero for numero, _ in bloque]
+            lote, reporte = self.validators.validar_registros([registro for _, registro in bloque])
+            if rechazar is not None and len(reporte['fila']):
+                mensajes = {}
+                for fila, campo, motivo in zip(
+                    reporte['fila'].tolist(), reporte['campo'].tolist(), reporte['motivo'].tolist()
+                ):
+                    mensajes.setdefault(fila, []).append(self._mensaje(campo, motivo))
+                for fila, mensajes_fila in mensajes.items():
+                    rechazar(numeros[fila], mensajes_fila)
+            if len(lote):
+                yield lote
+
+    def agrupar(self, elementos):
+        """
+        Agrupa elementos en bloques de tamaño fijo.
+
+        Args:
+            elementos (iterable): Elementos a agrupar (p. ej. registros leídos)
+
+        Yields:
+            list: Bloques de como máximo tamano_lote elementos
+        """
+        bloque = []
+        for elemento in elementos:
+            bloque.append(elemento)
+            if len(bloque) == self.tamano_lote:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
+
+    @staticmethod
+    def filas_resultado(resultados):
+        """
+        Convierte un ResultadoBatch en filas planas para escritura.
+
+        Args:
+            resultados (ResultadoBatch): Resultados de un lote
+
+        Yields:
+            dict: Fila con nombre, sector, indicadores, evaluacion_<indicador>,
+                estado_general y recomendaciones
+        """
+        favorables = resultados.favorables().tolist()
+        columnas = [getattr(resultados, nombre).tolist() for nombre in INDICADORES]
+        for fila, (nombre, sector, estado, recomendaciones) in enumerate(zip(
+            resultados.nombre.tolist(), resultados.sector.tolist(),
+            resultados.estado.tolist(), resultados.recomendaciones.tolist()
+        )):
+            salida = {'nombre': nombre, 'sector': sector}
+            for indicador, columna in zip(INDICADORES, columnas):
+                salida[indicador] = columna[fila]
+            for evaluacion, etiquetas, favorable in zip(EVALUACIONES, ETIQUETAS_EVALUACION, favorables[fila]):
+                salida[f'evaluacion_{evaluacion}'] = etiquetas[favorable]
+            salida['estado_general'] = ESTADOS[estado]
+            salida['recomendaciones'] = [
+                texto for bit, texto in enumerate(RECOMENDACIONES) if (recomendaciones >> bit) & 1
+            ]
+            yield salida
+
+    def _abrir_escritor(self, archivo, ruta):
+        if self._es_jsonl(ruta):
+            def escribir(fila):
+                # JSON no admite inf ni NaN: los indicadores no finitos se escriben como null
+                for indicador in INDICADORES:
+                    if not math.isfinite(fila[indicador]):
+                        fila[indicador] = None
+                archivo.write(json.dumps(fila, ensure_ascii=False, allow_nan=False) + '\n')
+            return escribir
+
+        escritor = csv.DictWriter(
+            archivo,
+            fieldnames=[
+                'nombre', 'sector', *INDICADORES,
+                *(f'evaluacion_{evaluacion}' for evaluacion in EVALUACIONES),
+                'estado_general', 'recomendaciones'
+            ]
+        )
+        escritor.writeheader()
+
+        def escribir(fila):
+            fila['recomendaciones'] = " | ".join(fila['recomendaciones'])
+            escritor.writerow(fila)
+        return escribir
+
+    def _actualizar_estadisticas(self, inicio):
+        estadisticas = self._estadisticas
+        estadisticas['segundos'] = time.perf_counter() - inicio
+        estadisticas['filas_por_segundo'] = (
+            estadisticas['filas_leidas'] / estadisticas['segundos'] if estadisticas['segundos'] > 0 else 0.0
+        )
+        return estadisticas
+
+    def ejecutar(self, entrada, salida, salida_errores=None):
+        """
+        Procesa el archivo de entrada completo y escribe los resultados
+        lote a lote en el archivo de salida.
+
+        Args:
+            entrada (str): Ruta del archivo CSV/JSONL de empresas
+            salida (str): Ruta del archivo CSV/JSONL de resultados
+            salida_errores (str, optional): Archivo JSONL donde registrar las filas inválidas
+
+        Returns:
+            dict: Estadísticas finales (filas leídas, válidas, inválidas, segundos, filas/seg)
+        """
+        self._estadisticas = {
+            'filas_leidas': 0, 'filas_validas': 0, 'filas_invalidas': 0,
+            'segundos': 0.0, 'filas_por_segundo': 0.0
+        }
+        inicio = time.perf_counter()
+        ultimo_reporte = inicio
+
+        def contar(registros):
+            for registro in registros:
+                self._estadisticas['filas_leidas'] += 1
+                yield registro
+
+        with ExitStack() as pila:
+            archivo = pila.enter_context(open(salida, 'w', newline='', encoding='utf-8'))
+            escribir = self._abrir_escritor(archivo, salida)
+            archivo_errores = (
+                pila.enter_context(open(salida_errores, 'w', encoding='utf-8')) if salida_errores else None
+            )
+
+            def rechazar(numero, mensajes):
+                self._estadisticas['filas_invalidas'] += 1
+                if archivo_errores is not None:
+                    archivo_errores.write(json.dumps({'fila': numero, 'errores': mensajes}, ensure_ascii=False) + '\n')
+
+            def rechazar_lectura(numero, mensajes):
+                self._estadisticas['filas_leidas'] += 1
+                rechazar(numero, mensajes)
+
+            lotes = self.validar(contar(self.leer_registros(entrada, rechazar_lectura)), rechazar)
+            for lote in lotes:
+                for fila in self.filas_resultado(self.analizador_financiero.analizar_lote(lote)):
+                    escribir(fila)
+                self._estadisticas['filas_validas'] += len(lote)
+
+                ahora = time.perf_counter()
+                if self.reportar and ahora - ultimo_reporte >= self.intervalo_reporte:
+                    self.reportar(self._actualizar_estadisticas(inicio))
+                    ultimo_reporte = ahora
+
+        estadisticas = self._actualizar_estadisticas(inicio)
+        if self.reportar:
+            self.reportar(estadisticas)
+        return estadisticas
+
+
+def _imprimir_progreso(estadisticas):
+    print(f"⏱️ {estadisticas['filas_leidas']:,} filas leídas "
+          f"({estadisticas['filas_por_segundo']:,.0f} filas/seg, "
+          f"{estadisticas['filas_invalidas']:,} inválidas)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    import argparse
+    from services.analizador_financiero import AnalizadorFinanciero
+
+    parser = argparse.ArgumentParser(description="Analiza un archivo CSV/JSONL de empresas por lotes")
+    parser.add_argument("entrada", help="Archivo de empresas (.csv, .jsonl)")
+    parser.add_argument("salida", help="Archivo de resultados (.csv, .jsonl)")
+    parser.add_argument("--errores", help="Archivo JSONL para las filas inválidas")
+    parser.add_argument("--tamano-lote", type=int, default=10000)
+    args = parser.parse_args()
+
+    pipeline = PipelineAnalisis(AnalizadorFinanciero(), args.tamano_lote, reportar=_imprimir_progreso)
+    pipeline.ejecutar(args.entrada, args.salida, args.errores)
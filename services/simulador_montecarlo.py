@@ -0,0 +1,123 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from models.analisis import ESTADOS, EVALUACIONES
+from utils.indicadores import Indicadores
+
+
+def _simular_bloque(semilla, n, base, volatilidades, limites):
+    """
+    Simula n escenarios de una empresa y cuenta los resultados.
+
+    Args:
+        semilla (np.random.SeedSequence): Semilla propia del bloque
+        n (int): Número de muestras del bloque
+        base (dict): Valores base de ganancias, empleados, activos, cartera y deudas
+        volatilidades (dict): Campo -> desviación estándar del logaritmo del factor
+        limites (np.ndarray): Límites del sector en el orden de EVALUACIONES
+
+    Returns:
+        tuple: (conteo por estado, conteo de indicadores favorables)
+    """
+    generador = np.random.default_rng(semilla)
+    valores = dict(base)
+    for campo, sigma in volatilidades.items():
+        # Factor lognormal con media 1: el valor esperado coincide con el dato reportado
+        valores[campo] = base[campo] * np.exp(sigma * generador.standard_normal(n) - sigma * sigma / 2)
+
+    indicadores = Indicadores.calcular_lote(
+        valores['ganancias'], valores['empleados'], valores['activos'], valores['cartera'], valores['deudas']
+    )
+    favorable = Indicadores.evaluar_lote(indicadores, limites)
+    favorable = np.broadcast_to(favorable, (n, len(EVALUACIONES)))
+    estado = Indicadores.estado_lote(favorable)
+    return np.bincount(estado, minlength=len(ESTADOS)), np.count_nonzero(favorable, axis=0)
+
+
+class SimuladorMonteCarlo:
+    """
+    Simulación Monte Carlo del estado general de una empresa bajo
+    incertidumbre en sus datos, con las fórmulas y límites de AnalizadorFinanciero.
+    """
+    # Volatilidad (desviación estándar logarítmica) de los datos inciertos por sector
+    VOLATILIDAD_SECTOR = {
+        'tecnología': {'ganancias': 0.35, 'cartera': 0.25},
+        'comercio': {'ganancias': 0.20, 'cartera': 0.20},
+        'manufactura': {'ganancias': 0.25, 'cartera': 0.20},
+        'servicios': {'ganancias': 0.20, 'cartera': 0.15},
+        'otro': {'ganancias': 0.25, 'cartera': 0.20}
+    }
+    CAMPOS = ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+
+    def __init__(self, analizador_financiero, volatilidad_sector=None, tamano_bloque=250000, workers=1):
+        """
+        Inicializa el simulador.
+
+        Args:
+            analizador_financiero (AnalizadorFinanciero): Analizador con los límites a usar
+            volatilidad_sector (dict, optional): Sector -> {campo: volatilidad}; por
+                defecto VOLATILIDAD_SECTOR
+            tamano_bloque (int): Muestras generadas a la vez; acota la memoria usada
+            workers (int): Procesos para repartir los bloques (1 = sin paralelismo)
+        """
+        if tamano_bloque < 1:
+            raise ValueError("tamano_bloque debe ser mayor o igual a 1")
+        self.analizador_financiero = analizador_financiero
+        self.volatilidad_sector = volatilidad_sector or self.VOLATILIDAD_SECTOR
+        self.tamano_bloque = tamano_bloque
+        self.workers = workers
+
+    def _volatilidades(self, sector):
+        tabla = self.analizador_financiero.tabla_sectores
+        clave = tabla.sectores[tabla.codigo(sector)]
+        return self.volatilidad_sector.get(clave, self.volatilidad_sector.get(tabla.SECTOR_DEFECTO, {}))
+
+    def simular(self, empresa, n_muestras=100000, semilla=None):
+        """
+        Simula el estado general de una empresa.
+
+        Con la misma semilla el resultado es idéntico sin importar el número
+        de procesos, porque cada bloque usa una semilla derivada de la
+        principal y de su posición.
+
+        Args:
+            empresa (Empresa): Empresa a simular
+            n_muestras (int): Número total de muestras
+            semilla (int, optional): Semilla para reproducibilidad
+
+        Returns:
+            dict: Probabilidad de cada estado general, probabilidad de que
+                cada indicador sea favorable y número de muestras
+        """
+        if n_muestras < 1:
+            raise ValueError("n_muestras debe ser mayor o igual a 1")
+
+        tabla = self.analizador_financiero.tabla_sectores
+        limites = tabla.limites(tabla.codigo(empresa.sector))
+        base = {campo: float(getattr(empresa, campo)) for campo in self.CAMPOS}
+        volatilidades = self._volatilidades(empresa.sector)
+
+        tamanos = [self.tamano_bloque] * (n_muestras // self.tamano_bloque)
+        if n_muestras % self.tamano_bloque:
+            tamanos.append(n_muestras % self.tamano_bloque)
+        semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+        argumentos = (
+            semillas, tamanos, [base] * len(tamanos), [volatilidades] * len(tamanos), [limites] * len(tamanos)
+        )
+
+        if self.workers > 1 and len(tamanos) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tamanos))) as executor:
+                parciales = list(executor.map(_simular_bloque, *argumentos))
+        else:
+            parciales = list(map(_simular_bloque, *argumentos))
+
+        conteo_estados = sum(parcial[0] for parcial in parciales)
+        conteo_favorables = sum(parcial[1] for parcial in parciales)
+        return {
+            'probabilidades': {
+                estado: float(conteo) / n_muestras for estado, conteo in zip(ESTADOS, conteo_estados)
+            },
+            'probabilidad_favorable': {
+                nombre: float(conteo) / n_muestras for nombre, conteo in zip(EVALUACIONES, conteo_favorables)
+            },
+            'muestras': n_muestras
+        }
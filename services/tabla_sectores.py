@@ -0,0 +1,263 @@
+import itertools
+import unicodedata
+import numpy as np
+from models.analisis import EVALUACIONES
+from models.columnas import ColumnaDiccionario
+
+# Contador global: cada modificación de cualquier LimitesSector recibe una versión única
+_VERSIONES = itertools.count(1)
+
+
+class _DictObservado(dict):
+    """
+    Diccionario que llama a una función de aviso después de cada modificación.
+    """
+    def __init__(self, aviso, datos=()):
+        super().__init__(datos)
+        self._aviso = aviso
+
+    def __setitem__(self, clave, valor):
+        super().__setitem__(clave, valor)
+        self._aviso()
+
+    def __delitem__(self, clave):
+        super().__delitem__(clave)
+        self._aviso()
+
+    def __ior__(self, otro):
+        self.update(otro)
+        return self
+
+    def update(self, *args, **kwargs):
+        for clave, valor in dict(*args, **kwargs).items():
+            super().__setitem__(clave, valor)
+        self._aviso()
+
+    def setdefault(self, clave, valor=None):
+        if clave not in self:
+            self[clave] = valor
+        return self[clave]
+
+    def pop(self, *args):
+        valor = super().pop(*args)
+        self._aviso()
+        return valor
+
+    def popitem(self):
+        par = super().popitem()
+        self._aviso()
+        return par
+
+    def clear(self):
+        super().clear()
+        self._aviso()
+
+
+class _LimitesIndicador(_DictObservado):
+    """
+    Límites de un sector; sus cambios incrementan la versión de LimitesSector.
+    """
+    def __init__(self, limites, padre):
+        super().__init__(padre._nueva_version, limites)
+
+
+class LimitesSector(_DictObservado):
+    """
+    Diccionario sector -> {indicador: límite} versionado. Cualquier cambio,
+    incluso dentro del diccionario de un sector, asigna una nueva versión,
+    lo que permite invalidar la tabla compilada y los análisis en caché.
+    """
+    def __init__(self, limites_sector):
+        """
+        Inicializa los límites versionados.
+
+        Args:
+            limites_sector (dict): Diccionario sector -> {indicador: límite}
+        """
+        super().__init__(self._nueva_version)
+        self.version = next(_VERSIONES)
+        self.update(limites_sector)
+
+    def __setitem__(self, clave, valor):
+        super().__setitem__(clave, _LimitesIndicador(valor, self))
+
+    def update(self, *args, **kwargs):
+        super().update({
+            clave: _LimitesIndicador(valor, self) for clave, valor in dict(*args, **kwargs).items()
+        })
+
+    def _nueva_version(self):
+        self.version = next(_VERSIONES)
+
+
+class TablaSectores:
+    """
+    Compila los límites por sector en una matriz densa sector × indicador
+    con una tabla de códigos enteros para los nombres de sector.
+    """
+    # Mismos sinónimos que acepta ConversationalAnalyzer._manejar_sector
+    SINONIMOS = {
+        'tecnología': ('tech', 'it', 'software'),
+        'comercio': ('retail', 'ventas'),
+        'manufactura': ('producción', 'fábrica'),
+        'servicios': ('consultoría',)
+    }
+    SECTOR_DEFECTO = 'otro'
+    MAX_MEMO = 4096
+
+    def __init__(self, limites_sector):
+        """
+        Compila la tabla a partir de un diccionario de límites por sector.
+
+        Args:
+            limites_sector (dict | LimitesSector): Diccionario sector -> {indicador: límite}
+        """
+        self.version = getattr(limites_sector, 'version', None)
+        self.sectores = tuple(limites_sector)
+        self.matriz = np.array(
+            [[limites_sector[sector][nombre] for nombre in EVALUACIONES] for sector in self.sectores],
+            dtype=np.float64
+        ).reshape(len(self.sectores), len(EVALUACIONES))
+        self.matriz.setflags(write=False)
+
+        self._codigos = {}
+        for codigo, sector in enumerate(self.sectores):
+            self._codigos[self.normalizar(sector)] = codigo
+        for sector, sinonimos in self.SINONIMOS.items():
+            codigo = self._codigos.get(self.normalizar(sector))
+            if codigo is not None:
+                for sinonimo in sinonimos:
+                    self._codigos.setdefault(self.normalizar(sinonimo), codigo)
+        self.codigo_defecto = self._codigos[self.SECTOR_DEFECTO]
+
+        # Memo de nombres ya vistos tal como llegan (sin normalizar), acotado
+        # a MAX_MEMO: los textos de sector son libres y no deben crecer sin límite
+        self._memo = {}
+
+    @staticmethod
+    def normalizar(sector):
+        """
+        Normaliza un nombre de sector: minúsculas, sin tildes ni espacios extremos.
+
+        Args:
+            sector (str): Nombre del sector
+
+        Returns:
+            str: Nombre normalizado
+        """
+        descompuesto = unicodedata.normalize('NFKD', str(sector).strip().lower())
+        return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+    def codigo(self, sector):
+        """
+        Retorna el código entero de un sector; los sectores desconocidos
+        reciben el código de 'otro'.
+
+        Args:
+            sector (str): Nombre del sector
+
+        Returns:
+            int: Código del sector
+        """
+        codigo = self._memo.get(sector)
+        if codigo is None:
+            codigo = self._codigos.get(self.normalizar(sector), self.codigo_defecto)
+            if len(self._memo) < self.MAX_MEMO:
+                self._memo[sector] = codigo
+        return codigo
+
+    def codigos_lote(self, sectores):
+        """
+        Convierte un arreglo de nombres de sector en códigos enteros.
+        Los arreglos que ya contienen códigos enteros se retornan sin cambios
+        y las columnas codificadas por diccionario solo resuelven sus valores distintos.
+
+        Args:
+            sectores (array-like | ColumnaDiccionario): Nombres de sector
+
+        Returns:
+            np.ndarray: Códigos de sector
+        """
+        if isinstance(sectores, ColumnaDiccionario):
+            traduccion = np.array([self.codigo(valor) for valor in sectores.valores], dtype=np.intp)
+            return traduccion[sectores.codigos]
+        sectores = np.asarray(sectores)
+        if sectores.dtype.kind in 'iu':
+            return sectores
+        sectores = sectores.astype(object, copy=False)
+        try:
+            return np.fromiter(map(self._memo.__getitem__, sectores), dtype=np.intp, count=len(sectores))
+        except KeyError:
+            traduccion = {sector: self.codigo(sector) for sector in set(sectores.tolist())}
+            return np.fromiter(map(traduccion.__getitem__, sectores), dtype=np.intp, count=len(sectores))
+
+    def limites(self, codigos):
+        """
+        Obtiene los límites de cada fila mediante indexación por códigos.
+
+        Args:
+            codigos (int | np.ndarray): Código o códigos de sector
+
+        Returns:
+            np.ndarray: Límites en el orden de EVALUACIONES
+        """
+        return self.matriz[codigos]
+
+
+# Sinónimo normalizado -> sector normalizado, para agrupar sin tabla
+_CANONICOS = {
+    TablaSectores.normalizar(sinonimo): TablaSectores.normalizar(sector)
+    for sector, sinonimos in TablaSectores.SINONIMOS.items()
+    for sinonimo in sinonimos
+}
+
+
+def clave_sector(sector, tabla_sectores=None):
+    """
+    Clave con la que se agrupan los datos de un sector: el nombre canónico
+    de la tabla o, sin tabla, el nombre normalizado. En ambos casos los
+    sinónimos de TablaSectores.SINONIMOS se agrupan con su sector.
+
+    Args:
+        sector (str): Nombre del sector
+        tabla_sectores (TablaSectores, optional): Tabla de sectores
+
+    Returns:
+        str: Clave del sector
+    """
+    if tabla_sectores is not None:
+        return tabla_sectores.sectores[tabla_sectores.codigo(sector)]
+    normalizado = TablaSectores.normalizar(sector)
+    return _CANONICOS.get(normalizado, normalizado)
+
+
+def grupos_sector(sectores, tabla_sectores=None):
+    """
+    Agrupa las filas de un lote por clave de sector.
+
+    Args:
+        sectores (array-like | ColumnaDiccionario): Columna de sectores del lote
+        tabla_sectores (TablaSectores, optional): Tabla de sectores
+
+    Yields:
+        tuple: (clave de sector, índices de las filas)
+    """
+    if tabla_sectores is not None:
+        codigos = tabla_sectores.codigos_lote(sectores)
+        claves = tabla_sectores.sectores
+    else:
+        if isinstance(sectores, ColumnaDiccionario):
+            valores, codigos_valores = list(sectores.valores), np.asarray(sectores.codigos)
+        else:
+            valores, codigos_valores = np.unique(np.asarray(sectores, dtype=object).astype(str), return_inverse=True)
+            valores = valores.tolist()
+        claves_valor = [clave_sector(valor) for valor in valores]
+        claves = sorted(set(claves_valor))
+        posicion = {clave: indice for indice, clave in enumerate(claves)}
+        traduccion = np.array([posicion[clave] for clave in claves_valor], dtype=np.intp)
+        codigos = traduccion[codigos_valores.reshape(-1)]
+    orden = np.argsort(codigos, kind='stable')
+    limites = np.searchsorted(codigos[orden], np.arange(len(claves) + 1))
+    for codigo, clave in enumerate(claves):
+        if limites[codigo] < limites[codigo + 1]:
+            yield clave, orden[limites[codigo]:limites[codigo + 1]]
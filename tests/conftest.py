@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from models.columnas import ColumnaDiccionario
+
+SECTORES = ('Tecnología', 'Comercio', 'Manufactura', 'Servicios', 'Otro', 'tech', 'Minería')
+
+
+def generar_columnas(n, semilla=0):
+    """
+    Columnas sintéticas de empresas, con ceros para ejercitar las
+    divisiones por cero y sectores desconocidos o sinónimos.
+    """
+    generador = np.random.default_rng(semilla)
+    ganancias = generador.lognormal(np.log(5e8), 1.0, n)
+    activos = generador.lognormal(np.log(3e9), 1.0, n)
+    ganancias[generador.random(n) < 0.05] = 0.0
+    activos[generador.random(n) < 0.05] = 0.0
+    return {
+        'nombre': np.array([f"Empresa {i}" for i in range(n)], dtype=object),
+        'sector': ColumnaDiccionario(generador.integers(0, len(SECTORES), n), list(SECTORES)),
+        'ganancias': ganancias,
+        'empleados': generador.integers(1, 500, n),
+        'activos': activos,
+        'cartera': generador.lognormal(np.log(1e8), 1.0, n),
+        'deudas': activos * generador.uniform(0.0, 1.5, n)
+    }
+
+
+@pytest.fixture
+def columnas():
+    return generar_columnas(500)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from services.agregados_sector import AgregadosSector
+from services.analizador_financiero import AnalizadorFinanciero
+from services.limites_poblacion import LimitesPoblacion
+from services.tabla_sectores import clave_sector
+from utils.estadisticas import BosquejoKLL
+
+PROBABILIDADES = np.linspace(0.01, 0.99, 99)
+
+
+def _error_rango(datos, bosquejo):
+    """Mayor diferencia entre la probabilidad pedida y el rango real del cuantil estimado."""
+    ordenados = np.sort(datos)
+    rangos = np.searchsorted(ordenados, bosquejo.cuantiles(PROBABILIDADES), side='right') / len(datos)
+    return np.max(np.abs(rangos - PROBABILIDADES))
+
+
+def test_bosquejo_acota_error_y_memoria():
+    datos = np.random.default_rng(0).lognormal(0, 2, 200000)
+    bosquejo = BosquejoKLL(k=200, semilla=1)
+    bosquejo.agregar_lote(datos[:150000])
+    for valor in datos[150000:151000]:
+        bosquejo.agregar(valor)
+    bosquejo.agregar_lote(datos[151000:])
+    assert len(bosquejo) == len(datos)
+    assert bosquejo.valores_retenidos < 3 * 200
+    assert _error_rango(datos, bosquejo) < 0.02
+    assert bosquejo.cuantil(0.0) == datos.min()
+    assert bosquejo.cuantil(1.0) == datos.max()
+
+
+def test_bosquejos_combinados_igual_de_precisos():
+    generador = np.random.default_rng(1)
+    partes = [generador.normal(media, 1.0, 50000) for media in (0.0, 3.0, 10.0)]
+    combinado = BosquejoKLL(k=200, semilla=2)
+    for semilla, parte in enumerate(partes, 3):
+        bosquejo = BosquejoKLL(k=200, semilla=semilla)
+        bosquejo.agregar_lote(parte)
+        combinado.combinar(bosquejo)
+    datos = np.concatenate(partes)
+    assert len(combinado) == len(datos)
+    assert combinado.minimo == datos.min() and combinado.maximo == datos.max()
+    assert _error_rango(datos, combinado) < 0.02
+
+
+def test_bosquejo_reproducible_con_semilla():
+    datos = np.random.default_rng(2).random(20000)
+    a, b = BosquejoKLL(k=64, semilla=7), BosquejoKLL(k=64, semilla=7)
+    a.agregar_lote(datos)
+    b.agregar_lote(datos)
+    np.testing.assert_array_equal(a.cuantiles(PROBABILIDADES), b.cuantiles(PROBABILIDADES))
+    assert np.isnan(BosquejoKLL().cuantil(0.5))
+    with pytest.raises(ValueError):
+        BosquejoKLL(k=4)
+
+
+def test_agregados_combinados_agrupan_sinonimos():
+    resultados = AnalizadorFinanciero().analizar_lote(generar_columnas(3000))
+    completo = AgregadosSector(semilla=0)
+    completo.agregar_lote(resultados)
+    combinado = AgregadosSector(semilla=0)
+    for inicio in range(0, 3000, 1000):
+        parcial = AgregadosSector(semilla=inicio)
+        parcial.agregar_lote(resultados[inicio:inicio + 1000])
+        combinado.combinar(parcial)
+
+    sectores = np.array(list(resultados.sector), dtype=object)
+    tecnologia = int(np.isin(sectores, ['Tecnología', 'tech']).sum())
+    assert completo.tamano('TECNOLOGIA') == combinado.tamano('Tecnología') == tecnologia
+    for sector in completo.sectores:
+        assert combinado.tamano(sector) == completo.tamano(sector)
+        resumen, otro = completo.resumen(sector), combinado.resumen(sector)
+        assert resumen['rentabilidad']['media'] == pytest.approx(otro['rentabilidad']['media'])
+
+
+def test_limites_poblacion_incluye_sectores_desconocidos_en_otro():
+    columnas = generar_columnas(3000)
+    limites_poblacion = LimitesPoblacion(AgregadosSector(), min_empresas=10, cada=1)
+    analizador = AnalizadorFinanciero(limites_poblacion=limites_poblacion)
+    resultados = analizador.analizar_lote(columnas)
+
+    sectores = np.array(list(resultados.sector), dtype=object)
+    # 'Minería' no está en la tabla de sectores: se evalúa y se agrega como 'otro'
+    otro = np.isin(sectores, ['Otro', 'Minería'])
+    agregados = limites_poblacion.agregados_sector
+    assert agregados.tamano('otro') == int(otro.sum())
+    assert clave_sector('Minería') not in agregados.sectores
+    assert len(agregados.sectores) == len(analizador.tabla_sectores.sectores)
+
+    limites_poblacion.actualizar(analizador.limites_sector, forzar=True)
+    mediana = analizador.limites_sector['otro']['rentabilidad']
+    rentabilidad = np.asarray(resultados.rentabilidad)[otro]
+    rango = np.mean(rentabilidad <= mediana)
+    assert rango == pytest.approx(0.5, abs=0.05)
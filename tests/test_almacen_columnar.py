@@ -0,0 +1,39 @@
+import os
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from models.empresa import EmpresaBatch
+from services.analizador_financiero import AnalizadorFinanciero
+from utils.almacen_columnar import AlmacenColumnar
+
+
+def test_ida_y_vuelta(tmp_path):
+    lote = EmpresaBatch.from_dict(generar_columnas(100))
+    AlmacenColumnar.guardar_empresas(lote, str(tmp_path / "lote"))
+    cargado = AlmacenColumnar.cargar_empresas(str(tmp_path / "lote"))
+    assert cargado.nombre.tolist() == lote.nombre.tolist()
+    np.testing.assert_array_equal(cargado.empleados, lote.empleados)
+
+
+def test_volver_a_guardar_reemplaza_el_lote(tmp_path):
+    destino = str(tmp_path / "lote")
+    lote = EmpresaBatch.from_dict(generar_columnas(100))
+    AlmacenColumnar.guardar_empresas(lote, destino)
+    abierto = AlmacenColumnar.cargar_empresas(destino)
+
+    resultados = AnalizadorFinanciero().analizar_lote(lote[:10])
+    AlmacenColumnar.guardar_resultados(resultados, destino)
+
+    assert len(AlmacenColumnar.cargar_resultados(destino)) == 10
+    # Sin restos del lote anterior ni directorios temporales
+    assert not any(nombre.startswith('ganancias') for nombre in os.listdir(destino))
+    assert os.listdir(tmp_path) == ["lote"]
+    # Los mapas de memoria abiertos sobre el lote anterior siguen siendo legibles
+    np.testing.assert_array_equal(abierto.ganancias, lote.ganancias)
+
+
+def test_no_reemplaza_directorios_ajenos(tmp_path):
+    (tmp_path / "notas.txt").write_text("no borrar")
+    with pytest.raises(ValueError):
+        AlmacenColumnar.guardar_empresas(EmpresaBatch.from_dict(generar_columnas(5)), str(tmp_path))
+    assert (tmp_path / "notas.txt").exists()
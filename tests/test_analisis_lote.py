@@ -0,0 +1,19 @@
+import numpy as np
+from models.analisis import INDICADORES
+from models.empresa import EmpresaBatch
+from services.analizador_financiero import AnalizadorFinanciero
+
+
+def test_lote_equivale_al_analisis_individual(columnas):
+    analizador = AnalizadorFinanciero()
+    lote = EmpresaBatch.from_dict(columnas)
+    resultados = analizador.analizar_lote(lote)
+
+    for empresa, vista in zip(lote, resultados):
+        individual = analizador.analizar_empresa(empresa.to_empresa(), incluir_nlp=False)
+        for nombre in INDICADORES:
+            np.testing.assert_equal(vista.indicadores[nombre], individual.indicadores[nombre])
+        assert vista.evaluacion == individual.evaluacion
+        assert vista.estado_general == individual.estado_general
+        assert vista.recomendaciones == individual.recomendaciones
+        assert vista.sector == individual.sector
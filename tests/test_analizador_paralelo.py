@@ -0,0 +1,34 @@
+import numpy as np
+from conftest import generar_columnas
+from services.agregados_sector import AgregadosSector
+from services.analizador_financiero import AnalizadorFinanciero
+from services.analizador_paralelo import AnalizadorParalelo
+from services.instrumentacion import Instrumentacion
+from services.limites_poblacion import LimitesPoblacion
+from utils.anomalias import DETECTOR_ANOMALIAS
+
+
+def test_camino_paralelo_igual_al_secuencial():
+    columnas = generar_columnas(3000)
+    esperado = AnalizadorFinanciero(detector_anomalias=DETECTOR_ANOMALIAS).analizar_lote(columnas)
+    with AnalizadorParalelo(AnalizadorFinanciero(detector_anomalias=DETECTOR_ANOMALIAS), workers=2, tamano_bloque=1000) as paralelo:
+        resultados = paralelo.analizar_lote(columnas)
+    np.testing.assert_array_equal(resultados.estado, esperado.estado)
+    np.testing.assert_array_equal(resultados.recomendaciones, esperado.recomendaciones)
+    np.testing.assert_array_equal(resultados.rentabilidad, esperado.rentabilidad)
+    np.testing.assert_array_equal(resultados.anomalias, esperado.anomalias)
+
+
+def test_camino_paralelo_actualiza_limites_e_instrumentacion():
+    columnas = generar_columnas(3000)
+    medir = Instrumentacion()
+    analizador = AnalizadorFinanciero(
+        instrumentacion=medir,
+        limites_poblacion=LimitesPoblacion(AgregadosSector(), min_empresas=10, cada=100)
+    )
+    version = analizador.version_limites
+    with AnalizadorParalelo(analizador, workers=2, tamano_bloque=1000) as paralelo:
+        paralelo.analizar_lote(columnas)
+        paralelo.analizar_lote(columnas)
+    assert analizador.version_limites != version
+    assert medir.contadores['filas_lote'] == 6000
@@ -0,0 +1,67 @@
+import numpy as np
+from conftest import generar_columnas
+from models.analisis import ANOMALIAS, INDICADORES, ResultadoBatch
+from models.columnas import ColumnaDiccionario
+from services.analizador_financiero import AnalizadorFinanciero
+from utils.anomalias import DETECTOR_ANOMALIAS, DetectorAnomalias
+
+
+def test_slice_no_calcula_anomalias():
+    columnas = generar_columnas(2000)
+    columnas['ganancias'][:5] = 1e15
+    resultados = AnalizadorFinanciero(detector_anomalias=DETECTOR_ANOMALIAS).analizar_lote(columnas)
+
+    parte = resultados[:100]
+    assert not resultados.anomalias_calculadas
+    assert not parte.anomalias_calculadas
+    # Las anomalías del slice son las del lote completo, no las de sus 100 filas
+    np.testing.assert_array_equal(parte.anomalias, resultados.anomalias[:100])
+    assert resultados.anomalias_calculadas
+    assert parte.anomalias[:5].any()
+
+
+def test_data_dict_conserva_anomalias():
+    columnas = generar_columnas(2000)
+    columnas['ganancias'][:5] = 1e15
+    resultados = AnalizadorFinanciero(detector_anomalias=DETECTOR_ANOMALIAS).analizar_lote(columnas)
+
+    copia = ResultadoBatch.from_dict(resultados.data_dict)
+    np.testing.assert_array_equal(copia.anomalias, resultados.anomalias)
+    np.testing.assert_array_equal(copia.estado, resultados.estado)
+    assert set(copia[0].anomalias) <= set(ANOMALIAS)
+
+
+def test_anomalias_son_opcionales():
+    resultados = AnalizadorFinanciero().analizar_lote(generar_columnas(100))
+    assert not resultados.anomalias.any()
+
+
+def test_detecta_exactamente_los_valores_inyectados():
+    generador = np.random.default_rng(3)
+    n = 40000
+    activos = generador.uniform(1e9, 2e9, n)
+    columnas = {
+        'sector': ColumnaDiccionario(generador.integers(0, 3, n), ['Tecnología', 'Comercio', 'Servicios']),
+        'ganancias': activos * generador.uniform(0.05, 0.15, n),
+        'empleados': generador.integers(100, 200, n),
+        'activos': activos,
+        'cartera': generador.uniform(1e8, 2e8, n),
+        'deudas': activos * generador.uniform(0.3, 0.6, n)
+    }
+    # Activos en cero: endeudamiento no finito (la rentabilidad queda en 0)
+    sin_activos = np.array([10, 500, 12345])
+    columnas['activos'][sin_activos] = 0.0
+    # Error de ×1000 en empleados dentro de Comercio: solo la productividad es atípica
+    comercio = np.flatnonzero(columnas['sector'].codigos == 1)
+    empleados_x1000 = comercio[[3, 700, 5000]]
+    columnas['empleados'][empleados_x1000] *= 1000
+
+    detector = DetectorAnomalias(tamano_muestra=4096)
+    anomalias = AnalizadorFinanciero(detector_anomalias=detector).analizar_lote(columnas).anomalias
+
+    no_finitos = 1 << INDICADORES.index('ratio_endeudamiento')
+    productividad_atipica = 1 << (len(INDICADORES) + INDICADORES.index('productividad'))
+    esperado = np.zeros(n, dtype=np.uint8)
+    esperado[sin_activos] = no_finitos
+    esperado[empleados_x1000] = productividad_atipica
+    np.testing.assert_array_equal(anomalias, esperado)
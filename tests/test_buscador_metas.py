@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from models.analisis import ESTADOS
+from models.empresa import EmpresaBatch
+from services.analizador_financiero import AnalizadorFinanciero
+from services.buscador_metas import BuscadorMetas
+
+
+def _estado_con_ajuste(analizador, columnas, campo, ajuste):
+    ajustadas = dict(columnas)
+    ajustadas[campo] = np.asarray(columnas[campo], dtype=np.float64) + ajuste
+    if campo == 'empleados':
+        ajustadas[campo] = ajustadas[campo].astype(np.int64)
+    return analizador.analizar_lote(EmpresaBatch.from_dict(ajustadas)).estado
+
+
+@pytest.mark.parametrize('campo', BuscadorMetas.CAMPOS)
+def test_ajustes_alcanzan_el_estado_objetivo(campo):
+    columnas = generar_columnas(2000, semilla=3)
+    analizador = AnalizadorFinanciero()
+    metas = BuscadorMetas(analizador).calcular(columnas, 'Bueno', campos=[campo])
+    ajuste = metas['ajustes'][campo]
+    alcanzables = ~np.isnan(ajuste)
+    assert alcanzables.any()
+
+    estado = _estado_con_ajuste(analizador, columnas, campo, np.where(alcanzables, ajuste, 0.0))
+    assert (estado[alcanzables] >= ESTADOS.index('Bueno')).all()
+
+
+def test_meta_activos_con_ganancias_negativas():
+    # Con ganancias negativas bajar los activos nunca da rentabilidad
+    # favorable, aunque su límite quede más cerca que el de endeudamiento
+    columnas = {
+        'nombre': ['a'], 'sector': ['Tecnología'], 'ganancias': [-10.0], 'empleados': [1],
+        'activos': [100.0], 'cartera': [1.0], 'deudas': [1000.0]
+    }
+    metas = BuscadorMetas(AnalizadorFinanciero()).calcular(columnas, 'Bueno', campos=['activos'])
+    ajuste = metas['ajustes']['activos'][0]
+    assert ajuste > 0
+    assert 100.0 + ajuste >= 1000.0 / 0.6
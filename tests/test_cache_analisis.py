@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from models.empresa import Empresa
+from services.analizador_financiero import AnalizadorFinanciero
+from services.cache_analisis import CacheAnalisis
+
+
+def test_huella_cache_compara_por_valor():
+    a = Empresa(nombre='a', sector='Comercio', ganancias=1, empleados=2, activos=3, cartera=0, deudas=0)
+    b = Empresa(nombre='a', sector='Comercio', ganancias=1.0, empleados=np.int64(2), activos=np.float64(3),
+                cartera=-0.0, deudas=0.0)
+    assert CacheAnalisis.huella(a) == CacheAnalisis.huella(b)
+    c = Empresa(nombre='a', sector='Comercio', ganancias=1.5, empleados=2, activos=3, cartera=0, deudas=0)
+    assert CacheAnalisis.huella(a) != CacheAnalisis.huella(c)
+
+
+def test_aciertos_y_cambio_de_limites():
+    cache = CacheAnalisis(max_entradas=8)
+    analizador = AnalizadorFinanciero(cache=cache)
+    empresa = Empresa(nombre='a', sector='Comercio', ganancias=4e8, empleados=10, activos=3e9, cartera=1e8, deudas=1e9)
+    primero = analizador.analizar_empresa(empresa, incluir_nlp=False)
+    assert analizador.analizar_empresa(Empresa.from_dict(empresa.data_dict), incluir_nlp=False) is primero
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+    # Los resultados calculados con los límites anteriores dejan de usarse
+    analizador.limites_sector['comercio']['rentabilidad'] = 0.5
+    segundo = analizador.analizar_empresa(empresa, incluir_nlp=False)
+    assert segundo is not primero
+    assert segundo.evaluacion['rentabilidad'] != primero.evaluacion['rentabilidad']
+
+
+def test_desaloja_el_menos_usado():
+    cache = CacheAnalisis(max_entradas=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obtener('a') == 1
+    cache.guardar('c', 3)
+    assert cache.obtener('b') is None
+    assert cache.obtener('a') == 1 and cache.obtener('c') == 3
+    assert cache.estadisticas()['desalojos'] == 1
+    with pytest.raises(ValueError):
+        CacheAnalisis(max_entradas=0)
@@ -0,0 +1,73 @@
+import math
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from services.analizador_financiero import AnalizadorFinanciero
+from services.consulta_resultados import ConsultaResultados
+from services.tabla_sectores import clave_sector
+
+
+def _referencia(valores, k, ascendente, filas=None):
+    """Ranking por ordenamiento completo: empates por posición y sin NaN."""
+    filas = np.arange(len(valores)) if filas is None else np.asarray(filas)
+    filas = filas[~np.isnan(valores[filas])]
+    clave = valores[filas] if ascendente else -valores[filas]
+    return filas[np.lexsort((filas, clave))][:k]
+
+
+@pytest.fixture
+def resultados():
+    columnas = generar_columnas(2000, semilla=4)
+    # Rentabilidades redondeadas para forzar empates en el límite del top
+    columnas['ganancias'] = columnas['activos'] * np.round(np.random.default_rng(4).uniform(0, 0.2, 2000), 2)
+    resultados = AnalizadorFinanciero().analizar_lote(columnas)
+    np.asarray(resultados.rentabilidad)[::97] = np.nan
+    return resultados
+
+
+@pytest.mark.parametrize('indicador', ['ratio_endeudamiento', 'rentabilidad', 'productividad', 'rotacion_cartera'])
+@pytest.mark.parametrize('mejores', [True, False])
+def test_seleccion_igual_al_ordenamiento_completo(resultados, indicador, mejores):
+    consulta = ConsultaResultados(resultados)
+    valores = np.asarray(getattr(resultados, indicador))
+    ascendente = ConsultaResultados.MENOR_ES_MEJOR[indicador] == mejores
+    for k in (1, 7, 50, 1999, 5000):
+        np.testing.assert_array_equal(consulta.seleccionar(indicador, k, mejores),
+                                      _referencia(valores, k, ascendente))
+
+
+def test_empates_en_orden_de_fila(resultados):
+    consulta = ConsultaResultados(resultados)
+    seleccion = consulta.seleccionar('rentabilidad', 30, mejores=True)
+    rentabilidad = np.asarray(resultados.rentabilidad)[seleccion]
+    # El ranking baja sin saltos y, dentro de cada empate, las filas van en orden
+    assert np.all(np.diff(rentabilidad) <= 0)
+    empatadas = seleccion[rentabilidad == rentabilidad[-1]]
+    assert np.all(np.diff(empatadas) > 0)
+    assert len(np.unique(rentabilidad)) < len(rentabilidad)
+
+
+def test_top_por_sector_agrupa_sinonimos(resultados):
+    consulta = ConsultaResultados(resultados)
+    sectores = np.array(list(resultados.sector), dtype=object)
+    tecnologia = np.flatnonzero(np.isin(sectores, ['Tecnología', 'tech']))
+    valores = np.asarray(resultados.rotacion_cartera)
+
+    peores = consulta.top('rotacion_cartera', 10, mejores=False, sector='TECH')
+    esperado = _referencia(valores, 10, ascendente=False, filas=tecnologia)
+    assert [vista.indicadores['rotacion_cartera'] for vista in peores] == valores[esperado].tolist()
+    por_sector = consulta.top_por_sector('rotacion_cartera', 10, mejores=False)
+    assert [vista.nombre for vista in por_sector[clave_sector('Tecnología')]] == [vista.nombre for vista in peores]
+    assert consulta.top('rentabilidad', 5, sector='Sector sin datos') == []
+
+
+def test_top_fraccion(resultados):
+    consulta = ConsultaResultados(resultados)
+    global_ = consulta.top_fraccion('productividad', 0.01, por_sector=False)
+    assert len(global_) == math.ceil(0.01 * len(resultados))
+    for clave, vistas in consulta.top_fraccion('productividad', 0.05).items():
+        assert len(vistas) == math.ceil(0.05 * len(consulta.grupos[clave]))
+    with pytest.raises(ValueError):
+        consulta.top_fraccion('productividad', 0)
+    with pytest.raises(ValueError):
+        consulta.top('liquidez')
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from models.analisis import ResultadoBatch
+from models.empresa import Empresa, EmpresaBatch
+from services.analizador_financiero import AnalizadorFinanciero
+
+
+def test_empleados_no_enteros_se_rechazan():
+    unos = np.ones(3)
+    for empleados in ([1, np.nan, 2], [1, 2.5, 3], [1, np.inf, 1]):
+        with pytest.raises(ValueError):
+            EmpresaBatch(['a'] * 3, ['x'] * 3, unos, empleados, unos, unos, unos)
+    lote = EmpresaBatch(['a'] * 3, ['x'] * 3, unos, [1.0, 2.0, 3.0], unos, unos, unos)
+    assert lote.empleados.dtype == np.int64
+    assert lote.empleados.tolist() == [1, 2, 3]
+
+
+def test_slices_comparten_memoria_e_indices_copian(columnas):
+    lote = EmpresaBatch.from_dict(columnas)
+    parte = lote[10:20]
+    assert len(parte) == 10
+    assert np.shares_memory(parte.ganancias, lote.ganancias)
+    assert not np.shares_memory(lote[[1, 2]].ganancias, lote.ganancias)
+    assert lote[-1].nombre == lote[len(lote) - 1].nombre
+    with pytest.raises(IndexError):
+        lote[len(lote)]
+
+
+def test_lote_desde_empresas_y_de_vuelta():
+    empresas = [
+        Empresa(nombre=f'e{i}', sector='Comercio', ganancias=1e6 * i, empleados=i + 1,
+                activos=1e7, cartera=1e5, deudas=2e6)
+        for i in range(5)
+    ]
+    lote = EmpresaBatch.from_empresas(empresas)
+    assert [vista.to_empresa().data_dict for vista in lote] == [empresa.data_dict for empresa in empresas]
+    assert EmpresaBatch.from_dicts([empresa.data_dict for empresa in empresas]).empleados.tolist() == [1, 2, 3, 4, 5]
+
+
+def test_resultados_ida_y_vuelta(columnas):
+    analizador = AnalizadorFinanciero()
+    resultados = analizador.analizar_lote(columnas)
+    individuales = [vista.to_resultado() for vista in resultados[:50]]
+    copia = ResultadoBatch.from_resultados(individuales)
+    np.testing.assert_array_equal(copia.estado, resultados.estado[:50])
+    np.testing.assert_array_equal(copia.recomendaciones, resultados.recomendaciones[:50])
+    for vista, individual in zip(copia, individuales):
+        assert vista.sector == individual.sector
+        assert vista.evaluacion == individual.evaluacion
+        np.testing.assert_equal(vista.indicadores, individual.indicadores)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from models.empresa import EmpresaBatch
+from utils.formulas import CompiladorFormulas
+
+
+@pytest.fixture
+def compilador():
+    return CompiladorFormulas()
+
+
+def test_formula_equivale_a_numpy(compilador):
+    lote = EmpresaBatch.from_dict(generar_columnas(200))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        esperado = (lote.activos - lote.deudas) / lote.empleados + np.sqrt(np.abs(lote.ganancias))
+    resultado = compilador.evaluar("(activos - deudas) / empleados + sqrt(abs(ganancias))", lote)
+    np.testing.assert_allclose(resultado, esperado)
+
+
+def test_escalar_retorna_float(compilador):
+    datos = {'ganancias': 10.0, 'activos': 40.0}
+    assert compilador.evaluar("ganancias / activos", datos) == 0.25
+
+
+def test_huella_ignora_forma_de_escribir(compilador):
+    assert compilador.huella("(activos-deudas)/empleados") == compilador.huella("((activos - deudas)) / (empleados)")
+    assert compilador.huella("2 * activos") == compilador.huella("2.0*activos")
+    assert compilador.huella("activos + deudas") != compilador.huella("activos - deudas")
+    assert compilador.compilar("2 * activos") is compilador.compilar("(2.0 * activos)")
+
+
+def test_constante_se_repite_en_el_lote(compilador):
+    lote = EmpresaBatch.from_dict(generar_columnas(7))
+    resultado = compilador.evaluar("1 + 2 * 3", lote)
+    assert isinstance(resultado, np.ndarray)
+    np.testing.assert_array_equal(resultado, np.full(7, 7.0))
+    assert compilador.evaluar("1 + 2 * 3", {'activos': 5.0}) == 7.0
+
+
+@pytest.mark.parametrize('expresion', [
+    "activos.real", "__import__('os')", "activos[0]", "otro_campo + 1", "min(activos)",
+    "activos if deudas else 0", "'texto'", "True + activos", "activos +"
+])
+def test_sintaxis_no_permitida(compilador, expresion):
+    with pytest.raises(ValueError):
+        compilador.compilar(expresion)
+
+
+@pytest.mark.parametrize('expresion', [
+    "-" * 100000 + "activos",
+    "(" * 100000 + "activos" + ")" * 100000,
+    " + ".join(["activos"] * 100000)
+], ids=['signos', 'parentesis', 'sumas'])
+def test_anidamiento_profundo_es_value_error(compilador, expresion):
+    with pytest.raises(ValueError):
+        compilador.evaluar(expresion, {'activos': np.ones(3)})
+
+
+def test_division_por_cero_sigue_ieee(compilador):
+    resultado = compilador.evaluar("ganancias / activos", {'ganancias': np.array([1.0, 0.0]), 'activos': np.zeros(2)})
+    assert np.isinf(resultado[0]) and np.isnan(resultado[1])
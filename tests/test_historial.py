@@ -0,0 +1,44 @@
+import pytest
+from models.empresa import Empresa
+from models.historial import HistorialEmpresa
+from services.analizador_financiero import AnalizadorFinanciero
+
+
+def test_ganancias_trimestrales_se_anualizan():
+    historial = HistorialEmpresa("a", periodos_por_anio=4)
+    for trimestre in range(6):
+        historial.agregar(f"T{trimestre}", ganancias=100.0 + trimestre, empleados=2, activos=4000.0,
+                          cartera=50.0, deudas=10.0)
+
+    # Sin un año completo: el trimestre por 4; después: suma de los últimos 4
+    assert historial.serie('ganancias_anuales').tolist() == [400.0, 404.0, 408.0, 406.0, 410.0, 414.0]
+    empresa = historial.to_empresa()
+    assert empresa.ganancias == 414.0
+
+    esperado = AnalizadorFinanciero().analizar_empresa(
+        Empresa(nombre="a", ganancias=414.0, empleados=2, activos=4000.0, cartera=50.0, deudas=10.0),
+        incluir_nlp=False
+    )
+    ultimo = historial.periodo(-1)['valores']
+    for nombre, valor in esperado.indicadores.items():
+        assert ultimo[nombre] == pytest.approx(valor)
+
+
+def test_periodicidad_anual_no_cambia_las_ganancias():
+    historial = HistorialEmpresa("a", periodos_por_anio=1)
+    historial.agregar("2024", ganancias=500.0, empleados=5, activos=1000.0)
+    assert historial.serie('ganancias_anuales').tolist() == [500.0]
+
+
+@pytest.mark.parametrize('empleados', [3.5, float('nan'), float('inf'), 'x'])
+def test_empleados_invalidos(empleados):
+    historial = HistorialEmpresa("a")
+    with pytest.raises(ValueError):
+        historial.agregar("T1", empleados=empleados)
+    assert len(historial) == 0
+
+
+def test_empleados_float_entero():
+    historial = HistorialEmpresa("a")
+    historial.agregar("T1", empleados="3.0")
+    assert historial.to_empresa().empleados == 3
@@ -0,0 +1,73 @@
+from conftest import generar_columnas
+from models.analisis import INDICADORES, ResultadoAnalisis
+from services.analizador_financiero import AnalizadorFinanciero
+from services.indice_pares import IndicePares
+from services.nlp_service import NLPService
+
+
+def _resultado(nombre, sector, valor):
+    return ResultadoAnalisis(nombre, sector, {indicador: valor for indicador in INDICADORES}, {}, "Bueno", [])
+
+
+def test_pares_excluye_sin_perder_resultados():
+    indice = IndicePares(tamano_bloque=3)
+    for posicion in range(10):
+        indice.agregar(_resultado('x', 'Tecnología', float(posicion)))
+    for posicion in range(5):
+        indice.agregar(_resultado(f'e{posicion}', 'Tecnología', float(posicion)))
+
+    # Los análisis repetidos de 'x' ocupan una sola fila
+    assert len(indice) == 6
+    pares = indice.buscar({indicador: 0.0 for indicador in INDICADORES}, k=10, excluir='x')
+    assert [par['nombre'] for par in pares] == ['e0', 'e1', 'e2', 'e3', 'e4']
+
+
+def test_pares_reemplaza_el_analisis_anterior():
+    indice = IndicePares()
+    indice.agregar(_resultado('a', 'Comercio', 1.0))
+    indice.agregar(_resultado('b', 'Comercio', 5.0))
+    indice.agregar(_resultado('a', 'Comercio', 100.0))
+    par, = indice.buscar({indicador: 100.0 for indicador in INDICADORES}, k=1)
+    assert par['nombre'] == 'a'
+    assert par['indicadores']['rentabilidad'] == 100.0
+
+
+def test_pares_lote_con_nombres_repetidos():
+    columnas = generar_columnas(300)
+    columnas['nombre'][:200] = 'repetida'
+    resultados = AnalizadorFinanciero().analizar_lote(columnas)
+    indice = IndicePares()
+    indice.agregar_lote(resultados)
+    assert len(indice) == 101
+    assert len(indice.buscar(resultados[250], k=50, excluir='repetida')) == 50
+
+
+def test_pares_agrupa_sinonimos_de_sector():
+    indice = IndicePares()
+    indice.agregar(_resultado('a', 'Tecnología', 1.0))
+    indice.agregar(_resultado('b', 'tech', 2.0))
+    indice.agregar(_resultado('c', 'Comercio', 1.0))
+    pares = indice.buscar({indicador: 1.0 for indicador in INDICADORES}, k=5, sector='TECNOLOGIA')
+    assert sorted(par['nombre'] for par in pares) == ['a', 'b']
+
+
+def test_pares_de_una_sesion_no_ven_otra_sesion():
+    # NLPService es un singleton compartido: el índice de cada sesión llega en la llamada
+    servicio = NLPService()
+    assert NLPService() is servicio
+    sesion_a, sesion_b = IndicePares(), IndicePares()
+    sesion_a.agregar(_resultado('Alfa Uno', 'Comercio', 1.0))
+    sesion_a.agregar(_resultado('Alfa Dos', 'Comercio', 2.0))
+    sesion_b.agregar(_resultado('Beta Uno', 'Comercio', 1.0))
+    sesion_b.agregar(_resultado('Beta Dos', 'Comercio', 2.0))
+
+    resultados = _resultado('Propia', 'Comercio', 1.5).data_dict
+    contexto = {'resultados': resultados}
+    mensaje = '¿Qué empresas son similares a la mía?'
+    respuesta_a = servicio._respuesta_premium_espanol(mensaje, contexto, True, sesion_a)
+    respuesta_b = servicio._respuesta_premium_espanol(mensaje, contexto, True, sesion_b)
+    assert 'Alfa Uno' in respuesta_a and 'Alfa Dos' in respuesta_a
+    assert 'Beta' not in respuesta_a
+    assert 'Beta Uno' in respuesta_b and 'Beta Dos' in respuesta_b
+    assert 'Alfa' not in respuesta_b
+    assert not hasattr(servicio, 'indice_pares')
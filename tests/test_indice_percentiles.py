@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from models.analisis import INDICADORES, ResultadoAnalisis
+from services.analizador_financiero import AnalizadorFinanciero
+from services.indice_percentiles import IndicePercentiles
+
+
+def _resultado(nombre, sector, valor):
+    return ResultadoAnalisis(nombre, sector, {indicador: valor for indicador in INDICADORES}, {}, "Bueno", [])
+
+
+def test_percentiles_con_mezclas_pendientes():
+    indice = IndicePercentiles(max_pendientes=64)
+    generador = np.random.default_rng(0)
+    valores = []
+    for posicion in range(1000):
+        valor = float(generador.normal())
+        valores.append(valor)
+        indice.agregar(_resultado(f'e{posicion}', ['Tecnología', 'tech', 'Tecnologia'][posicion % 3], valor))
+        if posicion % 37 == 0:
+            percentiles = indice.percentiles('TECNOLOGÍA', {indicador: 0.25 for indicador in INDICADORES})
+            arreglo = np.asarray(valores)
+            assert percentiles['rentabilidad'] == pytest.approx(100.0 * np.mean(arreglo <= 0.25))
+            assert percentiles['ratio_endeudamiento'] == pytest.approx(100.0 * np.mean(arreglo >= 0.25))
+
+
+def test_percentiles_lote_igual_a_individual():
+    resultados = AnalizadorFinanciero().analizar_lote(generar_columnas(1000))
+    indice = IndicePercentiles(max_pendientes=100)
+    indice.agregar_lote(resultados[:600])
+    lote = indice.percentiles_lote(resultados[600:])
+    for posicion, vista in enumerate(resultados[600:650]):
+        individuales = indice.percentiles(vista.sector, vista.indicadores)
+        for indicador in INDICADORES:
+            assert lote[indicador][posicion] == individuales[indicador]
+
+
+def test_percentiles_sector_sin_datos_finitos():
+    indice = IndicePercentiles()
+    indice.agregar(_resultado('a', 'Minería', float('nan')))
+    assert indice.percentiles('Minería', {indicador: 1.0 for indicador in INDICADORES}) is None
+    assert indice.percentil_general('Minería', {indicador: 1.0 for indicador in INDICADORES}) is None
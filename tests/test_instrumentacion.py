@@ -0,0 +1,45 @@
+import math
+from models.empresa import Empresa
+from services.analizador_financiero import AnalizadorFinanciero
+from services.cache_analisis import CacheAnalisis
+from services.instrumentacion import Instrumentacion
+
+EMPRESA = Empresa(nombre='Acme', sector='Comercio', ganancias=5e8, empleados=40, activos=4e9,
+                  cartera=1e8, deudas=1e9)
+
+
+def test_etapas_y_contadores_del_analisis():
+    analizador = AnalizadorFinanciero(cache=CacheAnalisis())
+    analizador.analizar_empresa(EMPRESA, incluir_nlp=False)
+    with analizador.instrumentar() as medir:
+        analizador.analizar_empresa(EMPRESA, incluir_nlp=False)
+        analizador.analizar_empresa(Empresa.from_dict(dict(EMPRESA.data_dict, ganancias=6e8)), incluir_nlp=False)
+    assert analizador.instrumentacion is None
+
+    exportado = medir.exportar()
+    assert exportado['contadores'] == {'analisis': 2, 'cache_aciertos': 1, 'cache_fallos': 1}
+    assert exportado['etapas']['total']['conteo'] == 2
+    assert exportado['etapas']['indicadores']['conteo'] == 1
+    assert exportado['etapas']['total']['cubetas'][-1] == {'hasta': math.inf, 'conteo': 2}
+
+
+def test_percentil_por_cubetas():
+    medir = Instrumentacion()
+    assert medir.percentil('etapa', 50) is None
+    for _ in range(99):
+        medir.registrar('etapa', 2e-6)
+    medir.registrar('etapa', 0.5)
+    assert 2e-6 <= medir.percentil('etapa', 50) < 2e-6 * 10 ** 0.25
+    assert medir.percentil('etapa', 100) == 0.5
+    medir.reiniciar()
+    assert medir.exportar() == {'etapas': {}, 'contadores': {}}
+
+
+def test_exportar_prometheus():
+    medir = Instrumentacion()
+    medir.registrar('total', 1e-3)
+    medir.contar('analisis', 3)
+    texto = medir.exportar_prometheus()
+    assert 'finanzgpt_analisis_etapa_segundos_bucket{etapa="total",le="+Inf"} 1' in texto
+    assert 'finanzgpt_analisis_etapa_segundos_count{etapa="total"} 1' in texto
+    assert 'finanzgpt_analisis_analisis_total 3' in texto
@@ -0,0 +1,36 @@
+import itertools
+import numpy as np
+import pytest
+from models.analisis import ESTADOS
+from models.empresa import Empresa
+from services.analizador_financiero import AnalizadorFinanciero
+from services.motor_escenarios import MotorEscenarios
+
+
+def test_barrido_igual_al_analisis_individual():
+    analizador = AnalizadorFinanciero()
+    empresa = Empresa(nombre='Base', sector='Comercio', ganancias=1.28e9, empleados=37,
+                      activos=3e9, cartera=2e8, deudas=1.8e9)
+    variaciones = {
+        'deudas': np.linspace(-0.5, 0.5, 5),
+        'ganancias': [-1.0, -0.5, 0.0, 0.2, 0.6],
+        # 37 × 0.7 = 25.9 se trunca a 25 como int() en Empresa: con ganancias de
+        # 1.28e9 la productividad queda sobre el límite de Comercio (50M) y con 26 no
+        'empleados': [-0.3, -0.05, 0.0, 0.15, 0.5]
+    }
+    resultado = MotorEscenarios(analizador).barrer(empresa, variaciones)
+    assert resultado.estado.shape == (5, 5, 5)
+    assert resultado.estado_general_base == analizador.analizar_empresa(empresa, incluir_nlp=False).estado_general
+
+    for posicion in itertools.product(*(range(len(eje)) for eje in variaciones.values())):
+        datos = empresa.data_dict
+        for campo, indice in zip(variaciones, posicion):
+            datos[campo] = empresa.data_dict[campo] * (1 + float(variaciones[campo][indice]))
+        individual = analizador.analizar_empresa(Empresa.from_dict(datos), incluir_nlp=False)
+        assert ESTADOS[resultado.estado[posicion]] == individual.estado_general, posicion
+
+
+def test_barrido_rechaza_campos_desconocidos():
+    empresa = Empresa(nombre='Base', sector='Comercio', ganancias=1, empleados=1, activos=1)
+    with pytest.raises(ValueError, match='sector'):
+        MotorEscenarios(AnalizadorFinanciero()).barrer(empresa, {'sector': [0.1]})
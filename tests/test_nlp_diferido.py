@@ -0,0 +1,36 @@
+import pickle
+from models.analisis import NLPEjemploDiferido
+from models.empresa import Empresa
+from services.analizador_financiero import AnalizadorFinanciero
+
+EMPRESA = Empresa(nombre='Acme', sector='Comercio', ganancias=5e8, empleados=40, activos=4e9,
+                  cartera=1e8, deudas=1e9)
+
+
+def test_se_calcula_solo_al_consultar():
+    llamadas = []
+    diferido = NLPEjemploDiferido(lambda: llamadas.append(1) or {'tokens': ['a']})
+    assert not diferido.calculado
+    assert 'sin calcular' in repr(diferido)
+    assert diferido['tokens'] == ['a']
+    assert dict(diferido) == {'tokens': ['a']}
+    assert diferido.calculado
+    assert llamadas == [1]
+
+
+def test_analisis_no_calcula_nlp_hasta_consultarlo():
+    resultado = AnalizadorFinanciero().analizar_empresa(EMPRESA)
+    assert not resultado.nlp_ejemplo.calculado
+    assert {'tokens', 'lemas', 'pos_tags', 'embedding_dim'} <= set(resultado.nlp_ejemplo)
+    assert resultado.nlp_ejemplo.calculado
+
+
+def test_sin_nlp_retorna_dict_vacio():
+    assert AnalizadorFinanciero().analizar_empresa(EMPRESA, incluir_nlp=False).nlp_ejemplo == {}
+
+
+def test_serializar_materializa():
+    resultado = AnalizadorFinanciero().analizar_empresa(EMPRESA)
+    copia = pickle.loads(pickle.dumps(resultado.nlp_ejemplo))
+    assert type(copia) is dict
+    assert copia == dict(resultado.nlp_ejemplo)
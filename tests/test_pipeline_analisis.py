@@ -0,0 +1,93 @@
+import csv
+import json
+import pytest
+from services.analizador_financiero import AnalizadorFinanciero
+from services.pipeline_analisis import PipelineAnalisis
+
+VALIDO = {
+    "nombre": "A", "sector": "Tecnología", "ganancias": 100, "empleados": 3,
+    "activos": 1000, "cartera": 10, "deudas": 5
+}
+
+
+def _escribir_jsonl(ruta, lineas):
+    ruta.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+
+
+def _leer_jsonl(ruta):
+    # parse_constant falla con NaN/Infinity: la salida debe ser JSON estándar
+    def rechazar_constante(valor):
+        raise AssertionError(f"Constante no estándar en la salida: {valor}")
+    return [json.loads(linea, parse_constant=rechazar_constante) for linea in ruta.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def pipeline():
+    return PipelineAnalisis(AnalizadorFinanciero(), tamano_lote=2)
+
+
+def test_lineas_invalidas_van_al_archivo_de_errores(pipeline, tmp_path):
+    entrada, salida, errores = tmp_path / "in.jsonl", tmp_path / "out.jsonl", tmp_path / "err.jsonl"
+    _escribir_jsonl(entrada, [
+        json.dumps(VALIDO),
+        "{no es json",
+        "[1, 2]",
+        json.dumps(dict(VALIDO, nombre="B")),
+    ])
+    estadisticas = pipeline.ejecutar(str(entrada), str(salida), str(errores))
+
+    assert estadisticas['filas_leidas'] == 4
+    assert estadisticas['filas_validas'] == 2
+    assert estadisticas['filas_invalidas'] == 2
+    assert [fila['nombre'] for fila in _leer_jsonl(salida)] == ["A", "B"]
+    assert [error['fila'] for error in _leer_jsonl(errores)] == [2, 3]
+
+
+def test_sin_rechazar_una_linea_invalida_es_value_error(pipeline, tmp_path):
+    entrada = tmp_path / "in.jsonl"
+    _escribir_jsonl(entrada, [json.dumps(VALIDO), "{no es json"])
+    with pytest.raises(ValueError, match="Fila 2"):
+        list(pipeline.leer_registros(str(entrada)))
+
+
+def test_empleados_se_validan_sin_truncar(pipeline, tmp_path):
+    entrada, salida, errores = tmp_path / "in.jsonl", tmp_path / "out.jsonl", tmp_path / "err.jsonl"
+    _escribir_jsonl(entrada, [
+        json.dumps(dict(VALIDO, nombre="entero_texto", empleados="3.0")),
+        json.dumps(dict(VALIDO, nombre="fraccion", empleados=3.5)),
+        json.dumps(dict(VALIDO, nombre="cero", empleados=0)),
+        json.dumps(dict(VALIDO, nombre="", ganancias="x")),
+    ])
+    pipeline.ejecutar(str(entrada), str(salida), str(errores))
+
+    assert [fila['nombre'] for fila in _leer_jsonl(salida)] == ["entero_texto"]
+    rechazos = {error['fila']: error['errores'] for error in _leer_jsonl(errores)}
+    assert rechazos[2] == ["El número de empleados debe ser un número entero."]
+    assert rechazos[3] == ["El número de empleados debe ser mayor o igual a 1."]
+    assert len(rechazos[4]) == 2
+
+
+def test_indicadores_no_finitos_se_escriben_como_null(pipeline, tmp_path):
+    entrada, salida = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _escribir_jsonl(entrada, [json.dumps(dict(VALIDO, ganancias=0, activos=0))])
+    pipeline.ejecutar(str(entrada), str(salida))
+
+    fila, = _leer_jsonl(salida)
+    assert fila['ratio_endeudamiento'] is None
+    assert fila['rotacion_cartera'] is None
+    assert fila['rentabilidad'] == 0.0
+
+
+def test_csv(pipeline, tmp_path):
+    entrada, salida = tmp_path / "in.csv", tmp_path / "out.csv"
+    with open(entrada, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(VALIDO))
+        escritor.writeheader()
+        escritor.writerow(VALIDO)
+        escritor.writerow(dict(VALIDO, nombre="B", activos="mil"))
+    estadisticas = pipeline.ejecutar(str(entrada), str(salida))
+
+    assert estadisticas['filas_validas'] == 1
+    assert estadisticas['filas_invalidas'] == 1
+    with open(salida, newline="", encoding="utf-8") as archivo:
+        assert [fila['nombre'] for fila in csv.DictReader(archivo)] == ["A"]
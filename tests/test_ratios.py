@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from models.analisis import INDICADORES
+from utils.indicadores import Indicadores
+from utils.ratios import NODOS_RATIOS, BibliotecaRatios
+
+BALANCE = {
+    'ganancias': 120.0, 'empleados': 4, 'activos': 1000.0, 'cartera': 60.0, 'deudas': 400.0,
+    'ventas': 730.0, 'costo_ventas': 365.0, 'utilidad_operacional': 146.0,
+    'activo_corriente': 300.0, 'pasivo_corriente': 150.0, 'inventario': 75.0, 'cuentas_por_pagar': 50.0
+}
+
+
+def test_ratios_de_una_empresa():
+    ratios = BibliotecaRatios().calcular(BALANCE)
+    assert isinstance(ratios['roe'], float)
+    assert ratios['roe'] == pytest.approx(120.0 / 600.0)
+    assert ratios['prueba_acida'] == pytest.approx(225.0 / 150.0)
+    assert ratios['margen_bruto'] == pytest.approx(0.5)
+    assert ratios['ciclo_caja'] == pytest.approx(30.0 + 75.0 - 50.0)
+    # Un patrimonio presente en los datos se usa en lugar de derivarse
+    assert BibliotecaRatios().calcular(dict(BALANCE, patrimonio=240.0), ['roe'])['roe'] == pytest.approx(0.5)
+
+
+def test_indicadores_iguales_a_calcular_lote():
+    columnas = generar_columnas(1000)
+    ratios = BibliotecaRatios().calcular(columnas, INDICADORES)
+    esperados = Indicadores.calcular_lote(*(columnas[campo] for campo in
+                                            ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')))
+    for nombre, esperado in zip(INDICADORES, esperados):
+        np.testing.assert_array_equal(ratios[nombre], esperado)
+
+
+def test_divisor_cero():
+    ceros = dict(BALANCE, activos=0.0, deudas=0.0, ventas=0.0, costo_ventas=0.0, pasivo_corriente=0.0)
+    ratios = BibliotecaRatios().calcular(ceros)
+    # inf donde un valor mayor es peor o ilimitado, 0 en los de rentabilidad
+    for nombre in ('ratio_endeudamiento', 'razon_corriente', 'prueba_acida', 'dias_cartera',
+                   'dias_inventario', 'dias_proveedores'):
+        assert ratios[nombre] == np.inf, nombre
+    for nombre in ('rentabilidad', 'roe', 'margen_bruto', 'margen_operacional', 'margen_neto'):
+        assert ratios[nombre] == 0.0, nombre
+    # inf + inf - inf
+    assert np.isnan(ratios['ciclo_caja'])
+
+
+def test_plan_se_reutiliza_y_comparte_intermedios():
+    biblioteca = BibliotecaRatios()
+    plan = biblioteca.plan(('ciclo_caja', 'dias_cartera'), BALANCE)
+    assert biblioteca.plan(('ciclo_caja', 'dias_cartera'), BALANCE) is plan
+    assert plan.count('dias_cartera') == 1
+    assert plan.index('dias_cartera') < plan.index('ciclo_caja')
+
+    llamadas = []
+    dependencias, kernel = NODOS_RATIOS['dias_cartera']
+    biblioteca.registrar('dias_cartera', dependencias, lambda *args: llamadas.append(1) or kernel(*args))
+    # Registrar un nodo descarta los planes guardados
+    assert biblioteca.plan(('ciclo_caja', 'dias_cartera'), BALANCE) is not plan
+    biblioteca.calcular(BALANCE, ['ciclo_caja', 'dias_cartera'])
+    assert len(llamadas) == 1
+
+
+def test_errores_del_grafo():
+    biblioteca = BibliotecaRatios()
+    with pytest.raises(ValueError, match='Ratio desconocido: liquidez'):
+        biblioteca.calcular(BALANCE, ['liquidez'])
+    sin_activos = {campo: valor for campo, valor in BALANCE.items() if campo != 'activos'}
+    with pytest.raises(ValueError, match="Falta el dato 'activos' para calcular patrimonio"):
+        biblioteca.calcular(sin_activos, ['roe'])
+    assert 'roe' not in biblioteca.calculables(sin_activos)
+    assert biblioteca.requeridos(['roe']) == ('ganancias', 'activos', 'deudas')
+
+    biblioteca.registrar('a', ('b',), np.negative)
+    biblioteca.registrar('b', ('a',), np.negative)
+    with pytest.raises(ValueError, match='circular'):
+        biblioteca.plan(('a',))
@@ -0,0 +1,44 @@
+import itertools
+import numpy as np
+import pytest
+from models.analisis import REGLAS_EVALUACION
+from utils.reglas import MOTOR_REGLAS, MotorReglas
+
+
+def test_lote_igual_a_escalar():
+    rng = np.random.default_rng(3)
+    n = 500
+    indicadores = tuple(rng.normal(size=n) * escala for escala in (0.5, 0.1, 1e6, 60))
+    limites = np.array([[0.6, 0.05, 1e6, 60], [0.4, 0.1, 5e5, 30]])[rng.integers(0, 2, n)]
+    favorable = MOTOR_REGLAS.evaluar_lote(indicadores, limites)
+    estados = MOTOR_REGLAS.estado_lote(favorable)
+    np.testing.assert_array_equal(estados, MOTOR_REGLAS.estado_lote(mascara=MOTOR_REGLAS.mascara_lote(favorable)))
+    for i in range(n):
+        evaluacion, estado, recomendaciones = MOTOR_REGLAS.evaluar(tuple(valores[i] for valores in indicadores), limites[i])
+        esperado = [MOTOR_REGLAS.etiquetas[j][bool(favorable[i, j])] for j in range(len(MOTOR_REGLAS.reglas))]
+        assert list(evaluacion.values()) == esperado
+        assert estado == MOTOR_REGLAS.estados[estados[i]]
+        assert len(recomendaciones) == len(MOTOR_REGLAS.reglas) - favorable[i].sum()
+
+
+def test_estado_por_mascara_cuenta_reglas_favorables():
+    reglas = len(MOTOR_REGLAS.reglas)
+    for combinacion in itertools.product([False, True], repeat=reglas):
+        favorable = np.array([combinacion])
+        assert MOTOR_REGLAS.estado_lote(favorable)[0] == MOTOR_REGLAS.estado_por_puntos[sum(combinacion)]
+
+
+def test_reglas_invalidas():
+    regla = dict(REGLAS_EVALUACION[0])
+    with pytest.raises(ValueError):
+        MotorReglas(reglas=())
+    with pytest.raises(ValueError):
+        MotorReglas(reglas=(dict(regla, indicador='liquidez'),))
+    with pytest.raises(ValueError):
+        MotorReglas(reglas=(dict(regla, comparacion='=='),))
+    with pytest.raises(ValueError):
+        MotorReglas(reglas=(regla,) * 9)
+    with pytest.raises(ValueError):
+        MotorReglas(umbrales_estado={'Crítico': 0, 'Bueno': 3, 'Regular': 1})
+    with pytest.raises(ValueError):
+        MotorReglas(umbrales_estado={'Regular': 1, 'Bueno': 2})
@@ -0,0 +1,49 @@
+import math
+import numpy as np
+import pytest
+from conftest import generar_columnas
+from models.analisis import INDICADORES
+from services.analizador_financiero import AnalizadorFinanciero
+from utils.serializacion import SerializacionBinaria
+
+
+@pytest.fixture(scope='module')
+def resultados():
+    columnas = generar_columnas(1000)
+    columnas['ganancias'][:3] = 1e15
+    return AnalizadorFinanciero().analizar_lote(columnas)
+
+
+def test_ida_y_vuelta_individual(resultados):
+    for vista in resultados[:50]:
+        decodificado = SerializacionBinaria.decodificar(SerializacionBinaria.codificar(vista))
+        assert decodificado.nombre == vista.nombre
+        assert decodificado.sector == vista.sector
+        assert decodificado.evaluacion == vista.evaluacion
+        assert decodificado.estado_general == vista.estado_general
+        assert decodificado.recomendaciones == vista.recomendaciones
+        for nombre in INDICADORES:
+            valor, esperado = decodificado.indicadores[nombre], vista.indicadores[nombre]
+            assert valor == esperado or (math.isnan(valor) and math.isnan(esperado))
+
+
+def test_ida_y_vuelta_lote(resultados):
+    decodificado = SerializacionBinaria.decodificar_lote(SerializacionBinaria.codificar_lote(resultados))
+    assert len(decodificado) == len(resultados)
+    assert decodificado.nombre.tolist() == resultados.nombre.tolist()
+    assert decodificado.sector.tolist() == resultados.sector.tolist()
+    for campo in SerializacionBinaria.COLUMNAS_NUMERICAS:
+        np.testing.assert_array_equal(getattr(decodificado, campo), getattr(resultados, campo))
+
+
+def test_lote_con_cabecera_invalida(resultados):
+    datos = SerializacionBinaria.codificar_lote(resultados)
+    with pytest.raises(ValueError):
+        SerializacionBinaria.decodificar_lote(b'XXXX' + datos[4:])
+
+
+def test_texto_demasiado_largo(resultados):
+    resultado = resultados[0].to_resultado()
+    resultado.nombre = "x" * (SerializacionBinaria.MAX_TEXTO + 1)
+    with pytest.raises(ValueError, match="nombre"):
+        SerializacionBinaria.codificar(resultado)
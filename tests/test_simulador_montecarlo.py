@@ -0,0 +1,35 @@
+import pytest
+from models.empresa import Empresa
+from services.analizador_financiero import AnalizadorFinanciero
+from services.simulador_montecarlo import SimuladorMonteCarlo
+
+EMPRESA = Empresa(nombre='Base', sector='Tecnología', ganancias=4e8, empleados=12,
+                  activos=3e9, cartera=2e8, deudas=1.4e9)
+
+
+def test_misma_semilla_mismo_resultado_sin_importar_procesos():
+    analizador = AnalizadorFinanciero()
+    secuencial = SimuladorMonteCarlo(analizador, tamano_bloque=3000)
+    paralelo = SimuladorMonteCarlo(analizador, tamano_bloque=3000, workers=2)
+    esperado = secuencial.simular(EMPRESA, n_muestras=10000, semilla=42)
+    assert secuencial.simular(EMPRESA, n_muestras=10000, semilla=42) == esperado
+    assert paralelo.simular(EMPRESA, n_muestras=10000, semilla=42) == esperado
+    assert secuencial.simular(EMPRESA, n_muestras=10000, semilla=43) != esperado
+    assert esperado['muestras'] == 10000
+    assert sum(esperado['probabilidades'].values()) == pytest.approx(1.0)
+
+
+def test_sin_volatilidad_coincide_con_el_analisis():
+    analizador = AnalizadorFinanciero()
+    simulador = SimuladorMonteCarlo(analizador, volatilidad_sector={'otro': {}})
+    resultado = simulador.simular(EMPRESA, n_muestras=100, semilla=0)
+    estado = analizador.analizar_empresa(EMPRESA, incluir_nlp=False).estado_general
+    assert resultado['probabilidades'][estado] == 1.0
+    assert set(resultado['probabilidad_favorable'].values()) <= {0.0, 1.0}
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        SimuladorMonteCarlo(AnalizadorFinanciero(), tamano_bloque=0)
+    with pytest.raises(ValueError):
+        SimuladorMonteCarlo(AnalizadorFinanciero()).simular(EMPRESA, n_muestras=0)
@@ -0,0 +1,47 @@
+import numpy as np
+from models.columnas import ColumnaDiccionario
+from services.analizador_financiero import AnalizadorFinanciero
+from services.tabla_sectores import LimitesSector, TablaSectores
+
+
+def test_codigos_con_sinonimos_y_desconocidos():
+    tabla = AnalizadorFinanciero().tabla_sectores
+    tecnologia = tabla.codigo('Tecnología')
+    assert tabla.codigo(' TECNOLOGIA ') == tabla.codigo('tech') == tabla.codigo('Software') == tecnologia
+    assert tabla.codigo('Minería') == tabla.codigo('otro') == tabla.codigo_defecto
+    assert tabla.sectores[tabla.codigo('retail')] == 'comercio'
+
+
+def test_codigos_lote_iguales_por_cualquier_camino():
+    tabla = AnalizadorFinanciero().tabla_sectores
+    nombres = ['Comercio', 'tech', 'Minería', 'Servicios', 'tech']
+    esperado = [tabla.codigo(nombre) for nombre in nombres]
+    assert tabla.codigos_lote(nombres).tolist() == esperado
+    codificada = ColumnaDiccionario(np.array([0, 1, 2, 3, 1]), ['Comercio', 'tech', 'Minería', 'Servicios'])
+    assert tabla.codigos_lote(codificada).tolist() == esperado
+    codigos = np.array(esperado)
+    assert tabla.codigos_lote(codigos) is codigos
+    np.testing.assert_array_equal(tabla.limites(codigos), tabla.matriz[codigos])
+
+
+def test_memo_acotado():
+    tabla = AnalizadorFinanciero().tabla_sectores
+    tabla.codigos_lote([f'sector {i}' for i in range(TablaSectores.MAX_MEMO + 100)])
+    assert len(tabla._memo) == TablaSectores.MAX_MEMO
+    assert tabla.codigo('sector sin memo') == tabla.codigo_defecto
+
+
+def test_cambios_anidados_cambian_la_version_y_la_tabla():
+    limites = LimitesSector({'otro': {'endeudamiento': 0.6, 'rentabilidad': 0.05,
+                                      'productividad': 1e6, 'rotacion': 60}})
+    version = limites.version
+    limites['otro']['rentabilidad'] = 0.07
+    assert limites.version != version
+
+    analizador = AnalizadorFinanciero()
+    tabla = analizador.tabla_sectores
+    assert analizador.tabla_sectores is tabla
+    analizador.limites_sector['comercio']['rentabilidad'] = 0.2
+    nueva = analizador.tabla_sectores
+    assert nueva is not tabla
+    assert nueva.limites(nueva.codigo('Comercio'))[1] == 0.2
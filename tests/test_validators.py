@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from models.columnas import ColumnaDiccionario
+from utils.validators import MOTIVOS_VALIDACION, Validators
+
+
+def _columnas(**cambios):
+    columnas = {
+        'nombre': ['a', 'b', 'c', 'd'],
+        'sector': ['Comercio', 'Servicios', 'Comercio', 'Tecnología'],
+        'ganancias': ['1e6', '2e6', '3e6', '4e6'],
+        'empleados': ['10', '20', '30', '40'],
+        'activos': [1e7, 2e7, 3e7, 4e7],
+        'cartera': [0.0, 1.0, 2.0, 3.0],
+        'deudas': [5.0, 6.0, 7.0, 8.0]
+    }
+    columnas.update(cambios)
+    return columnas
+
+
+def test_reporte_ordenado_por_fila_y_campo():
+    columnas = _columnas(
+        nombre=['a', ' ', 'c', 'd'],
+        ganancias=['1e6', 'mucho', '-5', 'inf'],
+        empleados=['10', '2.5', '30', '0']
+    )
+    tipadas, reporte = Validators.validar_columnas(columnas)
+    assert set(reporte) == {'fila', 'campo', 'motivo'}
+    assert reporte['fila'].tolist() == [1, 1, 1, 2, 3, 3]
+    assert reporte['campo'].tolist() == ['nombre', 'ganancias', 'empleados', 'ganancias', 'ganancias', 'empleados']
+    assert reporte['motivo'].tolist() == ['faltante', 'no_numerico', 'no_entero', 'menor_al_minimo',
+                                          'no_finito', 'menor_al_minimo']
+    assert set(reporte['motivo']) <= set(MOTIVOS_VALIDACION)
+    # Solo queda la fila 0, compactada al inicio de cada columna
+    assert tipadas['nombre'].tolist() == ['a']
+    assert tipadas['ganancias'].tolist() == [1e6]
+    assert tipadas['empleados'].dtype == np.int64
+
+
+def test_validar_lote_sin_errores():
+    lote, reporte = Validators.validar_lote(_columnas())
+    assert len(lote) == 4
+    assert all(len(valores) == 0 for valores in reporte.values())
+    assert lote.empleados.tolist() == [10, 20, 30, 40]
+
+
+def test_faltan_columnas_obligatorias():
+    columnas = _columnas()
+    del columnas['activos']
+    with pytest.raises(ValueError, match='activos'):
+        Validators.validar_columnas(columnas)
+
+
+def test_columnas_con_defecto_se_completan():
+    columnas = _columnas()
+    del columnas['sector']
+    del columnas['empleados']
+    lote, reporte = Validators.validar_lote(columnas)
+    assert len(reporte['fila']) == 0
+    assert list(lote.sector) == ['Tecnología'] * 4
+    assert lote.empleados.tolist() == [1] * 4
+
+
+def test_valores_vacios_toman_el_defecto():
+    registros = [
+        {'nombre': 'a', 'sector': None, 'ganancias': 1, 'empleados': None, 'activos': 1, 'cartera': 0, 'deudas': 0},
+        {'nombre': 'b', 'sector': '  ', 'ganancias': 1, 'empleados': '', 'activos': 1, 'cartera': 0, 'deudas': 0},
+        {'nombre': 'c', 'sector': 'Comercio', 'ganancias': 1, 'empleados': 3, 'activos': 1, 'cartera': 0, 'deudas': 0},
+        {'nombre': None, 'sector': 'Comercio', 'ganancias': 1, 'empleados': 3, 'activos': 1, 'cartera': 0, 'deudas': 0}
+    ]
+    lote, reporte = Validators.validar_registros(registros)
+    assert list(lote.sector) == ['Tecnología', 'Tecnología', 'Comercio']
+    assert lote.empleados.tolist() == [1, 1, 3]
+    # Sin valor por defecto, el nombre vacío se rechaza
+    assert reporte['fila'].tolist() == [3]
+    assert reporte['motivo'].tolist() == ['faltante']
+
+
+def test_sector_codificado_vacio_toma_el_defecto():
+    sector = ColumnaDiccionario(np.array([0, 1, 2, 1]), ['Comercio', None, ''])
+    lote, reporte = Validators.validar_lote(_columnas(sector=sector))
+    assert len(reporte['fila']) == 0
+    assert list(lote.sector) == ['Comercio', 'Tecnología', 'Tecnología', 'Tecnología']
+    # La columna recibida no se modifica
+    assert sector.valores == ['Comercio', None, '']
@@ -167,7 +167,8 @@ Tu empresa del sector **{resultados['sector']}** presenta el siguiente perfil fi
                 respuesta = self.conversational_analyzer.procesar_respuesta(mensaje)
             else:
                 # Usar el servicio NLP normal
-                respuesta = self.nlp_service.generar_respuesta_chat(mensaje, datos_empresa)
+                respuesta = self.nlp_service.generar_respuesta_chat(
+                    mensaje, datos_empresa, indice_pares=self.conversational_analyzer.indice_pares)
         
         return respuesta
     
@@ -181,66 +181,67 @@ class ResultsUI:
         st.pyplot(fig)
         st.markdown('</div>', unsafe_allow_html=True)
         
-        # Análisis NLP estilo Gemini
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("### 🧠 Análisis de Procesamiento de Lenguaje Natural")
+        # Análisis NLP estilo Gemini (omitido si el análisis no lo incluyó)
+        if resultados.get('nlp_ejemplo'):
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            st.markdown("### 🧠 Análisis de Procesamiento de Lenguaje Natural")
         
-        with st.expander("Ver detalles del análisis NLP"):
-            tab1, tab2, tab3, tab4 = st.tabs(["Tokenización", "Lematización", "POS Tagging", "Embedding"])
+            with st.expander("Ver detalles del análisis NLP"):
+                tab1, tab2, tab3, tab4 = st.tabs(["Tokenización", "Lematización", "POS Tagging", "Embedding"])
             
-            with tab1:
-                st.markdown("#### 🔍 Tokenización")
-                st.markdown("La tokenización divide el texto en unidades individuales (tokens):")
-                st.code(str(resultados['nlp_ejemplo']['tokens']))
-                st.markdown("""
-                <div class="info-section">
-                    <div class="info-icon">💡</div>
-                    <div class="info-text">
-                        <strong>¿Para qué sirve?</strong> Permite analizar el texto palabra por palabra, lo que es fundamental para el procesamiento del lenguaje natural.
+                with tab1:
+                    st.markdown("#### 🔍 Tokenización")
+                    st.markdown("La tokenización divide el texto en unidades individuales (tokens):")
+                    st.code(str(resultados['nlp_ejemplo']['tokens']))
+                    st.markdown("""
+                    <div class="info-section">
+                        <div class="info-icon">💡</div>
+                        <div class="info-text">
+                            <strong>¿Para qué sirve?</strong> Permite analizar el texto palabra por palabra, lo que es fundamental para el procesamiento del lenguaje natural.
+                        </div>
                     </div>
-                </div>
-                """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
             
-            with tab2:
-                st.markdown("#### 📝 Lematización")
-                st.markdown("La lematización reduce las palabras a su forma base o lema:")
-                st.code(str(resultados['nlp_ejemplo']['lemas']))
-                st.markdown("""
-                <div class="info-section">
-                    <div class="info-icon">💡</div>
-                    <div class="info-text">
-                        <strong>¿Para qué sirve?</strong> Permite considerar diferentes formas de una palabra como la misma, mejorando el análisis semántico del texto.
+                with tab2:
+                    st.markdown("#### 📝 Lematización")
+                    st.markdown("La lematización reduce las palabras a su forma base o lema:")
+                    st.code(str(resultados['nlp_ejemplo']['lemas']))
+                    st.markdown("""
+                    <div class="info-section">
+                        <div class="info-icon">💡</div>
+                        <div class="info-text">
+                            <strong>¿Para qué sirve?</strong> Permite considerar diferentes formas de una palabra como la misma, mejorando el análisis semántico del texto.
+                        </div>
                     </div>
-                </div>
-                """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
             
-            with tab3:
-                st.markdown("#### 🏷️ POS Tagging")
-                st.markdown("El etiquetado gramatical (Part-of-Speech) identifica la función gramatical de cada palabra:")
-                st.code(str(resultados['nlp_ejemplo']['pos_tags']))
-                st.markdown("""
-                <div class="info-section">
-                    <div class="info-icon">💡</div>
-                    <div class="info-text">
-                        <strong>¿Para qué sirve?</strong> Ayuda a entender la estructura gramatical del texto, identificando verbos, sustantivos, adjetivos, etc.
+                with tab3:
+                    st.markdown("#### 🏷️ POS Tagging")
+                    st.markdown("El etiquetado gramatical (Part-of-Speech) identifica la función gramatical de cada palabra:")
+                    st.code(str(resultados['nlp_ejemplo']['pos_tags']))
+                    st.markdown("""
+                    <div class="info-section">
+                        <div class="info-icon">💡</div>
+                        <div class="info-text">
+                            <strong>¿Para qué sirve?</strong> Ayuda a entender la estructura gramatical del texto, identificando verbos, sustantivos, adjetivos, etc.
+                        </div>
                     </div>
-                </div>
-                """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
             
-            with tab4:
-                st.markdown("#### 🧮 Embedding")
-                st.markdown("El embedding transforma el texto en vectores numéricos que capturan significado semántico:")
-                st.code(f"Dimensión del embedding: {resultados['nlp_ejemplo']['embedding_dim']}")
-                st.markdown("""
-                <div class="info-section">
-                    <div class="info-icon">💡</div>
-                    <div class="info-text">
-                        <strong>¿Para qué sirve?</strong> Permite representar palabras y frases como vectores, facilitando cálculos de similitud semántica y otros análisis avanzados.
+                with tab4:
+                    st.markdown("#### 🧮 Embedding")
+                    st.markdown("El embedding transforma el texto en vectores numéricos que capturan significado semántico:")
+                    st.code(f"Dimensión del embedding: {resultados['nlp_ejemplo']['embedding_dim']}")
+                    st.markdown("""
+                    <div class="info-section">
+                        <div class="info-icon">💡</div>
+                        <div class="info-text">
+                            <strong>¿Para qué sirve?</strong> Permite representar palabras y frases como vectores, facilitando cálculos de similitud semántica y otros análisis avanzados.
+                        </div>
                     </div>
-                </div>
-                """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
         
-        st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
         
         # Botones de acción estilo Gemini
         st.markdown("""
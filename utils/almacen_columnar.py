@@ -0,0 +1,166 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from models.columnas import ColumnaDiccionario, ValoresTexto
+from models.empresa import EmpresaBatch
+from models.analisis import ResultadoBatch
+
+FORMATO = 'finanzgpt-columnar'
+VERSION = 1
+
+
+class AlmacenColumnar:
+    """
+    Lectura y escritura de lotes en formato columnar binario: un directorio
+    con un archivo .npy por columna que se abre mediante memory-mapping.
+    Las columnas de texto se guardan codificadas por diccionario.
+
+    Un lote se escribe completo en un directorio temporal junto al destino
+    y luego reemplaza al destino con renombres, de modo que volver a
+    guardar en el mismo directorio nunca deja columnas nuevas con el
+    metadato anterior.
+    """
+    # Se decodifican de inmediato los diccionarios pequeños (p. ej. sector)
+    MAX_VALORES_EN_MEMORIA = 4096
+
+    @staticmethod
+    def _guardar_texto(directorio, campo, valores):
+        columna = ColumnaDiccionario.codificar(valores)
+        np.save(os.path.join(directorio, f"{campo}.codigos.npy"), np.asarray(columna.codigos))
+        textos = columna.valores
+        if not isinstance(textos, ValoresTexto):
+            textos = ValoresTexto.desde_lista(textos)
+        np.save(os.path.join(directorio, f"{campo}.desplazamientos.npy"), np.asarray(textos.desplazamientos))
+        np.save(os.path.join(directorio, f"{campo}.datos.npy"), np.asarray(textos.datos))
+
+    @classmethod
+    def _cargar_texto(cls, directorio, campo):
+        codigos = np.load(os.path.join(directorio, f"{campo}.codigos.npy"), mmap_mode='r')
+        valores = ValoresTexto(
+            np.load(os.path.join(directorio, f"{campo}.desplazamientos.npy"), mmap_mode='r'),
+            np.load(os.path.join(directorio, f"{campo}.datos.npy"), mmap_mode='r')
+        )
+        if len(valores) <= cls.MAX_VALORES_EN_MEMORIA:
+            valores = valores.tolist()
+        return ColumnaDiccionario(codigos, valores)
+
+    @staticmethod
+    def _reemplazable(directorio):
+        """
+        Indica si un directorio existente puede reemplazarse: vacío o con
+        solo archivos de un lote columnar.
+        """
+        entradas = os.listdir(directorio)
+        return all(entrada == 'meta.json' or entrada.endswith('.npy') for entrada in entradas)
+
+    @classmethod
+    def _escribir(cls, lote, directorio, tipo, campos_texto):
+        columnas = {}
+        for campo in lote.CAMPOS:
+            valores = getattr(lote, campo)
+            if campo in campos_texto:
+                cls._guardar_texto(directorio, campo, valores)
+                columnas[campo] = 'diccionario'
+            else:
+                np.save(os.path.join(directorio, f"{campo}.npy"), np.ascontiguousarray(valores))
+                columnas[campo] = str(valores.dtype)
+
+        # El metadato se escribe al final: su presencia indica un lote completo
+        with open(os.path.join(directorio, 'meta.json'), 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'formato': FORMATO,
+                'version': VERSION,
+                'tipo': tipo,
+                'filas': len(lote),
+                'columnas': columnas
+            }, archivo, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def _guardar(cls, lote, directorio, tipo, campos_texto):
+        destino = os.path.abspath(directorio)
+        if os.path.isdir(destino) and not cls._reemplazable(destino):
+            raise ValueError(f"{directorio} contiene archivos que no son de un lote columnar; no se reemplaza")
+        padre = os.path.dirname(destino)
+        os.makedirs(padre, exist_ok=True)
+        temporal = tempfile.mkdtemp(prefix=f".{os.path.basename(destino)}.", dir=padre)
+        try:
+            cls._escribir(lote, temporal, tipo, campos_texto)
+            if os.path.isdir(destino):
+                # El lote anterior se aparta antes de ocupar su nombre; los
+                # mapas de memoria abiertos sobre él siguen siendo válidos
+                anterior = temporal + '.anterior'
+                os.rename(destino, anterior)
+                os.rename(temporal, destino)
+                shutil.rmtree(anterior, ignore_errors=True)
+            else:
+                os.rename(temporal, destino)
+        except BaseException:
+            shutil.rmtree(temporal, ignore_errors=True)
+            raise
+
+    @classmethod
+    def _cargar(cls, directorio, tipo_esperado, clase_lote):
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as archivo:
+            meta = json.load(archivo)
+        if meta.get('formato') != FORMATO or meta.get('tipo') != tipo_esperado:
+            raise ValueError(f"{directorio} no contiene un lote de {tipo_esperado} en formato {FORMATO}")
+        if meta['version'] > VERSION:
+            raise ValueError(f"Versión de formato no soportada: {meta['version']}")
+
+        columnas = {}
+        for campo, tipo in meta['columnas'].items():
+            if tipo == 'diccionario':
+                columnas[campo] = cls._cargar_texto(directorio, campo)
+            else:
+                columnas[campo] = np.load(os.path.join(directorio, f"{campo}.npy"), mmap_mode='r')
+        return clase_lote(**columnas)
+
+    @classmethod
+    def guardar_empresas(cls, lote, directorio):
+        """
+        Guarda un lote de empresas en formato columnar.
+
+        Args:
+            lote (EmpresaBatch): Lote de empresas
+            directorio (str): Directorio destino (se crea o se reemplaza)
+        """
+        cls._guardar(lote, directorio, 'empresas', ('nombre', 'sector'))
+
+    @classmethod
+    def cargar_empresas(cls, directorio):
+        """
+        Abre un lote de empresas sin copiar sus columnas a memoria.
+
+        Args:
+            directorio (str): Directorio creado con guardar_empresas
+
+        Returns:
+            EmpresaBatch: Lote respaldado por arreglos de solo lectura mapeados en memoria
+        """
+        return cls._cargar(directorio, 'empresas', EmpresaBatch)
+
+    @classmethod
+    def guardar_resultados(cls, resultados, directorio):
+        """
+        Guarda un lote de resultados en formato columnar.
+
+        Args:
+            resultados (ResultadoBatch): Resultados del análisis
+            directorio (str): Directorio destino (se crea o se reemplaza)
+        """
+        cls._guardar(resultados, directorio, 'resultados', ('nombre', 'sector'))
+
+    @classmethod
+    def cargar_resultados(cls, directorio):
+        """
+        Abre un lote de resultados sin copiar sus columnas a memoria.
+
+        Args:
+            directorio (str): Directorio creado con guardar_resultados
+
+        Returns:
+            ResultadoBatch: Lote respaldado por arreglos de solo lectura mapeados en memoria
+        """
+        return cls._cargar(directorio, 'resultados', ResultadoBatch)
@@ -0,0 +1,235 @@
+import numpy as np
+from models.analisis import INDICADORES
+
+
+class DetectorAnomalias:
+    """
+    Detecta filas anómalas en un lote analizado: indicadores no finitos
+    (por ejemplo activos en cero) y valores atípicos dentro de su sector
+    según el puntaje z robusto (mediana y MAD).
+
+    Las estadísticas se calculan en escala logarítmica con signo, porque
+    productividad y rotación abarcan varios órdenes de magnitud y un error
+    de ×1000 en empleados es un desplazamiento fijo en esa escala. Como la
+    transformación es monótona, los límites se convierten de vuelta a la
+    escala original y cada fila solo se compara contra ellos. En lotes
+    grandes la mediana y la MAD de cada sector se estiman sobre una muestra
+    equiespaciada de filas, de modo que el costo por fila es constante.
+
+    El resultado es una máscara uint8 por fila: el bit i indica que
+    INDICADORES[i] no es finito y el bit 4 + i que es atípico (ver ANOMALIAS).
+    """
+    # Hace la MAD comparable con la desviación estándar de una normal
+    ESCALA_MAD = 0.6745
+    # Equivalente para la desviación absoluta media, usada si la MAD es 0
+    ESCALA_DESVIACION_MEDIA = 0.7979
+    # Filas por bloque del filtro inicial
+    TAMANO_BLOQUE = 32768
+
+    def __init__(self, umbral=3.5, tamano_muestra=8192, min_empresas=30):
+        """
+        Inicializa el detector.
+
+        Args:
+            umbral (float): Puntaje z robusto a partir del cual un valor es atípico
+            tamano_muestra (int): Filas usadas para estimar las estadísticas;
+                los lotes más pequeños se procesan completos
+            min_empresas (int): Valores finitos mínimos en un sector para
+                marcar atípicos en él
+        """
+        self.umbral = umbral
+        self.tamano_muestra = tamano_muestra
+        self.min_empresas = min_empresas
+        self._fraccion_lineal = np.array([self.FRACCION_LINEAL[nombre] for nombre in INDICADORES])
+
+    # Fracción del valor típico del sector por debajo de la cual la
+    # transformación deja de ser logarítmica (y admite ceros y negativos).
+    # Los ratios acotados solo se comprimen por encima de su valor típico;
+    # productividad y rotación dependen del tamaño de la empresa y se
+    # comparan en escala logarítmica en todo su rango
+    FRACCION_LINEAL = {
+        'ratio_endeudamiento': 1.0,
+        'rentabilidad': 1.0,
+        'productividad': 1e-4,
+        'rotacion_cartera': 1e-4
+    }
+
+    @staticmethod
+    def transformar(valores, escala=1.0):
+        """
+        Compresión logarítmica con signo: asinh(x / escala) se comporta como
+        log(x) para |x| mucho mayor que la escala y es lineal cerca de cero.
+        """
+        return np.arcsinh(valores / escala)
+
+    @staticmethod
+    def _invertir(valores, escala):
+        return np.sinh(valores) * escala
+
+    @staticmethod
+    def _mediana(matriz):
+        """
+        Mediana de cada fila de una matriz, con una sola partición.
+        """
+        columnas = matriz.shape[1]
+        mitad = columnas // 2
+        if columnas % 2:
+            return np.partition(matriz, mitad, axis=1)[:, mitad]
+        particion = np.partition(matriz, (mitad - 1, mitad), axis=1)
+        return (particion[:, mitad - 1] + particion[:, mitad]) / 2
+
+    @staticmethod
+    def _agrupar(matriz, codigos_sector, sectores):
+        """
+        Separa las columnas de una matriz por código de sector con un solo
+        ordenamiento; retorna una submatriz (posiblemente vacía) por sector.
+        """
+        orden = np.argsort(codigos_sector, kind='stable')
+        fronteras = np.cumsum(np.bincount(codigos_sector, minlength=sectores))[:-1]
+        return np.split(matriz[:, orden], fronteras, axis=1)
+
+    def _rangos(self, matriz):
+        """
+        Límites (inferior, superior) en escala original de los valores no
+        atípicos de cada indicador, a partir de una matriz (indicadores,
+        empresas) de valores finitos; (-inf, inf) si no hay dispersión.
+        """
+        # Escala relativa al valor típico del sector; como la transformación
+        # es monótona, la mediana transformada es la transformada de la mediana
+        mediana = self._mediana(matriz)
+        escala = np.abs(mediana) * self._fraccion_lineal
+        escala[escala == 0] = 1.0
+        mediana = self.transformar(mediana, escala)
+        desviacion = np.abs(self.transformar(matriz, escala[:, None]) - mediana[:, None])
+        dispersion = self._mediana(desviacion) / self.ESCALA_MAD
+        sin_mad = dispersion == 0
+        if sin_mad.any():
+            dispersion[sin_mad] = desviacion[sin_mad].mean(axis=1) / self.ESCALA_DESVIACION_MEDIA
+        with np.errstate(over='ignore'):
+            inferior = self._invertir(mediana - self.umbral * dispersion, escala)
+            superior = self._invertir(mediana + self.umbral * dispersion, escala)
+        sin_dispersion = dispersion == 0
+        inferior[sin_dispersion] = -np.inf
+        superior[sin_dispersion] = np.inf
+        return inferior, superior
+
+    def limites(self, indicadores, codigos_sector, sectores=None):
+        """
+        Calcula los límites de valores no atípicos de cada sector.
+
+        Las filas con algún indicador no finito no participan en las
+        estadísticas; los sectores con menos de min_empresas filas finitas
+        no tienen límites.
+
+        Args:
+            indicadores (tuple): Arreglos en el orden de INDICADORES
+            codigos_sector (np.ndarray): Código de sector de cada fila
+            sectores (int, optional): Número de códigos de sector posibles;
+                por defecto el mayor código más uno
+
+        Returns:
+            tuple: (inferior, superior), matrices (indicadores, sectores)
+        """
+        codigos_sector = np.asarray(codigos_sector)
+        n = len(codigos_sector)
+        if sectores is None:
+            sectores = int(codigos_sector.max()) + 1 if n else 0
+        inferior = np.full((len(INDICADORES), sectores), -np.inf)
+        superior = np.full((len(INDICADORES), sectores), np.inf)
+
+        filas_muestra = slice(None)
+        if n > self.tamano_muestra:
+            filas_muestra = np.linspace(0, n - 1, self.tamano_muestra).astype(np.intp)
+        muestra = np.stack([np.asarray(valores)[filas_muestra] for valores in indicadores])
+        codigos_muestra = codigos_sector[filas_muestra]
+        finitas = np.isfinite(muestra).all(axis=0)
+        grupos = self._agrupar(muestra[:, finitas], codigos_muestra[finitas], sectores)
+
+        pendientes = []
+        for sector in np.flatnonzero(np.bincount(codigos_muestra, minlength=sectores)):
+            if grupos[sector].shape[1] >= self.min_empresas:
+                inferior[:, sector], superior[:, sector] = self._rangos(grupos[sector])
+            elif not isinstance(filas_muestra, slice):
+                pendientes.append(sector)
+        if pendientes:
+            # Sectores poco representados en la muestra: se usan todas sus
+            # filas, reunidas en una sola pasada sobre los códigos
+            pendiente = np.zeros(sectores, dtype=bool)
+            pendiente[pendientes] = True
+            filas = np.flatnonzero(pendiente[codigos_sector])
+            matriz = np.stack([np.asarray(valores)[filas] for valores in indicadores])
+            finitas = np.isfinite(matriz).all(axis=0)
+            grupos = self._agrupar(matriz[:, finitas], codigos_sector[filas][finitas], sectores)
+            for sector in pendientes:
+                if grupos[sector].shape[1] >= self.min_empresas:
+                    inferior[:, sector], superior[:, sector] = self._rangos(grupos[sector])
+        return inferior, superior
+
+    def detectar(self, indicadores, codigos_sector, sectores=None):
+        """
+        Calcula las banderas de anomalía de cada fila.
+
+        Args:
+            indicadores (tuple): Arreglos en el orden de INDICADORES
+            codigos_sector (np.ndarray): Código de sector de cada fila
+            sectores (int, optional): Número de códigos de sector posibles
+
+        Returns:
+            np.ndarray: Máscara uint8 de anomalías por fila
+        """
+        codigos_sector = np.asarray(codigos_sector)
+        n = len(codigos_sector)
+        anomalias = np.zeros(n, dtype=np.uint8)
+        if n == 0:
+            return anomalias
+        inferior, superior = self.limites(indicadores, codigos_sector, sectores)
+
+        # Las filas dentro del rango de todos los sectores a la vez se descartan
+        # con comparaciones escalares; solo el resto (entre ellas NaN e inf)
+        # se compara contra los límites de su sector
+        indicadores = [np.asarray(valores) for valores in indicadores]
+        inferior_comun = inferior.max(axis=1)
+        superior_comun = superior.min(axis=1)
+        # Por bloques, para que valores y máscaras sigan en caché entre las
+        # comparaciones y al copiar los datos de las filas candidatas
+        dentro_bloque = np.empty(min(n, self.TAMANO_BLOQUE), dtype=bool)
+        cota_bloque = np.empty_like(dentro_bloque)
+        candidatas, codigos, valores_candidatas = [], [], [[] for _ in indicadores]
+        for inicio in range(0, n, self.TAMANO_BLOQUE):
+            fin = min(n, inicio + self.TAMANO_BLOQUE)
+            bloques = [valores[inicio:fin] for valores in indicadores]
+            dentro = dentro_bloque[:fin - inicio]
+            cota = cota_bloque[:fin - inicio]
+            dentro.fill(True)
+            for bit, valores in enumerate(bloques):
+                np.greater_equal(valores, inferior_comun[bit], out=cota)
+                dentro &= cota
+                np.less_equal(valores, superior_comun[bit], out=cota)
+                dentro &= cota
+            np.logical_not(dentro, out=dentro)
+            filas = np.flatnonzero(dentro)
+            if len(filas):
+                candidatas.append(filas + inicio)
+                codigos.append(codigos_sector[inicio:fin].take(filas))
+                for bit, valores in enumerate(bloques):
+                    valores_candidatas[bit].append(valores.take(filas))
+        if not candidatas:
+            return anomalias
+
+        candidatas = np.concatenate(candidatas)
+        codigos = np.concatenate(codigos)
+        banderas = np.zeros(len(candidatas), dtype=np.uint8)
+        for bit, valores in enumerate(valores_candidatas):
+            valores = np.concatenate(valores)
+            no_finito = ~np.isfinite(valores)
+            atipico = valores < inferior[bit].take(codigos)
+            atipico |= valores > superior[bit].take(codigos)
+            # Los no finitos solo llevan su propia bandera
+            atipico &= ~no_finito
+            banderas |= no_finito.view(np.uint8) << np.uint8(bit)
+            banderas |= atipico.view(np.uint8) << np.uint8(len(INDICADORES) + bit)
+        anomalias[candidatas] = banderas
+        return anomalias
+
+
+DETECTOR_ANOMALIAS = DetectorAnomalias()
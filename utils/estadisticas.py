@@ -0,0 +1,247 @@
+import math
+import numpy as np
+
+
+class EstadisticaWelford:
+    """
+    Media y varianza en una sola pasada (algoritmo de Welford). Los lotes y
+    los agregados parciales de otros procesos se combinan con la fórmula de
+    Chan et al., sin volver a recorrer los datos. Los valores no finitos se
+    cuentan aparte y no afectan la media.
+    """
+    def __init__(self):
+        """
+        Inicializa una estadística vacía.
+        """
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.no_finitos = 0
+
+    def agregar(self, valor):
+        """
+        Agrega un valor.
+
+        Args:
+            valor (float): Valor observado
+        """
+        if not math.isfinite(valor):
+            self.no_finitos += 1
+            return
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+
+    def _combinar_parcial(self, n, media, m2):
+        if n == 0:
+            return
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def agregar_lote(self, valores):
+        """
+        Agrega un arreglo de valores.
+
+        Args:
+            valores (np.ndarray): Valores observados
+        """
+        valores = np.asarray(valores, dtype=np.float64).reshape(-1)
+        finitos = valores[np.isfinite(valores)]
+        self.no_finitos += len(valores) - len(finitos)
+        if len(finitos):
+            media = float(finitos.mean())
+            self._combinar_parcial(len(finitos), media, float(np.square(finitos - media).sum()))
+
+    def combinar(self, otra):
+        """
+        Incorpora otra estadística (por ejemplo la de otro proceso).
+
+        Args:
+            otra (EstadisticaWelford): Estadística a combinar
+
+        Returns:
+            EstadisticaWelford: Esta misma instancia
+        """
+        self._combinar_parcial(otra.n, otra.media, otra.m2)
+        self.no_finitos += otra.no_finitos
+        return self
+
+    @property
+    def varianza(self):
+        """
+        Varianza muestral (NaN con menos de dos valores).
+        """
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def desviacion(self):
+        """
+        Desviación estándar muestral.
+        """
+        return math.sqrt(self.varianza) if self.n > 1 else math.nan
+
+
+class BosquejoKLL:
+    """
+    Bosquejo KLL de cuantiles: memoria acotada (del orden de 3k valores)
+    sin importar cuántos datos se agreguen, error de rango aproximado
+    O(1/k) y combinable con bosquejos de otros procesos.
+
+    Cada nivel h guarda valores con peso 2^h. Cuando un nivel supera su
+    capacidad se ordena y la mitad de sus valores (posiciones pares o impares
+    al azar) sube al nivel siguiente, conservando el peso total.
+    """
+    def __init__(self, k=200, semilla=None):
+        """
+        Inicializa un bosquejo vacío.
+
+        Args:
+            k (int): Parámetro de precisión (capacidad del nivel más alto)
+            semilla (int | np.random.SeedSequence, optional): Semilla de las compactaciones
+        """
+        if k < 8:
+            raise ValueError("k debe ser mayor o igual a 8")
+        self.k = k
+        self.n = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self._niveles = [np.empty(0, dtype=np.float64)]
+        self._pendientes = []
+        self._generador = np.random.default_rng(semilla)
+
+    def _capacidad(self, nivel):
+        altura = len(self._niveles)
+        return max(2, int(math.ceil(self.k * (2 / 3) ** (altura - 1 - nivel))))
+
+    def _vaciar_pendientes(self):
+        if self._pendientes:
+            self._niveles[0] = np.concatenate((self._niveles[0], np.asarray(self._pendientes, dtype=np.float64)))
+            self._pendientes = []
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self._niveles):
+            valores = self._niveles[nivel]
+            if len(valores) <= self._capacidad(nivel):
+                nivel += 1
+                continue
+            if nivel + 1 == len(self._niveles):
+                self._niveles.append(np.empty(0, dtype=np.float64))
+            valores = np.sort(valores)
+            # Con cantidad impar un valor se queda en el nivel para conservar el peso total
+            restante = valores[-1:] if len(valores) % 2 else valores[:0]
+            pares = valores[:len(valores) - len(restante)]
+            promovidos = pares[int(self._generador.integers(2))::2]
+            self._niveles[nivel] = restante.copy()
+            self._niveles[nivel + 1] = np.concatenate((self._niveles[nivel + 1], promovidos))
+            # Al crecer la altura cambian las capacidades: se revisa desde el inicio
+            nivel = 0
+
+    def agregar(self, valor):
+        """
+        Agrega un valor (se ignoran los NaN).
+
+        Args:
+            valor (float): Valor observado
+        """
+        if valor != valor:
+            return
+        self._pendientes.append(valor)
+        self.n += 1
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        if len(self._pendientes) >= self.k:
+            self._vaciar_pendientes()
+            self._compactar()
+
+    def agregar_lote(self, valores):
+        """
+        Agrega un arreglo de valores (se ignoran los NaN).
+
+        Args:
+            valores (np.ndarray): Valores observados
+        """
+        valores = np.asarray(valores, dtype=np.float64).reshape(-1)
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return
+        self._vaciar_pendientes()
+        self.n += len(valores)
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+        self._niveles[0] = np.concatenate((self._niveles[0], valores))
+        self._compactar()
+
+    def combinar(self, otro):
+        """
+        Incorpora otro bosquejo (por ejemplo el de otro proceso).
+
+        Args:
+            otro (BosquejoKLL): Bosquejo a combinar
+
+        Returns:
+            BosquejoKLL: Esta misma instancia
+        """
+        self._vaciar_pendientes()
+        otro._vaciar_pendientes()
+        while len(self._niveles) < len(otro._niveles):
+            self._niveles.append(np.empty(0, dtype=np.float64))
+        for nivel, valores in enumerate(otro._niveles):
+            self._niveles[nivel] = np.concatenate((self._niveles[nivel], valores))
+        self.n += otro.n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._compactar()
+        return self
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def valores_retenidos(self):
+        """
+        Cantidad de valores guardados (acotada por k, no por n).
+        """
+        return sum(len(valores) for valores in self._niveles) + len(self._pendientes)
+
+    def cuantiles(self, probabilidades):
+        """
+        Estima varios cuantiles.
+
+        Args:
+            probabilidades (array-like): Probabilidades entre 0 y 1
+
+        Returns:
+            np.ndarray: Cuantiles estimados (NaN si el bosquejo está vacío)
+        """
+        probabilidades = np.asarray(probabilidades, dtype=np.float64)
+        if self.n == 0:
+            return np.full(probabilidades.shape, np.nan)
+        self._vaciar_pendientes()
+        valores = np.concatenate(self._niveles)
+        pesos = np.concatenate([
+            np.full(len(niveles), 2 ** nivel, dtype=np.int64) for nivel, niveles in enumerate(self._niveles)
+        ])
+        orden = np.argsort(valores, kind='stable')
+        acumulado = np.cumsum(pesos[orden])
+        posiciones = np.searchsorted(acumulado, probabilidades * acumulado[-1], side='left')
+        resultado = valores[orden][np.minimum(posiciones, len(valores) - 1)]
+        # Los extremos se conocen exactamente
+        resultado = np.where(probabilidades <= 0, self.minimo, resultado)
+        return np.where(probabilidades >= 1, self.maximo, resultado)
+
+    def cuantil(self, probabilidad):
+        """
+        Estima un cuantil.
+
+        Args:
+            probabilidad (float): Probabilidad entre 0 y 1
+
+        Returns:
+            float: Cuantil estimado
+        """
+        return float(self.cuantiles([probabilidad])[0])
@@ -0,0 +1,357 @@
+import ast
+import hashlib
+import operator
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Campos numéricos de Empresa disponibles en las fórmulas
+CAMPOS_FORMULA = ('ganancias', 'empleados', 'activos', 'cartera', 'deudas')
+
+
+class FormulaCompilada:
+    """
+    Fórmula validada y compilada a una cadena de operaciones de NumPy sobre
+    columnas completas: una llamada por nodo del árbol, no por fila.
+    """
+    def __init__(self, expresion, campos, evaluador, constante=None, campos_lote=CAMPOS_FORMULA):
+        """
+        Inicializa la fórmula compilada.
+
+        Args:
+            expresion (str): Texto original de la fórmula
+            campos (tuple): Campos que usa, en el orden que espera el evaluador
+            evaluador (callable): Función de la lista de columnas al resultado
+            constante (float, optional): Valor si la fórmula no usa campos
+            campos_lote (tuple): Campos de donde tomar el tamaño del lote
+                para repetir una constante
+        """
+        self.expresion = expresion
+        self.campos = campos
+        self._evaluador = evaluador
+        self.constante = constante
+        self.campos_lote = campos_lote
+
+    @staticmethod
+    def _valor(datos, campo):
+        valor = datos[campo] if hasattr(datos, 'keys') else getattr(datos, campo)
+        return np.asarray(valor, dtype=np.float64)
+
+    @staticmethod
+    def _tiene(datos, campo):
+        return campo in datos if hasattr(datos, 'keys') else hasattr(datos, campo)
+
+    def _constante(self, datos):
+        """
+        La constante, repetida a lo largo del lote si los datos son columnas.
+        """
+        for campo in self.campos_lote:
+            if self._tiene(datos, campo):
+                forma = np.shape(self._valor(datos, campo))
+                if forma:
+                    return np.full(forma, self.constante)
+                break
+        return self.constante
+
+    def __call__(self, datos):
+        """
+        Evalúa la fórmula para una empresa o un lote.
+
+        Args:
+            datos (dict | pandas.DataFrame | Empresa | EmpresaBatch): Campos usados
+                por la fórmula, escalares o columnas
+
+        Returns:
+            float | np.ndarray: Resultado por empresa (también para una
+                fórmula constante evaluada sobre un lote)
+        """
+        if self.constante is not None:
+            return self._constante(datos)
+        columnas = [self._valor(datos, campo) for campo in self.campos]
+        try:
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                resultado = np.asarray(self._evaluador(columnas), dtype=np.float64)
+        except RecursionError:
+            raise ValueError(f"Fórmula demasiado anidada: '{self.expresion}'") from None
+        return float(resultado) if resultado.ndim == 0 else resultado
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.expresion!r})"
+
+
+class CompiladorFormulas:
+    """
+    Lenguaje de expresiones seguro para indicadores personalizados, por
+    ejemplo "(activos - deudas) / empleados".
+
+    La expresión se analiza con ast y solo se aceptan números, campos
+    permitidos, + - * / ** %, signo y las funciones de FUNCIONES; cualquier
+    otro nodo (atributos, índices, llamadas arbitrarias) es un error. Las
+    subexpresiones constantes se pliegan al compilar y el resultado se
+    guarda en una caché LRU indexada por la huella de la expresión. Las
+    divisiones por cero siguen IEEE (inf o NaN).
+    """
+    OPERADORES = {
+        ast.Add: np.add,
+        ast.Sub: np.subtract,
+        ast.Mult: np.multiply,
+        ast.Div: np.divide,
+        ast.Pow: np.power,
+        ast.Mod: np.mod
+    }
+    UNARIOS = {
+        ast.USub: np.negative,
+        ast.UAdd: np.positive
+    }
+    # Nombre -> (función vectorizada, mínimo de argumentos, máximo de argumentos)
+    FUNCIONES = {
+        'abs': (np.abs, 1, 1),
+        'sqrt': (np.sqrt, 1, 1),
+        'log': (np.log, 1, 1),
+        'exp': (np.exp, 1, 1),
+        'min': (np.minimum, 2, None),
+        'max': (np.maximum, 2, None)
+    }
+
+    def __init__(self, campos=CAMPOS_FORMULA, max_entradas=256):
+        """
+        Inicializa el compilador.
+
+        Args:
+            campos (iterable): Nombres de campo permitidos en las fórmulas
+            max_entradas (int): Fórmulas compiladas guardadas en la caché
+        """
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser mayor o igual a 1")
+        self.campos = tuple(campos)
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _analizar(expresion):
+        """
+        Analiza el texto de una fórmula. Las constantes enteras se pasan a
+        float, como al evaluarlas, para que 2 y 2.0 den el mismo árbol.
+
+        Returns:
+            ast.Expression: Árbol de la expresión
+        """
+        try:
+            arbol = ast.parse(expresion.strip(), mode='eval')
+        except SyntaxError as error:
+            raise ValueError(f"Fórmula inválida '{expresion}': {error.msg}") from None
+        except (RecursionError, MemoryError):
+            raise ValueError(f"Fórmula demasiado anidada: '{expresion}'") from None
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, ast.Constant) and type(nodo.value) is int:
+                try:
+                    nodo.value = float(nodo.value)
+                except OverflowError:
+                    raise ValueError(f"Constante fuera de rango en '{expresion}'") from None
+        return arbol
+
+    @staticmethod
+    def _huella_arbol(arbol):
+        return hashlib.blake2b(ast.dump(arbol).encode('utf-8'), digest_size=16).hexdigest()
+
+    @classmethod
+    def huella(cls, expresion):
+        """
+        Huella estable de una expresión, calculada sobre su árbol sintáctico:
+        no distingue espacios, paréntesis redundantes ni la forma de escribir
+        los números (2, 2.0).
+
+        Args:
+            expresion (str): Texto de la fórmula
+
+        Returns:
+            str: Huella hexadecimal
+        """
+        return cls._huella_arbol(cls._analizar(expresion))
+
+    def _validar(self, nodo, expresion):
+        """
+        Verifica recursivamente que el árbol solo use la sintaxis permitida.
+        """
+        if isinstance(nodo, ast.Expression):
+            return self._validar(nodo.body, expresion)
+        if isinstance(nodo, ast.Constant):
+            if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+                raise ValueError(f"Constante no permitida en '{expresion}': {nodo.value!r}")
+            return
+        if isinstance(nodo, ast.Name):
+            if nodo.id not in self.campos:
+                raise ValueError(f"Campo desconocido en '{expresion}': {nodo.id}")
+            return
+        if isinstance(nodo, ast.BinOp) and type(nodo.op) in self.OPERADORES:
+            self._validar(nodo.left, expresion)
+            self._validar(nodo.right, expresion)
+            return
+        if isinstance(nodo, ast.UnaryOp) and type(nodo.op) in self.UNARIOS:
+            self._validar(nodo.operand, expresion)
+            return
+        if isinstance(nodo, ast.Call) and isinstance(nodo.func, ast.Name) and not nodo.keywords:
+            if nodo.func.id not in self.FUNCIONES:
+                raise ValueError(f"Función no permitida en '{expresion}': {nodo.func.id}")
+            _, minimo, maximo = self.FUNCIONES[nodo.func.id]
+            if len(nodo.args) < minimo or (maximo is not None and len(nodo.args) > maximo):
+                raise ValueError(f"Número de argumentos inválido para {nodo.func.id} en '{expresion}'")
+            for argumento in nodo.args:
+                self._validar(argumento, expresion)
+            return
+        raise ValueError(f"Sintaxis no permitida en '{expresion}': {ast.dump(nodo)}")
+
+    def _plegar(self, nodo):
+        """
+        Pliega las subexpresiones constantes.
+
+        Returns:
+            float | ast.AST: El valor si la subexpresión es constante, si no el nodo
+        """
+        if isinstance(nodo, ast.Constant):
+            return np.float64(nodo.value)
+        if isinstance(nodo, ast.Name):
+            return nodo
+        if isinstance(nodo, ast.BinOp):
+            nodo.left, nodo.right = self._plegar(nodo.left), self._plegar(nodo.right)
+            if not isinstance(nodo.left, ast.AST) and not isinstance(nodo.right, ast.AST):
+                return self.OPERADORES[type(nodo.op)](nodo.left, nodo.right)
+            return nodo
+        if isinstance(nodo, ast.UnaryOp):
+            nodo.operand = self._plegar(nodo.operand)
+            if not isinstance(nodo.operand, ast.AST):
+                return self.UNARIOS[type(nodo.op)](nodo.operand)
+            return nodo
+        nodo.args = [self._plegar(argumento) for argumento in nodo.args]
+        if not any(isinstance(argumento, ast.AST) for argumento in nodo.args):
+            return self._aplicar(nodo.func.id, nodo.args)
+        return nodo
+
+    @staticmethod
+    def _salida(valor, temporal, otro=None):
+        """
+        Arreglo donde escribir el resultado: el valor intermedio si es un
+        temporal propio con la forma final, para no reservar memoria nueva.
+        """
+        if temporal and isinstance(valor, np.ndarray) and (
+            otro is None or valor.shape == np.broadcast_shapes(valor.shape, np.shape(otro))
+        ):
+            return valor
+        return None
+
+    def _aplicar(self, funcion, argumentos, temporales=None):
+        funcion = self.FUNCIONES[funcion][0]
+        temporales = temporales or [False] * len(argumentos)
+        if len(argumentos) == 1:
+            return funcion(argumentos[0], out=self._salida(argumentos[0], temporales[0]))
+        resultado, temporal = argumentos[0], temporales[0]
+        for argumento, temporal_argumento in zip(argumentos[1:], temporales[1:]):
+            salida = self._salida(resultado, temporal, argumento)
+            if salida is None:
+                salida = self._salida(argumento, temporal_argumento, resultado)
+            resultado, temporal = funcion(resultado, argumento, out=salida), True
+        return resultado
+
+    def _generar(self, nodo, posiciones):
+        """
+        Convierte el árbol plegado en funciones anidadas sobre la lista de
+        columnas. Los resultados intermedios son temporales propios y se
+        reutilizan como salida de la operación siguiente.
+
+        Returns:
+            tuple: (función, True si su resultado es un temporal propio)
+        """
+        if not isinstance(nodo, ast.AST):
+            return (lambda columnas: nodo), False
+        if isinstance(nodo, ast.Name):
+            posicion = posiciones.setdefault(nodo.id, len(posiciones))
+            return operator.itemgetter(posicion), False
+        salida = self._salida
+        if isinstance(nodo, ast.BinOp):
+            funcion = self.OPERADORES[type(nodo.op)]
+            izquierda, temporal_izquierda = self._generar(nodo.left, posiciones)
+            derecha, temporal_derecha = self._generar(nodo.right, posiciones)
+
+            def binaria(columnas):
+                a, b = izquierda(columnas), derecha(columnas)
+                destino = salida(a, temporal_izquierda, b)
+                if destino is None:
+                    destino = salida(b, temporal_derecha, a)
+                return funcion(a, b, out=destino)
+            return binaria, True
+        if isinstance(nodo, ast.UnaryOp):
+            funcion = self.UNARIOS[type(nodo.op)]
+            operando, temporal_operando = self._generar(nodo.operand, posiciones)
+
+            def unaria(columnas):
+                valor = operando(columnas)
+                return funcion(valor, out=salida(valor, temporal_operando))
+            return unaria, True
+        nombre = nodo.func.id
+        argumentos = [self._generar(argumento, posiciones) for argumento in nodo.args]
+        temporales = [temporal for _, temporal in argumentos]
+
+        def llamada(columnas):
+            return self._aplicar(nombre, [argumento(columnas) for argumento, _ in argumentos], temporales)
+        return llamada, True
+
+    def compilar(self, expresion):
+        """
+        Analiza, valida, pliega y compila una fórmula, o la toma de la caché.
+
+        Args:
+            expresion (str): Fórmula sobre los campos permitidos
+
+        Returns:
+            FormulaCompilada: Evaluador vectorizado de la fórmula
+        """
+        arbol = self._analizar(expresion)
+        try:
+            huella = self._huella_arbol(arbol)
+        except RecursionError:
+            raise ValueError(f"Fórmula demasiado anidada: '{expresion}'") from None
+        with self._lock:
+            formula = self._entradas.get(huella)
+            if formula is not None:
+                self._entradas.move_to_end(huella)
+                return formula
+
+        try:
+            self._validar(arbol, expresion)
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                plegado = self._plegar(arbol.body)
+            if isinstance(plegado, ast.AST):
+                posiciones = {}
+                evaluador, temporal = self._generar(plegado, posiciones)
+                if not temporal:
+                    # Una fórmula que es solo un campo no debe retornar la columna de entrada
+                    evaluador = (lambda campo: lambda columnas: np.array(campo(columnas)))(evaluador)
+                formula = FormulaCompilada(expresion, tuple(posiciones), evaluador)
+            else:
+                formula = FormulaCompilada(expresion, (), None, constante=float(plegado), campos_lote=self.campos)
+        except RecursionError:
+            raise ValueError(f"Fórmula demasiado anidada: '{expresion}'") from None
+
+        with self._lock:
+            self._entradas[huella] = formula
+            if len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return formula
+
+    def evaluar(self, expresion, datos):
+        """
+        Compila (o toma de la caché) y evalúa una fórmula.
+
+        Args:
+            expresion (str): Fórmula sobre los campos permitidos
+            datos (dict | pandas.DataFrame | Empresa | EmpresaBatch): Datos de
+                una empresa o de un lote
+
+        Returns:
+            float | np.ndarray: Resultado por empresa
+        """
+        return self.compilar(expresion)(datos)
+
+
+COMPILADOR_FORMULAS = CompiladorFormulas()
@@ -0,0 +1,124 @@
+import numpy as np
+from models.analisis import INDICADORES, EVALUACIONES
+from utils.reglas import MOTOR_REGLAS
+
+
+class Indicadores:
+    """
+    Clase con las fórmulas vectorizadas de los indicadores financieros.
+    """
+    NOMBRES = INDICADORES
+    EVALUACIONES = EVALUACIONES
+
+    @staticmethod
+    def _dividir(numerador, denominador, valor_cero):
+        """
+        Divide elemento a elemento usando valor_cero donde el divisor es 0.
+
+        Args:
+            numerador (np.ndarray): Numerador
+            denominador (np.ndarray): Denominador
+            valor_cero (float): Resultado cuando el denominador es 0
+
+        Returns:
+            np.ndarray: Cociente
+        """
+        numerador, denominador = np.broadcast_arrays(
+            np.asarray(numerador, dtype=np.float64),
+            np.asarray(denominador, dtype=np.float64)
+        )
+        salida = np.full(numerador.shape, valor_cero, dtype=np.float64)
+        return np.divide(numerador, denominador, out=salida, where=denominador != 0)
+
+    @staticmethod
+    def calcular_lote(ganancias, empleados, activos, cartera, deudas):
+        """
+        Calcula los cuatro indicadores para arreglos de empresas.
+
+        Replica exactamente los métodos calcular_* de AnalizadorFinanciero,
+        incluyendo inf/0 cuando el divisor es cero.
+
+        Args:
+            ganancias (np.ndarray): Ganancias anuales
+            empleados (np.ndarray): Número de empleados
+            activos (np.ndarray): Valor total de activos
+            cartera (np.ndarray): Valor en cartera
+            deudas (np.ndarray): Valor de deudas
+
+        Returns:
+            tuple: (ratio_endeudamiento, rentabilidad, productividad, rotacion_cartera)
+        """
+        ratio_endeudamiento = Indicadores._dividir(deudas, activos, np.inf)
+        rentabilidad = Indicadores._dividir(ganancias, activos, 0.0)
+        productividad = Indicadores._dividir(ganancias, empleados, 0.0)
+        rotacion_cartera = Indicadores._dividir(cartera, ganancias, np.inf)
+        rotacion_cartera *= 365  # Días de rotación
+        return ratio_endeudamiento, rentabilidad, productividad, rotacion_cartera
+
+    @staticmethod
+    def evaluar_lote(indicadores, limites, reglas=MOTOR_REGLAS):
+        """
+        Evalúa los indicadores contra los límites de su sector.
+
+        Args:
+            indicadores (tuple): Arreglos en el orden de NOMBRES
+            limites (np.ndarray): Límites (..., 4) en el orden de EVALUACIONES,
+                difundibles contra los indicadores
+            reglas (MotorReglas): Reglas de evaluación compiladas
+
+        Returns:
+            np.ndarray: Arreglo booleano (..., 4), True si el indicador es favorable
+        """
+        return reglas.evaluar_lote(indicadores, limites)
+
+    @staticmethod
+    def puntos_positivos(favorable):
+        """
+        Cuenta los indicadores favorables por empresa.
+
+        Args:
+            favorable (np.ndarray): Matriz booleana (n, 4)
+
+        Returns:
+            np.ndarray: Número de indicadores favorables por fila
+        """
+        return np.count_nonzero(favorable, axis=-1)
+
+    @staticmethod
+    def estado_lote(favorable, reglas=MOTOR_REGLAS):
+        """
+        Calcula el código de estado general (índice en ESTADOS) por empresa.
+
+        Args:
+            favorable (np.ndarray): Matriz booleana (..., 4)
+            reglas (MotorReglas): Reglas con los umbrales de estado
+
+        Returns:
+            np.ndarray: Códigos uint8 de estado general
+        """
+        return reglas.estado_lote(favorable)
+
+    @staticmethod
+    def analizar_columnas(ganancias, empleados, activos, cartera, deudas, limites):
+        """
+        Ejecuta el análisis completo sobre columnas ya resueltas a límites.
+
+        Args:
+            ganancias (np.ndarray): Ganancias anuales
+            empleados (np.ndarray): Número de empleados
+            activos (np.ndarray): Valor total de activos
+            cartera (np.ndarray): Valor en cartera
+            deudas (np.ndarray): Valor de deudas
+            limites (np.ndarray): Matriz (n, 4) de límites del sector de cada fila
+
+        Returns:
+            tuple: (indicadores, evaluacion, estado, recomendaciones) con la
+                codificación de ResultadoBatch
+        """
+        indicadores = Indicadores.calcular_lote(ganancias, empleados, activos, cartera, deudas)
+        evaluacion = MOTOR_REGLAS.mascara_lote(Indicadores.evaluar_lote(indicadores, limites))
+        estado = MOTOR_REGLAS.estado_lote(mascara=evaluacion)
+
+        # Una recomendación por cada indicador desfavorable
+        recomendaciones = evaluacion ^ np.uint8(MOTOR_REGLAS.mascara_completa)
+        return indicadores, evaluacion, estado, recomendaciones
@@ -0,0 +1,254 @@
+import numpy as np
+from utils.indicadores import Indicadores
+
+
+def _cociente(valor_cero, factor=None):
+    """
+    Kernel numerador / denominador con el manejo de divisor cero de
+    Indicadores (valor_cero donde el divisor es 0), opcionalmente escalado.
+    """
+    def kernel(numerador, denominador):
+        resultado = Indicadores._dividir(numerador, denominador, valor_cero)
+        if factor is not None:
+            resultado *= factor
+        return resultado
+    return kernel
+
+
+def _ciclo_caja(dias_cartera, dias_inventario, dias_proveedores):
+    # Con días infinitos el resultado es NaN (documentado), sin advertencia
+    with np.errstate(invalid='ignore'):
+        return dias_cartera + dias_inventario - dias_proveedores
+
+
+# Datos de entrada del balance extendido. Los cinco primeros son los de Empresa
+CAMPOS_BALANCE = {
+    'ganancias': 'Ganancias netas anuales en COP',
+    'empleados': 'Número de empleados',
+    'activos': 'Activos totales en COP',
+    'cartera': 'Cartera por cobrar en COP',
+    'deudas': 'Pasivos totales en COP',
+    'ventas': 'Ingresos por ventas anuales en COP',
+    'costo_ventas': 'Costo de ventas anual en COP',
+    'utilidad_operacional': 'Utilidad operacional anual en COP',
+    'activo_corriente': 'Activo corriente en COP',
+    'pasivo_corriente': 'Pasivo corriente en COP',
+    'inventario': 'Inventario en COP',
+    'cuentas_por_pagar': 'Cuentas por pagar a proveedores en COP',
+    'patrimonio': 'Patrimonio en COP (por defecto activos - deudas)'
+}
+
+# Nodo -> (dependencias, kernel). Un nodo presente en los datos de entrada se
+# toma tal cual en lugar de calcularse (por ejemplo el patrimonio)
+NODOS_RATIOS = {
+    # Resultados intermedios compartidos
+    'patrimonio': (('activos', 'deudas'), np.subtract),
+    'utilidad_bruta': (('ventas', 'costo_ventas'), np.subtract),
+    'activo_rapido': (('activo_corriente', 'inventario'), np.subtract),
+    # Indicadores del análisis, con las mismas fórmulas que Indicadores.calcular_lote
+    'ratio_endeudamiento': (('deudas', 'activos'), _cociente(np.inf)),
+    'rentabilidad': (('ganancias', 'activos'), _cociente(0.0)),
+    'productividad': (('ganancias', 'empleados'), _cociente(0.0)),
+    'rotacion_cartera': (('cartera', 'ganancias'), _cociente(np.inf, 365)),
+    # Liquidez
+    'razon_corriente': (('activo_corriente', 'pasivo_corriente'), _cociente(np.inf)),
+    'prueba_acida': (('activo_rapido', 'pasivo_corriente'), _cociente(np.inf)),
+    # Rentabilidad sobre patrimonio y márgenes
+    'roe': (('ganancias', 'patrimonio'), _cociente(0.0)),
+    'margen_bruto': (('utilidad_bruta', 'ventas'), _cociente(0.0)),
+    'margen_operacional': (('utilidad_operacional', 'ventas'), _cociente(0.0)),
+    'margen_neto': (('ganancias', 'ventas'), _cociente(0.0)),
+    # Ciclo de conversión de efectivo (días)
+    'dias_cartera': (('cartera', 'ventas'), _cociente(np.inf, 365)),
+    'dias_inventario': (('inventario', 'costo_ventas'), _cociente(np.inf, 365)),
+    'dias_proveedores': (('cuentas_por_pagar', 'costo_ventas'), _cociente(np.inf, 365)),
+    'ciclo_caja': (('dias_cartera', 'dias_inventario', 'dias_proveedores'), _ciclo_caja)
+}
+
+INTERMEDIOS = ('patrimonio', 'utilidad_bruta', 'activo_rapido')
+RATIOS = tuple(nombre for nombre in NODOS_RATIOS if nombre not in INTERMEDIOS)
+
+
+class BibliotecaRatios:
+    """
+    Biblioteca de ratios financieros sobre un balance extendido: los cuatro
+    indicadores del análisis más liquidez (razón corriente, prueba ácida),
+    ROE, márgenes y ciclo de conversión de efectivo (DSO, DIO, DPO).
+
+    Cada ratio es un kernel vectorizado sobre columnas completas y la
+    evaluación sigue un grafo de dependencias: solo se calculan los nodos que
+    necesitan los ratios pedidos, cada uno una sola vez, de modo que los
+    intermedios (por ejemplo los días de cartera dentro del ciclo de caja) se
+    comparten. El orden de evaluación de cada combinación de ratios pedidos y
+    datos disponibles se resuelve una vez y se reutiliza.
+
+    Un divisor cero da inf en los ratios donde un valor mayor es peor o
+    ilimitado (endeudamiento, liquidez sin pasivo, días) y 0 en los de
+    rentabilidad, como en Indicadores; el ciclo de caja puede ser NaN si sus
+    términos en días son infinitos.
+    """
+    def __init__(self, nodos=NODOS_RATIOS):
+        """
+        Inicializa la biblioteca.
+
+        Args:
+            nodos (dict): Nodo -> (dependencias, kernel); el kernel recibe los
+                arreglos de las dependencias en orden
+        """
+        self.nodos = dict(nodos)
+        self._planes = {}
+
+    def registrar(self, nombre, dependencias, kernel):
+        """
+        Agrega o reemplaza un nodo del grafo.
+
+        Args:
+            nombre (str): Nombre del ratio o intermedio
+            dependencias (tuple): Campos de entrada u otros nodos que usa
+            kernel (callable): Función vectorizada sobre las dependencias
+        """
+        self.nodos[nombre] = (tuple(dependencias), kernel)
+        self._planes.clear()
+
+    def plan(self, ratios, disponibles=()):
+        """
+        Resuelve el orden de evaluación de los ratios pedidos.
+
+        Args:
+            ratios (iterable): Nombres de los ratios a calcular
+            disponibles (iterable): Campos presentes en los datos de entrada
+
+        Returns:
+            tuple: Nodos a calcular, cada uno después de sus dependencias
+        """
+        ratios = tuple(ratios)
+        disponibles = frozenset(disponibles)
+        clave = (ratios, disponibles)
+        orden = self._planes.get(clave)
+        if orden is not None:
+            return orden
+
+        orden = []
+        resueltos = set(disponibles)
+        en_curso = set()
+
+        def visitar(nombre, requerido_por):
+            if nombre in resueltos:
+                return
+            if nombre not in self.nodos:
+                if requerido_por is None:
+                    raise ValueError(f"Ratio desconocido: {nombre}")
+                raise ValueError(f"Falta el dato '{nombre}' para calcular {requerido_por}")
+            if nombre in en_curso:
+                raise ValueError(f"Dependencia circular en el ratio {nombre}")
+            en_curso.add(nombre)
+            for dependencia in self.nodos[nombre][0]:
+                visitar(dependencia, nombre)
+            en_curso.discard(nombre)
+            resueltos.add(nombre)
+            orden.append(nombre)
+
+        for nombre in ratios:
+            visitar(nombre, None)
+        orden = self._planes[clave] = tuple(orden)
+        return orden
+
+    def requeridos(self, ratios):
+        """
+        Campos de entrada necesarios para calcular los ratios pedidos.
+
+        Args:
+            ratios (iterable): Nombres de los ratios
+
+        Returns:
+            tuple: Campos de entrada, en orden de primera aparición (los
+                intermedios como el patrimonio se derivan y no se exigen)
+        """
+        campos, visitados = [], set()
+        pendientes = list(ratios)[::-1]
+        while pendientes:
+            nombre = pendientes.pop()
+            if nombre in visitados:
+                continue
+            visitados.add(nombre)
+            if nombre in self.nodos:
+                pendientes.extend(self.nodos[nombre][0][::-1])
+            elif nombre in CAMPOS_BALANCE:
+                campos.append(nombre)
+            else:
+                raise ValueError(f"Ratio desconocido: {nombre}")
+        return tuple(campos)
+
+    def calculables(self, disponibles):
+        """
+        Ratios que se pueden calcular con los campos disponibles.
+
+        Args:
+            disponibles (iterable): Campos presentes en los datos de entrada
+
+        Returns:
+            tuple: Nombres de los ratios calculables, en el orden de RATIOS
+        """
+        disponibles = frozenset(disponibles)
+        calculables = []
+        for nombre in self.nodos:
+            if nombre in INTERMEDIOS:
+                continue
+            try:
+                self.plan((nombre,), disponibles)
+            except ValueError:
+                continue
+            calculables.append(nombre)
+        return tuple(calculables)
+
+    @staticmethod
+    def _disponibles(datos, nombres):
+        if hasattr(datos, 'keys'):
+            claves = set(datos.keys())
+            return tuple(nombre for nombre in nombres if nombre in claves)
+        return tuple(nombre for nombre in nombres if hasattr(datos, nombre))
+
+    @staticmethod
+    def _valor(datos, nombre):
+        valor = datos[nombre] if hasattr(datos, 'keys') else getattr(datos, nombre)
+        return np.asarray(valor, dtype=np.float64)
+
+    def calcular(self, datos, ratios=None):
+        """
+        Calcula los ratios pedidos para una empresa o un lote.
+
+        Args:
+            datos (dict | pandas.DataFrame | Empresa | EmpresaBatch): Campos del
+                balance extendido (ver CAMPOS_BALANCE), escalares para una
+                empresa o columnas para un lote
+            ratios (iterable, optional): Ratios a calcular; por defecto todos
+                los calculables con los campos disponibles
+
+        Returns:
+            dict: Ratio -> valor (float para una empresa, np.ndarray para un lote)
+        """
+        disponibles = self._disponibles(datos, tuple(CAMPOS_BALANCE) + tuple(self.nodos))
+        ratios = self.calculables(disponibles) if ratios is None else tuple(ratios)
+        orden = self.plan(ratios, disponibles)
+
+        valores = {}
+        for nombre in orden:
+            dependencias, kernel = self.nodos[nombre]
+            argumentos = []
+            for dependencia in dependencias:
+                valor = valores.get(dependencia)
+                if valor is None:
+                    valor = valores[dependencia] = self._valor(datos, dependencia)
+                argumentos.append(valor)
+            valores[nombre] = np.asarray(kernel(*argumentos), dtype=np.float64)
+
+        resultado = {}
+        for nombre in ratios:
+            valor = valores.get(nombre)
+            if valor is None:
+                valor = self._valor(datos, nombre)
+            resultado[nombre] = float(valor) if valor.ndim == 0 else valor
+        return resultado
+
+
+BIBLIOTECA_RATIOS = BibliotecaRatios()
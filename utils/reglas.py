@@ -0,0 +1,140 @@
+import operator
+import numpy as np
+from models.analisis import INDICADORES, REGLAS_EVALUACION, UMBRALES_ESTADO
+
+
+class MotorReglas:
+    """
+    Compila una tabla declarativa de reglas de evaluación en comparadores
+    escalares y máscaras booleanas de NumPy, de modo que el análisis
+    individual y el análisis por lotes usan exactamente las mismas reglas.
+    """
+    # Operador de comparación -> (versión escalar, versión vectorizada)
+    COMPARACIONES = {
+        '<=': (operator.le, np.less_equal),
+        '<': (operator.lt, np.less),
+        '>=': (operator.ge, np.greater_equal),
+        '>': (operator.gt, np.greater)
+    }
+
+    def __init__(self, reglas=REGLAS_EVALUACION, umbrales_estado=UMBRALES_ESTADO):
+        """
+        Compila las reglas.
+
+        Args:
+            reglas (tuple): Reglas con las claves 'evaluacion', 'indicador',
+                'comparacion', 'favorable', 'desfavorable' y 'recomendacion'
+            umbrales_estado (dict): Estado general -> puntos positivos mínimos,
+                de peor a mejor estado
+        """
+        self.reglas = tuple(reglas)
+        if not 0 < len(self.reglas) <= 8:
+            raise ValueError("Se requieren entre 1 y 8 reglas (las evaluaciones se codifican en un byte)")
+        for regla in self.reglas:
+            if regla['indicador'] not in INDICADORES:
+                raise ValueError(f"Indicador desconocido en la regla {regla['evaluacion']}: {regla['indicador']}")
+            if regla['comparacion'] not in self.COMPARACIONES:
+                raise ValueError(f"Comparación no soportada en la regla {regla['evaluacion']}: {regla['comparacion']}")
+
+        self.evaluaciones = tuple(regla['evaluacion'] for regla in self.reglas)
+        self.etiquetas = tuple((regla['desfavorable'], regla['favorable']) for regla in self.reglas)
+        self.recomendaciones = tuple(regla['recomendacion'] for regla in self.reglas)
+        self.estados = tuple(umbrales_estado)
+        self._columnas = tuple(INDICADORES.index(regla['indicador']) for regla in self.reglas)
+        self._escalares = tuple(self.COMPARACIONES[regla['comparacion']][0] for regla in self.reglas)
+        self._vectoriales = tuple(self.COMPARACIONES[regla['comparacion']][1] for regla in self.reglas)
+
+        # Tabla puntos positivos -> código de estado (índice en self.estados)
+        minimos = list(umbrales_estado.values())
+        if minimos != sorted(minimos) or minimos[0] != 0:
+            raise ValueError("Los umbrales de estado deben ser crecientes y empezar en 0")
+        puntos = np.arange(len(self.reglas) + 1)
+        self.estado_por_puntos = (np.searchsorted(minimos, puntos, side='right') - 1).astype(np.uint8)
+        self.estado_por_puntos.setflags(write=False)
+        self._estado_por_puntos = self.estado_por_puntos.tolist()
+
+        # Tabla máscara de reglas favorables -> código de estado, para resolver
+        # el estado de un lote con una sola indexación
+        mascaras = np.arange(1 << len(self.reglas), dtype=np.uint8)
+        puntos_mascara = np.unpackbits(mascaras[:, None], axis=1, bitorder='little').sum(axis=1)
+        self.estado_por_mascara = self.estado_por_puntos[puntos_mascara]
+        self.estado_por_mascara.setflags(write=False)
+        self.mascara_completa = (1 << len(self.reglas)) - 1
+
+    def evaluar(self, indicadores, limites):
+        """
+        Evalúa los indicadores de una empresa.
+
+        Args:
+            indicadores (tuple): Valores en el orden de INDICADORES
+            limites (np.ndarray | list): Límites del sector en el orden de las reglas
+
+        Returns:
+            tuple: (evaluacion dict, estado_general, lista de recomendaciones)
+        """
+        limites = limites.tolist() if isinstance(limites, np.ndarray) else limites
+        evaluacion = {}
+        recomendaciones = []
+        puntos_positivos = 0
+        for posicion, comparar in enumerate(self._escalares):
+            favorable = bool(comparar(indicadores[self._columnas[posicion]], limites[posicion]))
+            evaluacion[self.evaluaciones[posicion]] = self.etiquetas[posicion][favorable]
+            if favorable:
+                puntos_positivos += 1
+            else:
+                recomendaciones.append(self.recomendaciones[posicion])
+        return evaluacion, self.estados[self._estado_por_puntos[puntos_positivos]], recomendaciones
+
+    def evaluar_lote(self, indicadores, limites):
+        """
+        Evalúa arreglos de indicadores contra los límites de su sector.
+
+        Cada regla escribe en un bloque contiguo de memoria; el resultado es
+        una vista (..., reglas) sobre ese bloque.
+
+        Args:
+            indicadores (tuple): Arreglos en el orden de INDICADORES
+            limites (np.ndarray): Límites (..., reglas) difundibles contra los indicadores
+
+        Returns:
+            np.ndarray: Arreglo booleano (..., reglas), True si la regla es favorable
+        """
+        forma = np.broadcast_shapes(*(np.shape(valores) for valores in indicadores), limites.shape[:-1])
+        favorable = np.empty((len(self.reglas),) + forma, dtype=bool)
+        for posicion, comparar in enumerate(self._vectoriales):
+            comparar(indicadores[self._columnas[posicion]], limites[..., posicion], out=favorable[posicion, ...])
+        return np.moveaxis(favorable, 0, -1)
+
+    def mascara_lote(self, favorable):
+        """
+        Codifica las reglas favorables de cada fila en un byte (bit i = regla i).
+
+        Args:
+            favorable (np.ndarray): Arreglo booleano (..., reglas)
+
+        Returns:
+            np.ndarray: Máscaras uint8
+        """
+        mascara = favorable[..., 0].astype(np.uint8)
+        for posicion in range(1, len(self.reglas)):
+            mascara |= favorable[..., posicion].view(np.uint8) << np.uint8(posicion)
+        return mascara
+
+    def estado_lote(self, favorable=None, mascara=None):
+        """
+        Calcula los códigos de estado general a partir de las reglas
+        favorables o de su máscara ya codificada.
+
+        Args:
+            favorable (np.ndarray, optional): Arreglo booleano (..., reglas)
+            mascara (np.ndarray, optional): Máscaras de mascara_lote
+
+        Returns:
+            np.ndarray: Códigos uint8 (índices en self.estados)
+        """
+        if mascara is None:
+            mascara = self.mascara_lote(favorable)
+        return np.take(self.estado_por_mascara, mascara)
+
+# Reglas por defecto, compiladas una sola vez
+MOTOR_REGLAS = MotorReglas()
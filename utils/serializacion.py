@@ -0,0 +1,225 @@
+import struct
+import numpy as np
+from models.columnas import ColumnaDiccionario, ValoresTexto
+from models.analisis import (
+    ResultadoAnalisis, ResultadoBatch, INDICADORES, EVALUACIONES, ETIQUETAS_EVALUACION,
+    ESTADOS, RECOMENDACIONES
+)
+
+VERSION = 1
+
+
+class SerializacionBinaria:
+    """
+    Codificación binaria compacta de resultados de análisis, con las
+    etiquetas de evaluación, el estado y las recomendaciones como códigos
+    enteros (las mismas máscaras de bits de ResultadoBatch).
+
+    Un resultado individual es un registro de estructura fija (versión,
+    cuatro float64, tres bytes de códigos y las longitudes de los textos)
+    seguido del nombre y el sector en UTF-8: unos 40 bytes más los textos,
+    que pueden ocupar hasta MAX_TEXTO bytes cada uno.
+    Un lote es un único buffer contiguo con una sección por columna,
+    alineada a 8 bytes; el sector se guarda codificado por diccionario y los
+    nombres como desplazamientos más UTF-8, de modo que cada fila ocupa
+    unos 40 bytes más su nombre. Al decodificar un lote las columnas son
+    vistas sobre el buffer, sin copias.
+
+    Los ejemplos NLP no se codifican: se calculan a demanda a partir del resto.
+    """
+    REGISTRO = struct.Struct('<B4dBBBHH')
+    # Longitud máxima en bytes UTF-8 del nombre o el sector de un registro (campo H)
+    MAX_TEXTO = 0xFFFF
+    CABECERA_LOTE = struct.Struct('<4sBQ')
+    SECCION = struct.Struct('<BQ')
+    MAGIA_LOTE = b'FGRL'
+    # Código de tipo -> dtype de las secciones de un lote
+    TIPOS = tuple(np.dtype(tipo) for tipo in ('<u1', '<u2', '<u4', '<u8', '<i8', '<f8'))
+    COLUMNAS_NUMERICAS = INDICADORES + ('evaluacion', 'estado', 'recomendaciones', 'anomalias')
+    COLUMNAS_TEXTO = ('nombre', 'sector')
+    # Columnas de texto con pocos valores distintos, guardadas por diccionario;
+    # el resto (nombres casi siempre únicos) se guarda texto a texto
+    TEXTO_DICCIONARIO = ('sector',)
+
+    _ESTADOS = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+    _RECOMENDACIONES = {texto: 1 << bit for bit, texto in enumerate(RECOMENDACIONES)}
+
+    @classmethod
+    def _codigos(cls, resultado):
+        evaluacion = 0
+        for bit, (nombre, etiquetas) in enumerate(zip(EVALUACIONES, ETIQUETAS_EVALUACION)):
+            etiqueta = resultado.evaluacion[nombre]
+            if etiqueta not in etiquetas:
+                raise ValueError(f"Etiqueta de evaluación no codificable para {nombre}: {etiqueta}")
+            evaluacion |= etiquetas.index(etiqueta) << bit
+        if resultado.estado_general not in cls._ESTADOS:
+            raise ValueError(f"Estado no codificable: {resultado.estado_general}")
+        recomendaciones = 0
+        for texto in resultado.recomendaciones:
+            if texto not in cls._RECOMENDACIONES:
+                raise ValueError(f"Recomendación no codificable: {texto}")
+            recomendaciones |= cls._RECOMENDACIONES[texto]
+        return evaluacion, cls._ESTADOS[resultado.estado_general], recomendaciones
+
+    @classmethod
+    def codificar(cls, resultado):
+        """
+        Codifica un resultado individual.
+
+        Args:
+            resultado (ResultadoAnalisis | ResultadoVista | dict): Resultado o su data_dict
+
+        Returns:
+            bytes: Registro binario
+        """
+        if isinstance(resultado, dict):
+            resultado = ResultadoAnalisis.from_dict(resultado)
+        nombre = str(resultado.nombre).encode('utf-8')
+        sector = str(resultado.sector).encode('utf-8')
+        for campo, texto in (('nombre', nombre), ('sector', sector)):
+            if len(texto) > cls.MAX_TEXTO:
+                raise ValueError(
+                    f"El {campo} ocupa {len(texto)} bytes y el registro admite hasta {cls.MAX_TEXTO}"
+                )
+        indicadores = resultado.indicadores
+        return cls.REGISTRO.pack(
+            VERSION,
+            *(float(indicadores[nombre_indicador]) for nombre_indicador in INDICADORES),
+            *cls._codigos(resultado),
+            len(nombre), len(sector)
+        ) + nombre + sector
+
+    @classmethod
+    def decodificar(cls, datos):
+        """
+        Decodifica un resultado individual.
+
+        Args:
+            datos (bytes | memoryview): Registro creado con codificar
+
+        Returns:
+            ResultadoAnalisis: Resultado reconstruido (sin ejemplos NLP)
+        """
+        campos = cls.REGISTRO.unpack_from(datos)
+        if campos[0] > VERSION:
+            raise ValueError(f"Versión de formato no soportada: {campos[0]}")
+        valores = campos[1:1 + len(INDICADORES)]
+        evaluacion, estado, recomendaciones, largo_nombre, largo_sector = campos[1 + len(INDICADORES):]
+        inicio = cls.REGISTRO.size
+        nombre = bytes(datos[inicio:inicio + largo_nombre]).decode('utf-8')
+        inicio += largo_nombre
+        sector = bytes(datos[inicio:inicio + largo_sector]).decode('utf-8')
+        return ResultadoAnalisis(
+            nombre=nombre,
+            sector=sector,
+            indicadores=dict(zip(INDICADORES, valores)),
+            evaluacion={
+                nombre_evaluacion: etiquetas[(evaluacion >> bit) & 1]
+                for bit, (nombre_evaluacion, etiquetas) in enumerate(zip(EVALUACIONES, ETIQUETAS_EVALUACION))
+            },
+            estado_general=ESTADOS[estado],
+            recomendaciones=[texto for bit, texto in enumerate(RECOMENDACIONES) if (recomendaciones >> bit) & 1]
+        )
+
+    @staticmethod
+    def _entero_minimo(valores):
+        """
+        Convierte enteros no negativos al tipo sin signo más angosto que los contiene.
+        """
+        valores = np.asarray(valores)
+        maximo = int(valores.max()) if len(valores) else 0
+        for tipo in (np.uint8, np.uint16, np.uint32):
+            if maximo <= np.iinfo(tipo).max:
+                return valores.astype(tipo, copy=False)
+        return valores.astype(np.uint64, copy=False)
+
+    @classmethod
+    def _seccion(cls, partes, posicion, arreglo):
+        """
+        Agrega una columna al buffer: cabecera, relleno a 8 bytes y datos.
+
+        Returns:
+            int: Posición al final de la sección
+        """
+        arreglo = np.ascontiguousarray(arreglo, dtype=np.asarray(arreglo).dtype.newbyteorder('<'))
+        cabecera = cls.SECCION.pack(cls.TIPOS.index(arreglo.dtype), len(arreglo))
+        posicion += len(cabecera)
+        relleno = -posicion % 8
+        partes.extend((cabecera, bytes(relleno), memoryview(arreglo).cast('B')))
+        return posicion + relleno + arreglo.nbytes
+
+    @classmethod
+    def codificar_lote(cls, resultados):
+        """
+        Codifica un lote de resultados en un único buffer contiguo.
+
+        Args:
+            resultados (ResultadoBatch): Resultados del análisis por lotes
+
+        Returns:
+            bytes: Buffer con todas las columnas
+        """
+        partes = [cls.CABECERA_LOTE.pack(cls.MAGIA_LOTE, VERSION, len(resultados))]
+        posicion = cls.CABECERA_LOTE.size
+        for campo in cls.COLUMNAS_NUMERICAS:
+            posicion = cls._seccion(partes, posicion, getattr(resultados, campo))
+        for campo in cls.COLUMNAS_TEXTO:
+            valores = getattr(resultados, campo)
+            if campo in cls.TEXTO_DICCIONARIO or isinstance(valores, ColumnaDiccionario):
+                columna = ColumnaDiccionario.codificar(valores)
+                codigos, textos = cls._entero_minimo(columna.codigos), columna.valores
+            else:
+                # Sin códigos: cada fila es su propio texto
+                codigos, textos = np.empty(0, dtype=np.uint8), valores
+            if not isinstance(textos, ValoresTexto):
+                textos = ValoresTexto.desde_lista(textos)
+            posicion = cls._seccion(partes, posicion, codigos)
+            posicion = cls._seccion(partes, posicion, cls._entero_minimo(textos.desplazamientos))
+            posicion = cls._seccion(partes, posicion, np.asarray(textos.datos, dtype=np.uint8))
+        return b''.join(partes)
+
+    @classmethod
+    def decodificar_lote(cls, datos):
+        """
+        Decodifica un lote sin copiar sus columnas: los valores y los
+        textos son vistas de solo lectura sobre el buffer, que debe
+        mantenerse vivo; los nombres se decodifican al accederlos.
+
+        Args:
+            datos (bytes | memoryview | np.ndarray): Buffer creado con codificar_lote
+
+        Returns:
+            ResultadoBatch: Lote de resultados
+        """
+        buffer = memoryview(datos).cast('B')
+        magia, version, filas = cls.CABECERA_LOTE.unpack_from(buffer)
+        if magia != cls.MAGIA_LOTE:
+            raise ValueError("El buffer no contiene un lote de resultados codificado")
+        if version > VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        posicion = cls.CABECERA_LOTE.size
+
+        def leer():
+            nonlocal posicion
+            tipo, longitud = cls.SECCION.unpack_from(buffer, posicion)
+            posicion += cls.SECCION.size
+            posicion += -posicion % 8
+            dtype = cls.TIPOS[tipo]
+            arreglo = np.frombuffer(buffer, dtype=dtype, count=longitud, offset=posicion)
+            posicion += longitud * dtype.itemsize
+            return arreglo
+
+        columnas = {campo: leer() for campo in cls.COLUMNAS_NUMERICAS}
+        for campo in cls.COLUMNAS_TEXTO:
+            codigos, desplazamientos, textos = leer(), leer(), leer()
+            valores = ValoresTexto(desplazamientos, textos)
+            # Una columna por diccionario con filas siempre tiene códigos
+            if len(codigos) == 0:
+                codigos = np.arange(len(valores), dtype=np.int64)
+            if campo == 'sector':
+                # Pocos valores distintos: se decodifican de una vez
+                valores = valores.tolist()
+            columnas[campo] = ColumnaDiccionario(codigos, valores)
+        if any(len(columnas[campo]) != filas for campo in cls.COLUMNAS_NUMERICAS):
+            raise ValueError("El buffer del lote está truncado o dañado")
+        return ResultadoBatch(**columnas)
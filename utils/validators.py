@@ -1,3 +1,25 @@
+import numpy as np
+from models.columnas import ColumnaDiccionario, columna_texto
+from models.empresa import EmpresaBatch
+
+# Motivos de rechazo del reporte de validación por lotes
+MOTIVOS_VALIDACION = ('faltante', 'no_numerico', 'no_finito', 'no_entero', 'fuera_de_rango', 'menor_al_minimo')
+
+# Campo -> reglas de conversión y validación de EmpresaBatch: 'tipo' ('texto',
+# 'numero' o 'entero'), 'minimo', 'requerido' (texto no vacío) y 'defecto'
+# (valor si falta la columna completa o el valor de una fila: None, NaN o
+# texto en blanco). Los mínimos son los de FormUI
+ESQUEMA_EMPRESA = {
+    'nombre': {'tipo': 'texto', 'requerido': True},
+    'sector': {'tipo': 'texto', 'defecto': "Tecnología"},
+    'ganancias': {'tipo': 'numero', 'minimo': 0.0},
+    'empleados': {'tipo': 'entero', 'minimo': 1, 'defecto': 1},
+    'activos': {'tipo': 'numero', 'minimo': 0.0},
+    'cartera': {'tipo': 'numero', 'minimo': 0.0},
+    'deudas': {'tipo': 'numero', 'minimo': 0.0}
+}
+
+
 class Validators:
     """
     Clase con utilidades para validación de datos.
@@ -24,4 +46,242 @@ class Validators:
                 return False, f"El {nombre} debe ser mayor o igual a {min_valor}."
             return True, ""
         except ValueError:
-            return False, f"El {nombre} debe ser un número válido."
\ No newline at end of file
+            return False, f"El {nombre} debe ser un número válido."
+
+    # Filas por intento de conversión vectorizada de textos a números
+    TAMANO_TRAMO = 4096
+
+    @staticmethod
+    def _codigo(motivo):
+        return MOTIVOS_VALIDACION.index(motivo) + 1
+
+    @staticmethod
+    def _propio(resultado, valores):
+        """
+        Indica si un arreglo convertido no comparte memoria con los datos
+        recibidos, de modo que se puede reutilizar y compactar en su lugar.
+        """
+        if isinstance(valores, (list, tuple)):
+            return True
+        return not np.may_share_memory(resultado, np.asarray(valores))
+
+    @staticmethod
+    def _convertir_tramo(textos, numeros, motivos, inicio, fin):
+        """
+        Convierte textos u objetos a float64 con una sola llamada de NumPy; si
+        el tramo tiene valores inválidos se convierte valor a valor para
+        aislarlos (NumPy no convierte textos más rápido que float()).
+        """
+        try:
+            numeros[inicio:fin] = textos[inicio:fin].astype(np.float64)
+            return
+        except (ValueError, TypeError):
+            pass
+        convertidos = []
+        for fila, valor in enumerate(textos[inicio:fin].tolist(), inicio):
+            try:
+                convertidos.append(float(valor))
+            except (ValueError, TypeError):
+                convertidos.append(np.nan)
+                vacio = valor is None or not str(valor).strip()
+                motivos[fila] = Validators._codigo('faltante' if vacio else 'no_numerico')
+        numeros[inicio:fin] = convertidos
+
+    @staticmethod
+    def _columna_numerica(valores, regla):
+        """
+        Convierte y valida una columna numérica.
+
+        Returns:
+            tuple: (arreglo tipado, códigos de motivo por fila (0 = válida),
+                True si el arreglo es propio)
+        """
+        if isinstance(valores, (list, tuple)):
+            arreglo = np.asarray(valores, dtype=object)
+        else:
+            arreglo = np.asarray(valores)
+        if arreglo.dtype.kind in 'US':
+            # NumPy convierte objetos str a float más rápido que textos de ancho fijo
+            arreglo = arreglo.astype(object)
+        n = len(arreglo)
+        motivos = np.zeros(n, dtype=np.uint8)
+        entero = regla['tipo'] == 'entero'
+        if entero and arreglo.dtype.kind in 'iub':
+            # Enteros ya tipados: solo se valida el mínimo
+            tipado = arreglo.astype(np.int64, copy=False)
+            if regla.get('minimo') is not None:
+                motivos[tipado < regla['minimo']] = Validators._codigo('menor_al_minimo')
+            return tipado, motivos, Validators._propio(tipado, valores)
+
+        if arreglo.dtype.kind in 'iubf':
+            numeros = arreglo.astype(np.float64, copy=False)
+        else:
+            numeros = np.empty(n, dtype=np.float64)
+            for inicio in range(0, n, Validators.TAMANO_TRAMO):
+                Validators._convertir_tramo(arreglo, numeros, motivos, inicio, min(n, inicio + Validators.TAMANO_TRAMO))
+
+        if regla.get('defecto') is not None:
+            # Los valores vacíos toman el valor por defecto en lugar de rechazarse
+            vacios = np.isnan(numeros) & (motivos != Validators._codigo('no_numerico'))
+            if vacios.any():
+                numeros = np.where(vacios, np.float64(regla['defecto']), numeros)
+                motivos[vacios] = 0
+
+        # Cada fila conserva el primer motivo encontrado
+        pendientes = motivos == 0
+        for motivo, invalido in (
+            ('faltante', np.isnan(numeros)),
+            ('no_finito', np.isinf(numeros)),
+            ('no_entero', (numeros != np.trunc(numeros)) if entero else None),
+            ('fuera_de_rango', (np.abs(numeros) >= 2.0 ** 63) if entero else None),
+            ('menor_al_minimo', (numeros < regla['minimo']) if regla.get('minimo') is not None else None)
+        ):
+            if invalido is None:
+                continue
+            invalido &= pendientes
+            motivos[invalido] = Validators._codigo(motivo)
+            pendientes &= ~invalido
+
+        if entero:
+            # Las filas inválidas se anulan para convertir sin desbordes
+            numeros = np.where(pendientes, numeros, 0.0)
+            return numeros.astype(np.int64), motivos, True
+        return numeros, motivos, Validators._propio(numeros, valores)
+
+    @staticmethod
+    def _columna_texto(valores, regla):
+        """
+        Normaliza y valida una columna de texto.
+
+        Returns:
+            tuple: (columna, códigos de motivo por fila, True si la columna es propia)
+        """
+        columna = columna_texto(valores)
+        propia = not isinstance(columna, ColumnaDiccionario) and Validators._propio(columna, valores)
+        defecto = regla.get('defecto')
+        if not regla.get('requerido') and defecto is None:
+            return columna, np.zeros(len(columna), dtype=np.uint8), propia
+        # Con columnas codificadas por diccionario basta revisar los valores distintos
+        distintos = np.asarray(list(columna.valores) if isinstance(columna, ColumnaDiccionario) else columna,
+                               dtype=object)
+        with np.errstate(invalid='ignore'):
+            vacios = (distintos == None) | (distintos != distintos)  # noqa: E711 (None y NaN de pandas)
+        vacios |= np.char.str_len(np.char.strip(distintos.astype(str))) == 0
+        if defecto is not None:
+            # Los valores vacíos toman el valor por defecto, como si faltara la columna
+            if isinstance(columna, ColumnaDiccionario):
+                if vacios.any():
+                    columna = ColumnaDiccionario(columna.codigos, [
+                        defecto if vacio else valor for valor, vacio in zip(distintos.tolist(), vacios.tolist())
+                    ])
+            elif vacios.any():
+                columna = columna if propia else columna.copy()
+                columna[vacios] = defecto
+                propia = True
+            return columna, np.zeros(len(columna), dtype=np.uint8), propia
+        if isinstance(columna, ColumnaDiccionario):
+            vacios = vacios[columna.codigos]
+        motivos = vacios.astype(np.uint8) * np.uint8(Validators._codigo('faltante'))
+        return columna, motivos, propia
+
+    @staticmethod
+    def validar_columnas(columnas, esquema=ESQUEMA_EMPRESA):
+        """
+        Convierte columnas crudas (textos u objetos, por ejemplo leídas de un
+        CSV) a arreglos tipados y las valida según un esquema, sin recorrer
+        las filas en Python salvo para aislar los valores no convertibles.
+
+        Las filas válidas se compactan al inicio de los arreglos convertidos,
+        y las columnas retornadas son vistas de ellos; las columnas recibidas
+        que ya tienen el tipo correcto no se modifican.
+
+        Args:
+            columnas (dict | pandas.DataFrame): Campo -> valores crudos
+            esquema (dict): Campo -> reglas (ver ESQUEMA_EMPRESA)
+
+        Returns:
+            tuple: (dict campo -> columna tipada con las filas válidas,
+                reporte dict con arreglos 'fila', 'campo' y 'motivo' ordenados
+                por fila; ver MOTIVOS_VALIDACION)
+        """
+        faltantes = [
+            campo for campo, regla in esquema.items()
+            if campo not in columnas and 'defecto' not in regla
+        ]
+        if faltantes:
+            raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+        presentes = [campo for campo in esquema if campo in columnas]
+        longitudes = {len(columnas[campo]) for campo in presentes}
+        if len(longitudes) > 1:
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+        n = longitudes.pop() if longitudes else 0
+
+        tipadas, motivos, propias = {}, {}, {}
+        for campo, regla in esquema.items():
+            valores = columnas[campo] if campo in columnas else np.full(n, regla['defecto'], dtype=object)
+            convertir = Validators._columna_texto if regla['tipo'] == 'texto' else Validators._columna_numerica
+            tipadas[campo], motivos[campo], propias[campo] = convertir(valores, regla)
+
+        # Reporte estructurado, ordenado por fila y luego por campo del esquema
+        filas, campos, codigos = [], [], []
+        for campo, codigos_campo in motivos.items():
+            invalidas = np.flatnonzero(codigos_campo)
+            filas.append(invalidas)
+            campos.append(np.full(len(invalidas), campo, dtype=object))
+            codigos.append(codigos_campo[invalidas])
+        filas = np.concatenate(filas) if filas else np.empty(0, dtype=np.intp)
+        orden = np.argsort(filas, kind='stable')
+        nombres_motivo = np.asarray(('',) + MOTIVOS_VALIDACION, dtype=object)
+        reporte = {
+            'fila': filas[orden],
+            'campo': np.concatenate(campos)[orden] if campos else np.empty(0, dtype=object),
+            'motivo': nombres_motivo[np.concatenate(codigos)[orden]] if codigos else np.empty(0, dtype=object)
+        }
+
+        if len(filas):
+            validas = np.ones(n, dtype=bool)
+            validas[filas] = False
+            indices = np.flatnonzero(validas)
+            for campo, columna in tipadas.items():
+                if propias[campo]:
+                    # Compactación en el mismo arreglo: el lote comparte el buffer convertido
+                    columna[:len(indices)] = columna[indices]
+                    tipadas[campo] = columna[:len(indices)]
+                else:
+                    tipadas[campo] = columna[indices]
+        return tipadas, reporte
+
+    @staticmethod
+    def validar_lote(columnas, esquema=ESQUEMA_EMPRESA):
+        """
+        Construye un EmpresaBatch con las filas válidas de columnas crudas.
+
+        Args:
+            columnas (dict | pandas.DataFrame): Campo -> valores crudos
+            esquema (dict): Reglas por campo (ver ESQUEMA_EMPRESA)
+
+        Returns:
+            tuple: (EmpresaBatch con las filas válidas, reporte de errores)
+        """
+        tipadas, reporte = Validators.validar_columnas(columnas, esquema)
+        return EmpresaBatch(**{campo: tipadas[campo] for campo in EmpresaBatch.CAMPOS}), reporte
+
+    @staticmethod
+    def validar_registros(registros, esquema=ESQUEMA_EMPRESA):
+        """
+        Igual que validar_lote, a partir de una lista de diccionarios (por
+        ejemplo filas de csv.DictReader o líneas JSONL).
+
+        Args:
+            registros (list): Diccionarios con los datos de cada empresa
+            esquema (dict): Reglas por campo (ver ESQUEMA_EMPRESA)
+
+        Returns:
+            tuple: (EmpresaBatch con las filas válidas, reporte de errores)
+        """
+        registros = list(registros)
+        columnas = {
+            campo: np.array([registro.get(campo, regla.get('defecto')) for registro in registros], dtype=object)
+            for campo, regla in esquema.items()
+        }
+        return Validators.validar_lote(columnas, esquema)